@@ -0,0 +1,103 @@
+"""Environments of applications resolved per second, as tasks are entered
+
+Resolves the environment of every application of a project for each
+task entered, as launching does, with and without the cache of
+`launcher.environment`. Half of the applications depend on the task.
+
+Usage:
+    $ python benchmarks/bench_environment.py
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from launcher import environment  # noqa
+
+APPS = 20
+
+# Variables per application, half of which are lists of paths
+VARIABLES = 50
+
+# Tasks entered, each resolving the environment of every application
+TASKS = 500
+
+
+def definitions(apps, variables):
+    """Return environments of applications, by fingerprint"""
+    result = dict()
+
+    for app in range(apps):
+        env = dict()
+
+        for index in range(variables):
+            if index % 2:
+                env["APP%d_PATH%d" % (app, index)] = [
+                    "{AVALON_CORE}/app%d/path%d/%d" % (app, index, path)
+                    for path in range(8)
+                ] + ["{PYTHONPATH}"]
+            else:
+                env["APP%d_VAR%d" % (app, index)] = "{AVALON_PROJECT}"
+
+        if app % 2:
+            env["APP%d_WORKDIR" % app] = "{AVALON_WORKDIR}/app%d" % app
+
+        result[("app%d.toml" % app, (0, 0))] = env
+
+    return result
+
+
+def sessions(tasks):
+    return [
+        {
+            "AVALON_CORE": "/core",
+            "AVALON_PROJECT": "hulk",
+            "AVALON_WORKDIR": "/projects/hulk/work/task%d" % (task % 10),
+            "PYTHONPATH": "/usr/lib/python",
+        }
+        for task in range(tasks)
+    ]
+
+
+def uncached(apps, mappings):
+    """Format each, as `avalon.api.Application.environ` does"""
+    for mapping in mappings:
+        for env in apps.values():
+            normalized = environment.normalize(env)
+            {
+                key.format(**mapping): value.format(**mapping)
+                for key, value in normalized.items()
+            }
+
+
+def cached(apps, mappings):
+    resolver = environment.Resolver()
+
+    for mapping in mappings:
+        for fingerprint, env in apps.items():
+            resolver.resolve(fingerprint, env, mapping)
+
+    return resolver.stats()
+
+
+def main():
+    apps = definitions(APPS, VARIABLES)
+    mappings = sessions(TASKS)
+
+    print("%-12s %16s" % ("", "environments/s"))
+    for name, func in (("uncached", uncached),
+                       ("cached", cached)):
+        start = time.time()
+        stats = func(apps, mappings)
+        duration = time.time() - start
+
+        print("%-12s %16d" % (name, APPS * TASKS / duration))
+
+    print("\nhits %(hits)d, misses %(misses)d" % stats)
+
+
+if __name__ == "__main__":
+    main()
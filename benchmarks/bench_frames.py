@@ -0,0 +1,91 @@
+"""Click-to-listing latency of frame navigation as the config grows
+
+Simulates clicking from a project down to a task, deriving a frame
+per level, building its session and reading the environment of the
+level for every registered action, as `Controller` does, with and
+without structurally shared frames.
+
+Usage:
+    $ python benchmarks/bench_frames.py
+
+"""
+
+import os
+import sys
+import copy
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from launcher import frames  # noqa
+
+ACTIONS = 50
+REPEAT = 3
+
+
+def make_project(size):
+    return {
+        "_id": "project",
+        "config": {
+            "apps": [{"name": "app%d" % i} for i in range(size // 10 or 1)],
+            "tasks": [{"name": "task%d" % i} for i in range(size // 10 or 1)],
+            "template": {"work": "{root}/{project}/{silo}/{asset}/{task}"},
+            "extra": {"key%d" % i: {"value": i} for i in range(size)},
+        },
+        "data": {"key%d" % i: "value%d" % i for i in range(size)},
+    }
+
+
+def click(frame, current_frame, project, level):
+    """Push a level, then collect actions for it"""
+    frame = current_frame(frame)
+
+    if level == 0:
+        frame["config"] = project["config"]
+        frame["environment"]["project"] = "project"
+        frame["environment"].update({
+            "project_%s" % key: value
+            for key, value in project["data"].items()
+        })
+    else:
+        frame["environment"][("silo", "asset", "task")[level - 1]] = "x"
+
+    session = {
+        "AVALON_{}".format(key.upper()): value
+        for key, value in current_frame(frame)["environment"].items()
+    }
+    assert session
+
+    for _ in range(ACTIONS):
+        environment = current_frame(frame)["environment"]
+        assert len(environment) and "project" in environment
+
+    return frame
+
+
+def navigate(root, current_frame, project):
+    frame = root
+    for level in range(4):
+        frame = click(frame, current_frame, project, level)
+
+
+def main():
+    strategies = (
+        ("deepcopy", {"environment": {}}, copy.deepcopy),
+        ("layered", frames.Frame(), frames.Frame.child),
+    )
+
+    print("%-8s %-10s %12s" % ("keys", "strategy", "ms/navigate"))
+    for size in (10, 100, 1000, 2000):
+        project = make_project(size)
+
+        for name, root, current_frame in strategies:
+            timer = timeit.Timer(
+                lambda: navigate(root, current_frame, project)
+            )
+            best = min(timer.repeat(repeat=REPEAT, number=1))
+            print("%-8d %-10s %12.2f" % (size, name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Push/pop latency of 10k-row levels, reset versus incremental
+
+Levels are shown in the launcher's own listing, such that the cost
+of creating delegates is part of the measurement.
+
+Usage:
+    $ python benchmarks/bench_model.py
+
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("QT_QUICK_BACKEND", "software")
+
+from PyQt5 import QtCore, QtGui, QtQuick  # noqa
+from launcher import icons, lib, model  # noqa
+
+ROWS = 10000
+REPEAT = 20
+
+QML = """
+import QtQuick 2.6
+import "%s"
+
+Listing {
+    width: 300
+    height: 600
+    model: listing
+}
+"""
+
+
+def make_level(prefix, count):
+    return [
+        {
+            "_id": "%s%d" % (prefix, index),
+            "name": "%s%d" % (prefix, index),
+            "icon": "plus-square",
+            "group": "group%d" % (index // 100),
+        }
+        for index in range(count)
+    ]
+
+
+def measure(view, func):
+    app = QtGui.QGuiApplication.instance()
+    start = time.time()
+    func()
+    app.processEvents()
+    view.grabWindow()
+    return (time.time() - start) * 1000
+
+
+def main():
+    app = QtGui.QGuiApplication(sys.argv)
+
+    assets = make_level("asset", ROWS)
+    tasks = make_level("task", 10)
+
+    # An updated listing, with an asset added and removed
+    updated = assets[1:] + make_level("new", 1)
+
+    source = os.path.join(tempfile.mkdtemp(), "main.qml")
+    with open(source, "w") as f:
+        qml = os.path.normpath(lib.resource("qml"))
+        f.write(QML % QtCore.QUrl.fromLocalFile(qml).toString())
+
+    print("%-12s %-20s %10s" % ("mode", "scenario", "ms"))
+    for incremental in (False, True):
+        listing = model.Model(
+            items=[],
+            roles=["_id", "name", "label", "icon", "group"],
+            incremental=incremental
+        )
+
+        # Icons of the listing, as registered by the launcher. Referenced
+        # here, as the engine of a view keeps no Python reference of its
+        # own, and deletes it along with the view.
+        atlas = icons.Atlas()
+
+        view = QtQuick.QQuickView()
+        view.engine().addImageProvider("icons", atlas)
+        view.rootContext().setContextProperty("listing", listing)
+        view.setSource(QtCore.QUrl.fromLocalFile(source))
+        view.show()
+
+        listing.push(assets)
+        timings = {"push tasks": [], "pop to assets": [],
+                   "reload assets": []}
+        for _ in range(REPEAT):
+            timings["push tasks"].append(
+                measure(view, lambda: listing.push(tasks)))
+            timings["pop to assets"].append(
+                measure(view, listing.pop))
+
+            # Reloading a level, with one asset added and one removed
+            timings["reload assets"].append(
+                measure(view, lambda: listing.push(updated)))
+            measure(view, listing.pop)
+
+        mode = "incremental" if incremental else "reset"
+        for scenario, values in timings.items():
+            print("%-12s %-20s %10.2f" % (mode, scenario, min(values)))
+
+        view.close()
+
+    shutil.rmtree(os.path.dirname(source))
+    del app
+
+
+if __name__ == "__main__":
+    main()
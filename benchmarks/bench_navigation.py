@@ -0,0 +1,165 @@
+"""Latency, memory and action filtering of navigation, as projects grow
+
+Navigates a synthetic database of silos x assets x tasks by name, like
+clicking from a project down to a task and back, and reports per level:
+
+- push: Milliseconds from entering a level until it has loaded
+- pop: Milliseconds to go back to the level above
+- memory: Kilobytes allocated by the level, and kept until left
+- filter: Microseconds to collect the actions compatible with it
+
+Usage:
+    $ python benchmarks/bench_navigation.py
+
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Levels are measured as loaded from the database, not as last seen
+os.environ.setdefault("AVALON_LAUNCHER_SNAPSHOT", "")
+
+from avalon import api  # noqa
+from launcher import headless, fixtures  # noqa
+
+# Silos, assets per silo and tasks per project
+SCALES = (
+    (2, 100, 4),
+    (4, 1000, 8),
+    (8, 10000, 16),
+)
+
+# Registered actions, of each kind the action index distinguishes
+ACTIONS = 100
+
+# Paths navigated per scale
+REPEAT = 20
+
+# Calls per measurement of action filtering
+FILTERS = 100
+
+LEVELS = ("project", "silo", "asset", "task")
+
+
+def make_actions(count):
+    """Return actions declaring keys, values, custom checks or nothing"""
+    actions = list()
+
+    for index in range(count):
+        attributes = {
+            "name": "action%d" % index,
+            "label": "Action %d" % index,
+            "order": index,
+        }
+
+        kind = index % 4
+
+        if kind == 0:
+            attributes["requires"] = ["AVALON_TASK"]
+
+        elif kind == 1:
+            attributes["accepts"] = {"AVALON_SILO": ["silo0"]}
+
+        elif kind == 2:
+            attributes["is_compatible"] = (
+                lambda self, session: "AVALON_ASSET" in session
+            )
+
+        actions.append(type("Action%d" % index, (api.Action,), attributes))
+
+    return actions
+
+
+def paths(silos, assets, tasks):
+    """Return paths spread across the database, one per repeat"""
+    return [
+        [
+            "project%d" % (repeat % 2),
+            "silo%d" % (repeat % silos),
+            "asset%05d" % (repeat * assets // REPEAT),
+            "task%d" % (repeat % tasks),
+        ]
+        for repeat in range(REPEAT)
+    ]
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def measure(silos, assets, tasks):
+    """Return measurements by level, in order of `LEVELS`"""
+    database = fixtures.Database(projects=2,
+                                 silos=silos,
+                                 assets=assets,
+                                 tasks=tasks)
+
+    controller = headless.create(database=database)
+    results = [
+        {"push": [], "pop": [], "memory": [], "filter": [], "actions": 0}
+        for level in LEVELS
+    ]
+
+    for path in paths(silos, assets, tasks):
+        for level, name in enumerate(path):
+            before = tracemalloc.get_traced_memory()[0]
+
+            start = time.time()
+            headless.push(controller, name)
+            results[level]["push"].append(time.time() - start)
+
+            results[level]["memory"].append(
+                tracemalloc.get_traced_memory()[0] - before
+            )
+
+            start = time.time()
+            for _ in range(FILTERS):
+                compatible = controller.collect_compatible_actions()
+            results[level]["filter"].append((time.time() - start) / FILTERS)
+            results[level]["actions"] = len(compatible)
+
+        for level in reversed(range(len(path))):
+            start = time.time()
+            headless.pop(controller)
+            results[level]["pop"].append(time.time() - start)
+
+    controller.wait()
+
+    return results
+
+
+def main():
+    for action in make_actions(ACTIONS):
+        api.register_plugin(api.Action, action)
+
+    tracemalloc.start()
+
+    for silos, assets, tasks in SCALES:
+        results = measure(silos, assets, tasks)
+
+        print("\n%d silos x %d assets x %d tasks, %d actions" % (
+            silos, assets, tasks, ACTIONS))
+        print("%-8s %16s %16s %10s %10s %8s" % (
+            "level", "push ms med/max", "pop ms med/max",
+            "memory kB", "filter us", "actions"))
+
+        for name, result in zip(LEVELS, results):
+            print("%-8s %7.2f/%7.2f %8.2f/%7.2f %10.1f %10.1f %8d" % (
+                name,
+                median(result["push"]) * 1e3,
+                max(result["push"]) * 1e3,
+                median(result["pop"]) * 1e3,
+                max(result["pop"]) * 1e3,
+                median(result["memory"]) / 1024.0,
+                median(result["filter"]) * 1e6,
+                result["actions"],
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Time taken to index the hierarchy, and to search it as typed
+
+Usage:
+    $ python benchmarks/bench_search.py
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from launcher import search  # noqa
+
+ENTRIES = 100000
+
+# Times each query is run
+REPEATS = 5
+
+TASKS = ["modeling", "rigging", "lookdev", "animation", "lighting"]
+
+QUERIES = [
+    "sh03210",
+    "sh03210 anim",
+    "thor sh03210 light",
+    "seq032 light",
+    "shot3210",  # Typo
+    "lihgting",  # Typo
+    "natasha",
+]
+
+
+def hierarchy(entries):
+    """Return `entries` of 5 projects, each with shots and their tasks"""
+    shots = entries // 5 // (len(TASKS) + 1)
+
+    for project in ("hulk", "thor", "loki", "wanda", "natasha"):
+        yield (project,), {"label": project.title()}
+        yield (project, "film"), {}
+
+        for shot in range(shots):
+            name = "sh%05d" % shot
+            path = (project, "film", name)
+            yield path, {"label": "Seq %03d Shot %d" % (shot // 100, shot)}
+
+            for task in TASKS:
+                yield path + (task,), {}
+
+
+def main():
+    entries = list(hierarchy(ENTRIES))
+
+    index = search.Index()
+    start = time.time()
+    index.add(entries)
+    print("Indexed %d entries in %.2f s" % (len(index), time.time() - start))
+
+    print("%-24s %10s %10s %8s" % ("query", "median ms", "max ms",
+                                   "results"))
+    for query in QUERIES:
+        durations = list()
+
+        # Once per letter typed
+        for end in range(1, len(query) + 1):
+            for repeat in range(REPEATS):
+                start = time.time()
+                results = index.search(query[:end])
+                durations.append(time.time() - start)
+
+        durations.sort()
+        print("%-24s %10.2f %10.2f %8d" % (
+            query,
+            durations[len(durations) // 2] * 1000,
+            durations[-1] * 1000,
+            len(results),
+        ))
+
+
+if __name__ == "__main__":
+    main()
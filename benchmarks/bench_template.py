@@ -0,0 +1,66 @@
+"""Work paths resolved per second, for every row of a view
+
+Usage:
+    $ python benchmarks/bench_template.py
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from launcher import lib  # noqa
+
+ROWS = 10000
+
+TEMPLATE = "{root}/{project}/{silo}/{asset}/work/{task}/{user}/{app}"
+
+
+def frames(rows):
+    return [
+        {
+            "root": "/projects",
+            "project": "hulk",
+            "silo": "assets",
+            "asset": "asset%d" % row,
+            "task": "modeling",
+        }
+        for row in range(rows)
+    ]
+
+
+def formatter(environments):
+    """Format each, as `lib.partial_format` used to"""
+    import string
+
+    return [
+        string.Formatter().vformat(
+            TEMPLATE, (), lib.FormatDict(**environment)
+        ).split("{", 1)[0]
+        for environment in environments
+    ]
+
+
+def compiled(environments):
+    return lib.compile_template(TEMPLATE).resolve_many(environments)
+
+
+def main():
+    environments = frames(ROWS)
+    expected = formatter(environments)
+
+    print("%-12s %12s" % ("formatter", "paths/s"))
+    for name, func in (("formatter", formatter),
+                       ("compiled", compiled)):
+        start = time.time()
+        paths = func(environments)
+        duration = time.time() - start
+
+        assert paths == expected, name
+        print("%-12s %12d" % (name, ROWS / duration))
+
+
+if __name__ == "__main__":
+    main()
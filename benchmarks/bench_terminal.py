@@ -0,0 +1,99 @@
+"""Throughput of the terminal, in lines per second
+
+Lines are logged as a chatty process would print them, and shown
+in a view like the launcher's own terminal, such that the cost of
+updating the view is part of the measurement.
+
+Usage:
+    $ python benchmarks/bench_terminal.py
+
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("QT_QUICK_BACKEND", "software")
+
+from PyQt5 import QtCore, QtGui, QtQuick  # noqa
+from launcher import model, terminal  # noqa
+
+LINES = 100000
+
+# Lines printed between each turn of the event loop
+BURST = 500
+
+QML = """
+import QtQuick 2.6
+
+ListView {
+    id: terminalView
+    width: 500
+    height: 300
+    model: terminal
+
+    delegate: Text {
+        text: line
+        width: ListView.view.width
+    }
+
+    Connections {
+        target: terminal
+        onRowsInserted: terminalView.positionViewAtEnd()
+    }
+}
+"""
+
+
+def measure(buffer, lines, source):
+    app = QtGui.QGuiApplication.instance()
+
+    view = QtQuick.QQuickView()
+    view.rootContext().setContextProperty("terminal", buffer)
+    view.setSource(QtCore.QUrl.fromLocalFile(source))
+    view.show()
+
+    start = time.time()
+    for index in range(lines):
+        buffer.append({"line": "frame %d rendered" % index, "level": 2})
+
+        if index % BURST == 0:
+            app.processEvents()
+
+    if hasattr(buffer, "flush"):
+        buffer.flush()
+
+    app.processEvents()
+    view.grabWindow()
+    duration = time.time() - start
+
+    view.close()
+
+    return lines / duration, buffer.rowCount()
+
+
+def main():
+    app = QtGui.QGuiApplication(sys.argv)
+
+    source = os.path.join(tempfile.mkdtemp(), "main.qml")
+    with open(source, "w") as f:
+        f.write(QML)
+
+    print("%-12s %12s %10s" % ("model", "lines/s", "rows"))
+    for name, buffer in (
+            ("list", model.Model([], roles=["line", "level"])),
+            ("ring", terminal.Buffer())):
+        rate, rows = measure(buffer, LINES, source)
+        print("%-12s %12d %10d" % (name, rate, rows))
+
+    shutil.rmtree(os.path.dirname(source))
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Time until a tool prints, on a new versus a warm interpreter
+
+The tool imports Qt, as the tools of Avalon do, and prints once ready.
+
+Usage:
+    $ python benchmarks/bench_warm.py
+
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from launcher import warm  # noqa
+
+REPEAT = 5
+
+IMPORTS = ["PyQt5.QtWidgets", "PyQt5.QtQml", "PyQt5.QtQuick"]
+
+TOOL = """\
+import sys
+from PyQt5 import QtWidgets, QtQml, QtQuick
+print("ready %s" % sys.argv[1])
+"""
+
+
+def launch(executable, args, environment=None):
+    return subprocess.Popen([executable] + args,
+                            env=environment,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT,
+                            universal_newlines=True)
+
+
+def first_line(start, popen):
+    line = popen.stdout.readline()
+    duration = (time.time() - start) * 1000
+    popen.wait()
+    assert line.startswith("ready"), line
+    return duration
+
+
+def main():
+    tempdir = tempfile.mkdtemp()
+    with open(os.path.join(tempdir, "bench_tool.py"), "w") as f:
+        f.write(TOOL)
+
+    os.environ["PYTHONPATH"] = os.pathsep.join([
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
+        tempdir,
+        os.getenv("PYTHONPATH", ""),
+    ])
+
+    cold = list()
+    for index in range(REPEAT):
+        start = time.time()
+        popen = launch(sys.executable, ["-u", "-m", "bench_tool", "cold"])
+        cold.append(first_line(start, popen))
+
+    pool = warm.Pool(size=1,
+                     executable=sys.executable,
+                     imports=IMPORTS,
+                     launch=launch)
+    pool.start()
+
+    hot = list()
+    for index in range(REPEAT):
+
+        # As when clicked a while after the previous tool
+        while not pool.ready():
+            time.sleep(0.01)
+
+        start = time.time()
+        popen = pool.run("bench_tool", ["warm"])
+        hot.append(first_line(start, popen))
+
+    pool.close()
+    shutil.rmtree(tempdir)
+
+    print("%-8s %10s %10s" % ("start", "min ms", "mean ms"))
+    for name, values in (("cold", cold), ("warm", hot)):
+        print("%-8s %10.1f %10.1f" % (name, min(values),
+                                      sum(values) / len(values)))
+
+
+if __name__ == "__main__":
+    main()
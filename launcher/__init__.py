@@ -30,4 +30,8 @@ def install():
     print("Registering environment actions..")
     actions.register_environment_actions()
 
+    # Interpreters for tools, if enabled
+    from . import warm
+    warm.install()
+
     self._is_installed = True
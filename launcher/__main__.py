@@ -3,14 +3,64 @@
 import os
 import sys
 import argparse
+import threading
 import importlib
 
+try:
+    from importlib.util import find_spec
+except ImportError:
+    # Python 2
+    from pkgutil import find_loader as find_spec
+
 from . import _SESSION_STEPS, _PLACEHOLDER
 
 EXIT_SUCCESS = 0
 EXIT_FAILURE = 1
 
 
+def _unique(paths):
+    """Return non-empty `paths`, without duplicates, in order
+
+    Example:
+        >>> _unique(["/core", "", "/config", "/core"])
+        ['/core', '/config']
+
+    """
+
+    unique = list()
+
+    for path in paths:
+        if path and path not in unique:
+            unique.append(path)
+
+    return unique
+
+
+def _location(spec):
+    """Return directory of module found as `spec`"""
+    path = getattr(spec, "origin", None) or getattr(spec, "filename", "")
+
+    if os.path.isdir(path):
+        return path
+
+    if not os.path.isfile(path):
+        # Namespace packages, of which the origin is None or "namespace"
+        locations = getattr(spec, "submodule_search_locations", None)
+
+        if locations:
+            return list(locations)[0]
+
+    return os.path.dirname(path)
+
+
+def _preload(module):
+    try:
+        importlib.import_module(module)
+    except Exception:
+        # Raised again once imported for real
+        pass
+
+
 def cli():
     # Check environment dependencies
     missing = []
@@ -25,6 +75,22 @@ def cli():
 
         return EXIT_FAILURE
 
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--demo", action="store_true")
+    parser.add_argument("--root", default=os.environ["AVALON_PROJECTS"])
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Write timings to PATH on exit, "
+                             "viewable in chrome://tracing")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print time taken by each import "
+                             "until the window is shown")
+
+    kwargs = parser.parse_args()
+
+    if kwargs.profile_startup:
+        from . import tracing
+        tracing.profile_imports()
+
     # Add deprecated environment variable dependencies
     variables = [
         "PYBLISH_BASE",
@@ -32,14 +98,17 @@ def cli():
         "AVALON_CORE",
     ]
 
-    os.environ["PYTHONPATH"] = os.pathsep.join(
+    # Every entry of the path is searched by every later import,
+    # including empty and duplicate ones.
+    paths = _unique(
         os.environ.get("PYTHONPATH", "").split(os.pathsep) +
         [os.getenv(variable, "") for variable in variables]
     )
 
-    sys.path.extend(os.environ["PYTHONPATH"].split(os.pathsep))
+    os.environ["PYTHONPATH"] = os.pathsep.join(paths)
+    sys.path.extend(path for path in paths if path not in sys.path)
 
-    # Check modules dependencies
+    # Check modules dependencies, without importing them
     missing = list()
     dependencies = {
         "PyQt5": None,
@@ -49,9 +118,15 @@ def cli():
 
     for dependency in dependencies:
         try:
-            dependencies[dependency] = importlib.import_module(dependency)
-        except ImportError as e:
+            spec = find_spec(dependency)
+        except (ImportError, ValueError) as e:
             missing.append([dependency, e])
+            continue
+
+        if spec is None:
+            missing.append([dependency, "No module named %s" % dependency])
+        else:
+            dependencies[dependency] = _location(spec)
 
     if missing:
         missing_formatted = []
@@ -69,11 +144,12 @@ def cli():
 
         return EXIT_FAILURE
 
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--demo", action="store_true")
-    parser.add_argument("--root", default=os.environ["AVALON_PROJECTS"])
-
-    kwargs = parser.parse_args()
+    # The configuration is imported whilst Qt starts up,
+    # ahead of being used to register actions.
+    thread = threading.Thread(target=_preload,
+                              args=(os.environ["AVALON_CONFIG"],))
+    thread.daemon = True
+    thread.start()
 
     # Fulfill schema, and expect the application
     # to fill it in in due course.
@@ -84,16 +160,14 @@ def cli():
     print("Using root @ '%s'" % kwargs.root)
     print("Using config: '%s'" % os.environ["AVALON_CONFIG"])
 
-    dependencies["launcher"] = sys.modules[__name__]
-    for dependency, lib in dependencies.items():
-        print("Using {0} @ '{1}'".format(
-            dependency, os.path.dirname(lib.__file__))
-        )
+    dependencies["launcher"] = os.path.dirname(os.path.abspath(__file__))
+    for dependency, location in dependencies.items():
+        print("Using {0} @ '{1}'".format(dependency, location))
 
     # For maintaning backwards compatibility on toml applications where
-    # AVALON_CORE is used, we set the environment from the modules imported.
+    # AVALON_CORE is used, we set the environment from the modules found.
     os.environ["AVALON_CORE"] = os.path.abspath(
-        os.path.join(dependencies["avalon"].__file__, "..", "..")
+        os.path.join(dependencies["avalon"], "..")
     )
 
     from . import app
@@ -1,22 +1,35 @@
 import os
+import sys
 import importlib
+import threading
 
 from avalon import api, lib
 
+from . import warm, discovery
+
+self = sys.modules[__name__]
+
+# Modules of AVALON_ACTIONS, and the actions they define
+self._index = discovery.Index(api.Action)
+
+# Actions of the index registered, see `register_environment_actions`
+self._registered = list()
+self._lock = threading.Lock()
+
 
 class ProjectManagerAction(api.Action):
     name = "projectmanager"
     label = "Project Manager"
     icon = "gear"
     order = 999     # at the end
+    threaded = True  # launches a process, and nothing more
 
     def is_compatible(self, session):
         return "AVALON_PROJECT" in session
 
     def process(self, session, **kwargs):
-        return lib.launch(executable="python",
-                          args=["-u", "-m", "avalon.tools.projectmanager",
-                                session['AVALON_PROJECT']])
+        return launch_tool("avalon.tools.projectmanager",
+                           [session['AVALON_PROJECT']])
 
 
 class LoaderAction(api.Action):
@@ -24,14 +37,31 @@ class LoaderAction(api.Action):
     label = "Loader"
     icon = "cloud-download"
     order = 998     # at the end
+    threaded = True  # launches a process, and nothing more
 
     def is_compatible(self, session):
         return "AVALON_PROJECT" in session
 
     def process(self, session, **kwargs):
-        return lib.launch(executable="python",
-                          args=["-u", "-m", "avalon.tools.loader",
-                                session['AVALON_PROJECT']])
+        return launch_tool("avalon.tools.loader",
+                           [session['AVALON_PROJECT']])
+
+
+def launch_tool(module, args):
+    """Run `module` like `python -u -m module`, warm where available
+
+    Tools are run on an interpreter started ahead of time, if any is
+    ready, see `launcher.warm`.
+
+    """
+
+    popen = warm.run(module, args)
+
+    if popen is None:
+        popen = lib.launch(executable="python",
+                           args=["-u", "-m", module] + args)
+
+    return popen
 
 
 def register_default_actions():
@@ -54,25 +84,46 @@ def register_config_actions():
 
 
 def register_environment_actions():
-    """Register actions from AVALON_ACTIONS for Launcher."""
+    """Register actions from AVALON_ACTIONS for Launcher.
+
+    Modules are loaded once, and again only once changed, such that
+    calling this again loads only what changed since last time. Safe
+    to call from any thread, as it reads from disk.
+
+    Actions registered otherwise, such as by the configuration, take
+    precedence, followed by the first action of each name in order of
+    directories, like `api.discover` finds those of registered paths.
+
+    """
 
     paths = os.environ.get("AVALON_ACTIONS")
-    if not paths:
+    if not paths and not self._registered:
         return
 
-    for path in paths.split(os.pathsep):
-        api.register_plugin_path(api.Action, path)
+    directories = paths.split(os.pathsep) if paths else []
 
-        # Run "register" if found.
-        for module in lib.modules_from_path(path):
-            if "register" not in dir(module):
-                continue
+    with self._lock:
+        self._index.update(directories)
 
+        for action in self._registered:
             try:
-                module.register()
-            except Exception as e:
-                print(
-                    "Register method in {0} failed: {1}".format(
-                        module, str(e)
-                    )
-                )
+                api.deregister_plugin(api.Action, action)
+            except (KeyError, ValueError):
+                # Deregistered elsewhere since
+                pass
+
+        names = set(action.__name__ for action in api.discover(api.Action))
+        self._registered[:] = []
+
+        for action in self._index.plugins():
+            if action in self._registered:
+                # Imported into more than one module
+                continue
+
+            if action.__name__ in names:
+                print("Duplicate plug-in found: %s" % action)
+                continue
+
+            names.add(action.__name__)
+            self._registered.append(action)
+            api.register_plugin(api.Action, action)
@@ -5,11 +5,10 @@ import os
 import sys
 
 # Dependencies
-from avalon import io
 from PyQt5 import QtCore, QtGui, QtQml, QtWidgets
 
 # Local libraries
-from . import control, terminal, lib
+from . import control, terminal, lib, tracing, startup, icons
 
 QML_IMPORT_DIR = lib.resource("qml")
 APP_PATH = lib.resource("qml", "main.qml")
@@ -25,6 +24,7 @@ class Application(QtWidgets.QApplication):
     def __init__(self, root, source):
         super(Application, self).__init__(sys.argv)
         self.setWindowIcon(QtGui.QIcon(ICON_PATH))
+        self._started = tracing.clock()
 
         pixmap = QtGui.QPixmap(SPLASH_PATH)
         splash = QtWidgets.QSplashScreen(pixmap)
@@ -36,32 +36,42 @@ class Application(QtWidgets.QApplication):
         engine.warnings.connect(self.on_warnings)
         engine.addImportPath(QML_IMPORT_DIR)
 
-        self._splash.showMessage("Connecting database...",
-                                 QtCore.Qt.AlignBottom, QtCore.Qt.black)
-
-        try:
-            io.install()
-        except IOError:
-            raise  # Server refused to connect
-
-        # Install actions
-        from . import install
-        install()
+        # Icons are drawn once, and shared by every row of every view
+        engine.addImageProvider("icons", icons.Atlas())
 
         self._splash.showMessage("Starting Avalon Launcher...",
                                  QtCore.Qt.AlignBottom, QtCore.Qt.black)
 
         terminal.init()
 
-        controller = control.Controller(root, self)
+        controller = control.Controller(root, parent=self)
+        self.aboutToQuit.connect(controller.save)
+
+        # The window is shown first, and the remainder started in the
+        # background, showing the hierarchy as last seen meanwhile.
+        from . import install
+        pipeline = startup.Pipeline(parent=self)
+        pipeline.add("interface", label="Loading interface")
+        pipeline.add("database", controller.connect,
+                     label="Connecting to database")
+        pipeline.add("actions", install,
+                     lambda result: controller.refresh_actions(),
+                     label="Registering actions")
+        pipeline.add("projects", label="Listing projects")
+        pipeline.finished.connect(self.on_interactive)
+        controller.loadFinished.connect(self.on_load_finished)
+
         engine.rootContext().setContextProperty("controller", controller)
         engine.rootContext().setContextProperty("terminal", terminal.model)
+        engine.rootContext().setContextProperty("startup", pipeline)
 
         self._tray = None
         self.window = None
         self.engine = engine
         self.controller = controller
+        self.pipeline = pipeline
 
+        pipeline.start()
         engine.load(QtCore.QUrl.fromLocalFile(source))
 
         self.setQuitOnLastWindowClosed(False)
@@ -73,12 +83,33 @@ class Application(QtWidgets.QApplication):
 
         else:
             self.window = object
+            self.window.frameSwapped.connect(self.on_first_paint)
             self.init_tray()
             self._splash.close()
 
             self.controller.init()
             print("Success")
 
+    def on_first_paint(self):
+        self.window.frameSwapped.disconnect(self.on_first_paint)
+
+        tracing.complete("first paint", self._started)
+        print("First paint after %.0f ms" % (
+            (tracing.clock() - self._started) * 1000))
+
+        self.pipeline.complete("interface")
+
+    def on_load_finished(self, ok):
+        # Projects are listed once the root has loaded, whether or not
+        # they were first shown as last seen.
+        if not self.controller.breadcrumbs:
+            self.pipeline.complete("projects", ok)
+
+    def on_interactive(self):
+        tracing.complete("interactive", self._started)
+        print("Interactive after %.0f ms" % (
+            (tracing.clock() - self._started) * 1000))
+
     def on_warnings(self, warnings):
         for warning in warnings:
             print(warning.toString())
@@ -133,11 +164,35 @@ class Application(QtWidgets.QApplication):
         tray.showMessage("Avalon", "Launcher tray started.", 500)
 
 
-def main(root, demo=False):
-    """Start the Qt-runtime and show the window"""
+def main(root, demo=False, trace=None, profile_startup=False):
+    """Start the Qt-runtime and show the window
+
+    Arguments:
+        root (str): Root directory of projects
+        demo (bool, optional): Unused
+        trace (str, optional): Write timings to this path on exit
+        profile_startup (bool, optional): Print time taken by each
+            import made until the window is shown
+
+    """
 
     root = os.path.realpath(root)
 
+    if trace:
+        tracing.enable()
+
     print("Starting avalon-launcher")
-    app = Application(root, APP_PATH)
-    return app.exec_()
+
+    with tracing.span("startup"):
+        app = Application(root, APP_PATH)
+
+    if profile_startup:
+        sys.stderr.write(tracing.report_imports() + "\n")
+
+    try:
+        return app.exec_()
+
+    finally:
+        if trace:
+            tracing.export(trace)
+            print("Timings written to %s" % trace)
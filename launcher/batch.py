@@ -0,0 +1,250 @@
+"""Run an action across many targets, a few processes at a time
+
+Each target, such as a shot and task, is run as a job of its own.
+Jobs are started one at a time, whilst fewer than a limit are running
+and the machine has CPU and memory to spare, and followed until their
+process exits. Jobs processed in the background, see `launcher.runner`,
+are running from the time they are submitted.
+
+    scheduler = Scheduler(limit=4)
+    scheduler.exited.connect(lambda job: print(job.label, job.returncode))
+    scheduler.submit("maya", [("hulk/shots/sh010/lighting", launch)])
+
+"""
+
+import traceback
+
+from PyQt5 import QtCore
+
+from . import processes, runner
+
+Signal = QtCore.pyqtSignal
+
+# Maximum number of jobs running at once
+LIMIT = 4
+
+# Percentage of CPU and memory of the machine in use, beyond which
+# no further jobs are started until some of it is freed.
+CPU = 90.0
+MEMORY = 90.0
+
+# Milliseconds between each check for exited jobs, and start of a job
+INTERVAL = 250
+
+# Status of each job
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job(object):
+    """A target of a batch, and how it went
+
+    Arguments:
+        batch (Batch): Batch of job
+        label (str): Target of job, for display
+        start (callable): Return the process launched for the target,
+            None if it ran without one, or the `runner.Run` launching it
+
+    """
+
+    def __init__(self, batch, label, start):
+        self.batch = batch
+        self.label = label
+        self.start = start
+        self.status = PENDING
+        self.run = None
+        self.popen = None
+        self.returncode = None
+        self.error = None
+
+
+class Batch(object):
+    """Jobs of one action, submitted together"""
+
+    def __init__(self, name):
+        self.name = name
+        self.jobs = list()
+
+    def count(self, *statuses):
+        return len([job for job in self.jobs if job.status in statuses])
+
+    @property
+    def finished(self):
+        return self.count(DONE, FAILED) == len(self.jobs)
+
+
+class Scheduler(QtCore.QObject):
+    """Start jobs in order, whilst the machine has room for them
+
+    A job is started per interval at most, such that the resources
+    used by one are known before starting another. A job is always
+    started when none is running, regardless of the machine.
+
+    Arguments:
+        limit (int, optional): Maximum number of jobs running at once
+        cpu (float, optional): Percentage of CPU in use beyond which
+            no further jobs are started
+        memory (float, optional): Percentage of memory in use beyond
+            which no further jobs are started
+        interval (int, optional): Milliseconds between each check
+        parent (QObject, optional): Parent of scheduler
+
+    """
+
+    # A job started
+    #
+    # Arguments:
+    #   job (Job): Job started
+    #
+    started = Signal(object)
+
+    # A job exited, or failed to start
+    #
+    # Arguments:
+    #   job (Job): Job exited
+    #
+    exited = Signal(object)
+
+    def __init__(self,
+                 limit=LIMIT,
+                 cpu=CPU,
+                 memory=MEMORY,
+                 interval=INTERVAL,
+                 parent=None):
+        super(Scheduler, self).__init__(parent)
+
+        self._limit = max(1, limit)
+        self._cpu = cpu
+        self._memory = memory
+        self._pending = list()
+        self._running = list()
+        self._usage = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._on_tick)
+
+    def submit(self, name, targets):
+        """Run a job per target, in order
+
+        Arguments:
+            name (str): Name of the action run, for display
+            targets (list): Pairs of label and a function returning
+                the process launched for the target, see `Job`
+
+        Returns:
+            Batch: The jobs submitted
+
+        """
+
+        batch = Batch(name)
+        batch.jobs[:] = [Job(batch, label, start) for label, start in targets]
+
+        self._pending.extend(batch.jobs)
+
+        if not self._timer.isActive():
+            self._timer.start()
+
+            # The first job is started right away
+            self._on_tick()
+
+        return batch
+
+    def cancel(self, name):
+        """Never start jobs of batches of action `name` not yet started"""
+        for job in self._pending[:]:
+            if job.batch.name == name:
+                self._pending.remove(job)
+                job.error = "Cancelled"
+                self._exit(job, None)
+
+    def running(self):
+        return len(self._running)
+
+    def pending(self):
+        return len(self._pending)
+
+    def _on_tick(self):
+        for job in self._running[:]:
+            if job.run is not None:
+                if not job.run.finished:
+                    continue
+
+                self._follow(job)
+
+            if job.error is not None:
+                returncode = None
+            elif job.popen is None:
+                # Ran without a process
+                returncode = 0
+            else:
+                returncode = job.popen.poll()
+
+            if job.error is not None or returncode is not None:
+                self._running.remove(job)
+                self._exit(job, returncode)
+
+        usage = processes.usage()
+        busy = self._busy(usage)
+        self._usage = usage
+
+        if self._pending and len(self._running) < self._limit and not (
+                self._running and busy):
+            self._start(self._pending.pop(0))
+
+        if not self._pending and not self._running:
+            self._timer.stop()
+
+    def _busy(self, usage):
+        """Return whether the machine is too busy for another job"""
+        if usage is None or self._usage is None:
+            return False
+
+        busy, total, memory = usage
+        previous_busy, previous_total, _ = self._usage
+
+        if total > previous_total:
+            cpu = 100.0 * (busy - previous_busy) / (total - previous_total)
+        else:
+            cpu = 0.0
+
+        return cpu > self._cpu or memory > self._memory
+
+    def _start(self, job):
+        job.status = RUNNING
+
+        try:
+            started = job.start()
+        except Exception:
+            job.error = traceback.format_exc()
+            return self._exit(job, None)
+
+        if isinstance(started, runner.Run):
+            job.run = started
+        else:
+            job.popen = started
+
+        if job.run is not None or hasattr(job.popen, "poll"):
+            self._running.append(job)
+            self.started.emit(job)
+        else:
+            # Ran without a process
+            self.started.emit(job)
+            self._exit(job, 0)
+
+    def _follow(self, job):
+        """Follow the process launched by the run of `job`, once finished"""
+        run, job.run = job.run, None
+        job.popen = run.popen
+
+        if run.error is not None:
+            job.error = run.error
+        elif run.status == runner.CANCELLED:
+            job.error = "Cancelled"
+
+    def _exit(self, job, returncode):
+        job.returncode = returncode
+        job.status = DONE if returncode == 0 else FAILED
+        self.exited.emit(job)
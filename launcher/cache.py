@@ -0,0 +1,134 @@
+"""Cache of query results, expiring with time
+
+Example:
+    >>> cache = Cache(ttl=60, size=2)
+    >>> cache.fetch("projects", lambda: ["hulk"])
+    ['hulk']
+    >>> cache.fetch("projects", lambda: ["batman"])
+    ['hulk']
+    >>> cache.invalidate()
+    >>> cache.fetch("projects", lambda: ["batman"])
+    ['batman']
+    >>> cache.stats()["hits"], cache.stats()["misses"]
+    (1, 2)
+
+"""
+
+import time
+import threading
+import collections
+
+
+class Cache(object):
+    """Least recently used results of queries, expiring after `ttl`
+
+    Safe to use from multiple threads. Results are shared between
+    callers, and must be treated as read-only.
+
+    Arguments:
+        ttl (float, optional): Seconds until a result expires, 0 disables
+            caching altogether
+        size (int, optional): Maximum number of results kept, beyond which
+            the least recently used result is discarded, 0 disables
+            caching altogether
+        clock (callable, optional): Current time, in seconds
+
+    """
+
+    def __init__(self, ttl=60, size=256, clock=time.time):
+        self._ttl = ttl
+        self._size = size
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # key -> (time of result, result)
+        self._results = collections.OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self):
+        return len(self._results)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def _lookup(self, key):
+        """Return (time, result) of `key` if fresh, otherwise None"""
+        try:
+            entry = self._results.pop(key)
+        except KeyError:
+            return None
+
+        if self._clock() - entry[0] >= self._ttl:
+            self._expirations += 1
+            return None
+
+        # Most recently used results are last
+        self._results[key] = entry
+
+        return entry
+
+    def get(self, key, default=None):
+        """Return result of `key`, or `default` if missing or expired"""
+        with self._lock:
+            entry = self._lookup(key)
+
+            if entry is None:
+                self._misses += 1
+                return default
+
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key, result):
+        """Store `result` of `key`"""
+        if self._ttl <= 0 or self._size <= 0:
+            return
+
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = (self._clock(), result)
+
+            while len(self._results) > self._size:
+                self._results.popitem(last=False)
+                self._evictions += 1
+
+    def fetch(self, key, query):
+        """Return result of `key`, calling `query` for it if need be
+
+        Concurrent misses of the same key may each call `query`, the
+        last one to finish being the one stored.
+
+        """
+
+        missing = object()
+        result = self.get(key, missing)
+
+        if result is missing:
+            result = query()
+            self.put(key, result)
+
+        return result
+
+    def invalidate(self, key=None):
+        """Discard result of `key`, or every result if None"""
+        with self._lock:
+            if key is None:
+                self._results.clear()
+            else:
+                self._results.pop(key, None)
+
+    def stats(self):
+        """Return counters of this cache, for tuning its ttl and size"""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "size": len(self._results),
+            }
@@ -0,0 +1,116 @@
+"""Action compatibility engine
+
+Actions are instantiated once, when registered, and asked whether they
+are compatible with a session many times over; once per frame.
+
+Actions may declare their compatibility on fixed session keys, which
+is answered from an index rather than through a call per action.
+
+    class MyAction(api.Action):
+        requires = ["AVALON_TASK"]
+        accepts = {"AVALON_PROJECT": ["hulk", "batman"]}
+
+Actions implementing a custom `is_compatible` are evaluated, after
+having been filtered by any declarations of their own.
+
+"""
+
+_EMPTY = frozenset()
+
+
+def _function(method):
+    # Unbound methods in Python 2 are wrappers around the function
+    return getattr(method, "__func__", method)
+
+
+class ActionIndex(object):
+    """Index of actions, queried for the ones compatible with a session
+
+    Arguments:
+        actions (list): Action classes
+        base (type, optional): Class providing the default `is_compatible`,
+            defaults to `avalon.api.Action`
+
+    """
+
+    def __init__(self, actions, base=None):
+        if base is None:
+            from avalon import api
+            base = api.Action
+
+        default = _function(base.is_compatible)
+
+        # Sort once, such that compatible actions are already in order
+        actions = sorted(actions, key=lambda a: (a.order, a.name))
+
+        self._actions = actions
+        self._by_name = dict()
+        self._instances = list()
+        self._descriptions = list()
+        self._evaluated = set()
+        self._requires = dict()
+        self._accepts = dict()
+
+        for index, Action in enumerate(actions):
+            self._by_name.setdefault(Action.name, Action)
+            self._instances.append(Action())
+            self._descriptions.append({
+                "name": str(Action.name),
+                "icon": str(Action.icon or "cube"),
+                "label": str(Action.label or Action.name),
+                "color": getattr(Action, "color", None),
+                "order": Action.order
+            })
+
+            if _function(Action.is_compatible) is not default:
+                self._evaluated.add(index)
+
+            for key in getattr(Action, "requires", None) or []:
+                self._requires.setdefault(key, set()).add(index)
+
+            accepts = getattr(Action, "accepts", None) or {}
+            for key, values in accepts.items():
+                constrained, by_value = self._accepts.setdefault(
+                    key, (set(), dict())
+                )
+                constrained.add(index)
+                for value in values:
+                    by_value.setdefault(value, set()).add(index)
+
+    def __len__(self):
+        return len(self._actions)
+
+    def get(self, name):
+        """Return registered Action class by `name`, or None"""
+        return self._by_name.get(name)
+
+    def compatible(self, session):
+        """Return indices of actions compatible with `session`, in order"""
+        candidates = set(range(len(self._actions)))
+
+        for key, indices in self._requires.items():
+            if key not in session:
+                candidates -= indices
+
+        for key, (constrained, by_value) in self._accepts.items():
+            accepted = by_value.get(session.get(key), _EMPTY)
+            candidates -= constrained - accepted
+
+        return [
+            index for index in sorted(candidates)
+            if index not in self._evaluated
+            or self._instances[index].is_compatible(session)
+        ]
+
+    def collect(self, session):
+        """Return descriptions of every action compatible with `session`
+
+        Each description is a dictionary suitable for visualising the
+        action in the launcher, sorted by order and name.
+
+        """
+
+        return [
+            dict(self._descriptions[index])
+            for index in self.compatible(session)
+        ]
@@ -1,14 +1,19 @@
 import os
 import sys
-import copy
+import threading
 import traceback
+import functools
 import contextlib
 
 from PyQt5 import QtCore
 
 from avalon import api, io
 from avalon.vendor import six
-from . import lib, model, terminal
+from . import (
+    lib, model, terminal, frames, compat, worker, cache, prefetch, snapshot,
+    pipes, processes, tracing, actions, probe, search, batch,
+    runner, environment
+)
 from . import _SESSION_STEPS, _PLACEHOLDER
 
 PY2 = sys.version_info[0] == 2
@@ -41,6 +46,24 @@ DEFAULTS = {
     }
 }
 
+# Fields of assets displayed in the listing
+ASSET_PROJECTION = {
+    "name": True,
+    "data.label": True,
+    "data.icon": True,
+    "data.group": True,
+}
+
+# Fields of assets used on entering them, see `on_asset_changed`
+ENTERED_PROJECTION = {
+    "name": True,
+    "data": True,
+}
+
+# Assets prefetched on entering a silo, those at the top of its listing,
+# whereas others are prefetched once hovered, see `highlight`.
+PREFETCH_ASSETS = 10
+
 # Logging levels
 DEBUG = 1 << 0
 INFO = 1 << 1
@@ -49,6 +72,10 @@ ERROR = 1 << 3
 CRITICAL = 1 << 4
 
 
+class Missing(LookupError):
+    """A level entered by name does not exist"""
+
+
 class Controller(QtCore.QObject):
     # An item was clicked, causing an environment change
     #
@@ -63,12 +90,87 @@ class Controller(QtCore.QObject):
     # The hierarchy was navigated, either forwards or backwards
     navigated = Signal()
 
-    def __init__(self, root, parent=None):
+    # The current level started or finished loading
+    loadingChanged = Signal()
+
+    # The current level finished loading from the database
+    #
+    # Arguments:
+    #   ok (bool): Whether the level loaded, or failed to
+    #
+    loadFinished = Signal(bool, arguments=["ok"])
+
+    # Rows were selected or deselected, see `select`
+    selectionChanged = Signal()
+
+    def __init__(self, root, database=None, parent=None):
         super(Controller, self).__init__(parent)
 
         self._root = root
+
+        # Queried for projects and assets, such as `fixtures.Database`
+        # in place of the database, for benchmarks and tests.
+        self._io = io if database is None else database
         self._breadcrumbs = list()
-        self._processes = list()
+
+        # Output of launched processes is read by a single thread,
+        # and processes forgotten about once exited.
+        self._pipes = pipes.Multiplexer(parent=self)
+        self._pipes.messaged.connect(self.on_process_output)
+        self._pipes.exited.connect(self.on_process_exited)
+
+        # Launched processes, along with the resources they use
+        self._processes = processes.Processes(parent=self)
+        self._loading = False
+
+        # The database is connected to in the background, by
+        # whichever query comes first.
+        self._connected = False
+        self._connecting = threading.Lock()
+
+        # Queries run in the background, such that a slow
+        # database never blocks the interface.
+        self._worker = worker.Worker(parent=self)
+
+        # Modules of actions are scanned again on refresh, by a worker
+        # of their own, as leaving levels cancels queries.
+        self._scanner = worker.Worker(threads=1, parent=self)
+
+        # Results of queries are kept when navigating back and forth,
+        # until they expire or the launcher is refreshed.
+        self._cache = cache.Cache(
+            ttl=float(os.getenv("AVALON_LAUNCHER_CACHE_TTL", "60")),
+            size=int(os.getenv("AVALON_LAUNCHER_CACHE_SIZE", "256")),
+        )
+
+        # Names of projects by id, as results are of the project active
+        # when queried, see `query`.
+        self._project_names = dict()
+
+        # Levels likely to be entered next are loaded into the
+        # cache ahead of time, whenever nothing else is loading.
+        self._prefetcher = prefetch.Prefetcher(
+            self._cache,
+            budget=int(os.getenv("AVALON_LAUNCHER_PREFETCH", "10")),
+            busy=lambda: self._loading,
+            parent=self
+        )
+
+        # Levels are shown as last seen whilst being queried,
+        # such that the launcher is usable the moment it starts.
+        # Databases other than the one of the user are never kept.
+        self._snapshot = None
+        path = os.getenv(
+            "AVALON_LAUNCHER_SNAPSHOT",
+            snapshot.default_path() if database is None else ":memory:"
+        )
+        if path:
+            try:
+                self._snapshot = snapshot.Snapshot(path)
+            except Exception:
+                terminal.log("Snapshot unavailable: %s" % path,
+                             terminal.WARNING)
+
         self._model = model.Model(
             items=[],
             roles=[
@@ -76,8 +178,36 @@ class Controller(QtCore.QObject):
                 "name",
                 "label",
                 "icon",
-                "group"
-            ])
+                "group",
+                "workdir",
+                "modified",
+                "selected",
+            ],
+            incremental=True)
+
+        self._model.fetchFailed.connect(
+            lambda error: terminal.log(error.rstrip(), terminal.ERROR)
+        )
+
+        # Whether the work directory of each row exists, and when it
+        # was last modified, probed in the background as rows are shown.
+        self._probe = probe.Probe(
+            ttl=float(os.getenv("AVALON_LAUNCHER_PROBE_TTL", "5")),
+            watch=bool(os.getenv("AVALON_LAUNCHER_PROBE_WATCH")),
+            parent=self
+        )
+        self._probe.probed.connect(self.on_probed)
+
+        # Keys of rows, by the work directory probed for them
+        self._workdirs = dict()
+
+        # Rows are probed once per change, rather than per row
+        self._probing = QtCore.QTimer(self)
+        self._probing.setSingleShot(True)
+        self._probing.setInterval(0)
+        self._probing.timeout.connect(self.probe_workdirs)
+        self._model.rowsInserted.connect(self._probing.start)
+        self._model.modelReset.connect(self._probing.start)
 
         self._actions = model.Model(
             items=[],
@@ -86,11 +216,62 @@ class Controller(QtCore.QObject):
                 "name",
                 "label",
                 "icon",
-                "color"
-            ])
+                "color",
+                "progress",
+            ],
+            incremental=True)
 
-        # Store the registered actions for a projects
+        # Store the registered actions for a projects, along
+        # with an index of their compatibility.
         self._registered_actions = list()
+        self._action_index = compat.ActionIndex([])
+
+        # Actions are discovered once, until refreshed
+        self._discovered = None
+
+        # Every level of projects entered, searchable by name, and
+        # indexed in the background a project at a time.
+        self._index = search.Index()
+        self._indexed = set()
+        self._indexer = worker.Worker(threads=1, parent=self)
+        self._found = list()
+        self._results = model.Model(
+            items=[],
+            roles=[
+                "name",
+                "label",
+                "icon",
+                "parents",
+            ])
+
+        # Names of rows selected at a level, across which actions are
+        # run rather than for the current level alone, see `targets`.
+        self._selected = list()
+        self._selected_at = None
+
+        # Processes of actions run across many targets are started a
+        # few at a time, whilst the machine has room for them.
+        self._scheduler = batch.Scheduler(
+            limit=int(os.getenv("AVALON_LAUNCHER_BATCH_LIMIT", "4")),
+            cpu=float(os.getenv("AVALON_LAUNCHER_BATCH_CPU", "90")),
+            memory=float(os.getenv("AVALON_LAUNCHER_BATCH_MEMORY", "90")),
+            parent=self
+        )
+        self._scheduler.exited.connect(self.on_job_exited)
+
+        # Actions are processed in the background, and their progress,
+        # from 0 to 1, shown by name until done.
+        self._runner = runner.Runner(
+            threads=int(os.getenv("AVALON_LAUNCHER_ACTION_THREADS", "4")),
+            parent=self
+        )
+        self._runner.started.connect(self.on_action_started)
+        self._runner.progressed.connect(self.on_action_progressed)
+        self._runner.finished.connect(self.on_action_finished)
+
+        # Levels left to enter, on going to a search result
+        self._route = list()
+        self.loadFinished.connect(self._follow)
 
         # A "frame" contains the environment at a given point
         # in the asset hierarchy. For example, browsing all the
@@ -101,7 +282,9 @@ class Controller(QtCore.QObject):
 
     @Property(str, constant=True)
     def title(self):
-        return (api.Session["AVALON_LABEL"] or "Avalon") + " Launcher"
+        # Called before having connected to the database
+        label = api.Session.get("AVALON_LABEL", os.getenv("AVALON_LABEL"))
+        return (label or "Avalon") + " Launcher"
 
     @Slot()
     def launch_explorer(self):
@@ -121,26 +304,34 @@ class Controller(QtCore.QObject):
             print("No project found in configuration")
             return
 
-        template = config['template']['work']
-        path = lib.partial_format(template, frame["environment"])
-
         # Keep only the part of the path that was formatted
-        path = os.path.normpath(path.split("{", 1)[0])
+        template = lib.compile_template(config['template']['work'])
+        path = os.path.normpath(template.resolve(frame["environment"]))
 
         print(path)
-        if os.path.exists(path):
-            import subprocess
-            # todo(roy): Make this cross OS compatible (currently windows only)
-            subprocess.Popen(r'explorer "{}"'.format(path))
+
+        def explore(exists):
+            if exists:
+                import subprocess
+                # todo(roy): Make this cross OS compatible
+                # (currently windows only)
+                subprocess.Popen(r'explorer "{}"'.format(path))
+
+        self._probe.exists(path, explore)
 
     def current_frame(self):
-        """Shorthand for the current frame"""
+        """Return a writable child of the current frame
+
+        The child shares every key with the current frame, such that
+        modifying it leaves the frame it was derived from untouched.
+
+        """
+
         try:
-            # Nested dictionaries require deep copying.
-            return copy.deepcopy(self._frames[-1])
+            return self._frames[-1].child()
 
         except IndexError:
-            return dict()
+            return frames.Frame()
 
     @Property("QVariant", notify=navigated)
     def breadcrumbs(self):
@@ -158,14 +349,44 @@ class Controller(QtCore.QObject):
                 for key, value in frame.items()
             ]
 
+    @Property(bool, notify=navigated)
+    def stale(self):
+        """Whether the current level is shown as last seen"""
+        try:
+            return self._frames[-1]["stale"]
+        except (IndexError, KeyError):
+            return False
+
+    @Property(int, notify=selectionChanged)
+    def selected(self):
+        """Number of rows selected"""
+        return len(self._selected)
+
+    @Property(bool, notify=loadingChanged)
+    def loading(self):
+        return self._loading
+
+    def set_loading(self, loading):
+        if loading != self._loading:
+            self._loading = loading
+            self.loadingChanged.emit()
+
     @Property(model.Model, notify=navigated)
     def actions(self):
         return self._actions
 
+    @Property(model.Model, constant=True)
+    def results(self):
+        return self._results
+
     @Property(model.Model, notify=navigated)
     def model(self):
         return self._model
 
+    @Property(processes.Processes, constant=True)
+    def processes(self):
+        return self._processes
+
     @Slot(str)
     def command(self, command):
         if not command:
@@ -186,7 +407,18 @@ class Controller(QtCore.QObject):
 
     @Slot(QtCore.QModelIndex)
     def push(self, index):
-        name = model.data(index, "name")
+        self._route[:] = []
+        self.enter(model.data(index, "name"), model.data(index, "_id"))
+
+    def enter(self, name, _id=None):
+        """Enter the level of item `name` of the current level
+
+        Arguments:
+            name (str): Name of project, silo, asset or task
+            _id (ObjectId, optional): Id of asset
+
+        """
+
         self.breadcrumbs.append(name)
 
         level = len(self.breadcrumbs)
@@ -197,16 +429,21 @@ class Controller(QtCore.QObject):
             4: self.on_task_changed
         }[level]
 
-        handler(index)
+        with tracing.span("push", item=name, level=level):
 
-        # Push the compatible applications
-        actions = self.collect_compatible_actions(self._registered_actions)
-        self._actions.push(actions)
+            # Compatible actions are collected once the level has loaded
+            self._worker.cancel()
+            self._prefetcher.cancel()
+            self._actions.push([])
 
-        self.navigated.emit()
+            with tracing.span(handler.__name__):
+                handler(name, _id)
+
+            self.navigated.emit()
 
     @Slot(int)
     def pop(self, index=None):
+        self._route[:] = []
 
         if index is None:
             # Regular pop behavior
@@ -214,10 +451,27 @@ class Controller(QtCore.QObject):
         elif index < 0:
             # Refresh; go beyond first index
             steps = len(self.breadcrumbs) + 1
+
+            self.log("Query cache: %(hits)d hits, %(misses)d misses, "
+                     "%(size)d results" % self._cache.stats(), level=INFO)
+            self._cache.invalidate()
+            self._indexed.clear()
+
+            # Pick up actions changed on disk, shown once loaded
+            self._scanner.submit(actions.register_environment_actions,
+                                 lambda result: self.refresh_actions())
         else:
             # Go to index
             steps = len(self.breadcrumbs) - index - 1
 
+        # Stop loading the level being left
+        self._worker.cancel()
+        self._prefetcher.cancel()
+        self.set_loading(False)
+
+        # Levels seen so far are kept, once done with
+        self.save()
+
         for i in range(steps):
             self._frames.pop()
             self._model.pop()
@@ -240,163 +494,751 @@ class Controller(QtCore.QObject):
             step = _SESSION_STEPS[len(self.breadcrumbs)]
             api.Session[step] = _PLACEHOLDER
 
+        if self._selected_at is not None:
+            # Rows are selected until the level above them is left
+            if len(self.breadcrumbs) < self._selected_at:
+                self.deselect()
+            else:
+                self._mark_selected()
+                self._actions.replace(self.collect_compatible_actions())
+
+    @Slot(QtCore.QModelIndex)
+    def select(self, index):
+        """Select or deselect the row at `index`, as a target of actions
+
+        Rows are selected at one level at a time, selecting a row of
+        another level deselecting the rest.
+
+        """
+
+        name = model.data(index, "name")
+        level = len(self.breadcrumbs)
+
+        if self._selected_at != level:
+            self._selected[:] = []
+            self._selected_at = level
+
+        if name in self._selected:
+            self._selected.remove(name)
+        else:
+            self._selected.append(name)
+
+        if not self._selected:
+            self._selected_at = None
+
+        self._mark_selected()
+        self._actions.replace(self.collect_compatible_actions())
+        self.selectionChanged.emit()
+
+    @Slot()
+    def deselect(self):
+        """Deselect every row"""
+        self._selected[:] = []
+        self._selected_at = None
+
+        self._mark_selected()
+        self._actions.replace(self.collect_compatible_actions())
+        self.selectionChanged.emit()
+
+    def _mark_selected(self):
+        """Show which rows of the current level are selected"""
+        selected = set()
+        if self._selected_at == len(self.breadcrumbs):
+            selected.update(self._selected)
+
+        values = dict()
+        for row in range(self._model.rowCount()):
+            index = self._model.index(row)
+            name = model.data(index, "name")
+            key = model.data(index, "_id")
+
+            values[name if key is None else key] = {
+                "selected": name in selected
+            }
+
+        self._model.update(values)
+
+    def targets(self):
+        """Return paths acted upon, one per row selected, if any
+
+        Rows selected are substituted into the current path, such
+        that with shots selected, an action of a task of one of them
+        is run for the same task of every shot selected.
+
+        Returns:
+            list: Names of project, silo, asset and task, per target
+
+        """
+
+        if not self._selected:
+            return []
+
+        level = self._selected_at
+        path = list(self.breadcrumbs)
+
+        return [
+            tuple(path[:level] + [name] + path[level + 1:])
+            for name in self._selected
+        ]
+
+    def load(self, func, callback, recall=None):
+        """Load the current level in the background
+
+        Once loaded, `callback` is called with the result of `func`
+        in the GUI thread, after which actions compatible with the
+        level are collected.
+
+        Loading is cancelled when navigating away from the level.
+
+        Arguments:
+            func (callable): Return the level, from the database
+            callback (callable): Show the result of `func`
+            recall (callable, optional): Return the level as last seen,
+                or None, shown through `callback` until loaded. The level
+                remains marked as stale should loading fail.
+
+        """
+
+        frame = self._frames[-1]
+        start = tracing.clock()
+
+        def on_error(message):
+            terminal.log(message.rstrip(), terminal.ERROR)
+            self.set_loading(False)
+            self.loadFinished.emit(False)
+
+        def on_loaded(result):
+            tracing.complete("query", start, level=len(self._breadcrumbs))
+
+            try:
+                with tracing.span("show"):
+                    callback(result)
+            except Missing as exc:
+                on_error(str(exc))
+            except Exception:
+                on_error(traceback.format_exc())
+            else:
+                self.loaded()
+
+        result = recall() if recall is not None else None
+        if result is not None:
+            try:
+                callback(result)
+            except Exception:
+                # Left for the database to sort out
+                pass
+            else:
+                frame["stale"] = True
+                self._actions.replace(self.collect_compatible_actions())
+                self.navigated.emit()
+
+        self.set_loading(True)
+        self._worker.submit(func, on_loaded, on_error)
+
+    def loaded(self):
+        """Complete the current level, once its items are loaded"""
+        self._frames[-1]["stale"] = False
+
+        with tracing.span("collect_compatible_actions"):
+            compatible = self.collect_compatible_actions()
+        self._actions.replace(compatible)
+
+        self.set_loading(False)
+        self.navigated.emit()
+
+        # Prior to entering the next level of a path being opened
+        self.prefetch()
+
+        self.loadFinished.emit(True)
+
+    def probe_workdirs(self):
+        """Probe the work directory of each asset or task listed"""
+        self._workdirs.clear()
+
+        # Rows are assets, or tasks
+        key = {2: "asset", 3: "task"}.get(len(self.breadcrumbs))
+
+        try:
+            frame = self._frames[-1]
+            template = frame["config"]["template"]["work"]
+        except (IndexError, KeyError, TypeError):
+            return
+
+        if key is None:
+            return
+
+        environment = dict(frame["environment"], root=self._root)
+        indexes = [
+            self._model.index(row)
+            for row in range(self._model.rowCount())
+        ]
+
+        paths = lib.compile_template(template).resolve_many(
+            dict(environment, **{key: model.data(index, "name")})
+            for index in indexes
+        )
+
+        for index, path in zip(indexes, paths):
+            item = model.data(index, "_id") or model.data(index, "name")
+            self._workdirs.setdefault(os.path.normpath(path), []).append(item)
+
+        self.on_probed(self._probe.request(list(self._workdirs)))
+
+    def on_probed(self, results):
+        """Show whether work directories of rows exist, once probed"""
+        values = dict()
+
+        for path, (exists, modified) in results.items():
+            for item in self._workdirs.get(path, []):
+                values[item] = {"workdir": exists, "modified": modified}
+
+        if values:
+            self._model.update(values)
+
+    def index_project(self, name, project):
+        """Index every asset and task of project `name`, once
+
+        Assets are queried in the background, through the database of
+        the active project, which means only the active project is
+        ever indexed.
+
+        """
+
+        if name in self._indexed:
+            return
+
+        self._indexed.add(name)
+        tasks = [task["name"] for task in project["config"].get("tasks", [])]
+
+        def index():
+            self.connect()
+
+            if api.Session.get("AVALON_PROJECT") != name:
+                # Left for the next time the project is entered
+                self._indexed.discard(name)
+                return
+
+            projection = dict(ASSET_PROJECTION, **{
+                "silo": True,
+                "data.tasks": True,
+            })
+
+            entries = list()
+            for asset in self._io.find({"type": "asset"},
+                                       projection=projection):
+                data = asset.get("data", {})
+                path = (name, asset.get("silo"), asset["name"])
+
+                entries.append((path, {
+                    "_id": asset["_id"],
+                    "label": data.get("label"),
+                    "icon": data.get("icon") or DEFAULTS["icon"]["asset"],
+                }))
+
+                for task in data.get("tasks") or tasks:
+                    entries.append((path + (task,), {
+                        "icon": DEFAULTS["icon"]["task"],
+                    }))
+
+            self._index.add(entries)
+
+        self._indexer.submit(index)
+
+    @Slot(str)
+    def search(self, query):
+        """List levels of projects entered so far best matching `query`"""
+        with tracing.span("search"):
+            self._found[:] = self._index.search(query)
+
+        self._results.replace([
+            {
+                "name": path[-1],
+                "label": data.get("label") or path[-1],
+                "icon": data.get("icon"),
+                "parents": " / ".join(path[:-1]),
+            }
+            for path, data in self._found
+        ])
+
+    @Slot(int)
+    def goto(self, row):
+        """Enter the level of search result `row`, and those above it"""
+        path, data = self._found[row]
+        self.open(path)
+
+    def open(self, path):
+        """Enter the levels of `path` in turn, by name
+
+        Levels in common with the current breadcrumbs are kept, and
+        each level below them entered once the one above has loaded.
+
+        Arguments:
+            path (list): Names of project, silo, asset and task, such
+                as ["hulk", "assets", "bruce"]
+
+        """
+
+        path = tuple(path)
+
+        # Levels in common are kept
+        common = 0
+        for crumb, name in zip(self.breadcrumbs, path):
+            if crumb != name:
+                break
+            common += 1
+
+        while len(self.breadcrumbs) > common:
+            self.pop()
+
+        self._route[:] = [
+            (name, self._index.get(path[:depth + 1], {}).get("_id"))
+            for depth, name in enumerate(path)
+        ][common:]
+
+        if not self._loading:
+            self._follow(True)
+
+    def opening(self):
+        """Whether levels of a path are yet to be entered, see `open`"""
+        return bool(self._route)
+
+    def _follow(self, ok):
+        """Enter the next level of a path being opened, once loaded"""
+        if not self._route:
+            return
+
+        if not ok:
+            self._route[:] = []
+            return
+
+        name, _id = self._route.pop(0)
+        self.enter(name, _id)
+
+    def prefetch(self):
+        """Load the first few levels below the current level ahead of time
+
+        Projects are queried through the active project only, which
+        means projects other than the active one aren't prefetched.
+
+        """
+
+        level = len(self.breadcrumbs)
+        rows = self._model.rowCount()
+
+        if level == 1:
+            project = self._frames[-1]["project"]
+            for row in range(rows):
+                silo = model.data(self._model.index(row), "name")
+                self._prefetch_assets(project, silo)
+
+        elif level == 2:
+            project = self._frames[-1]["project"]
+            ids = [
+                model.data(self._model.index(row), "_id")
+                for row in range(min(rows, PREFETCH_ASSETS))
+            ]
+
+            # Fetched together, and stored individually
+            self._prefetcher.request(
+                ("assets", tuple(ids)),
+                lambda: self.query_assets(ids, project)
+            )
+
+    @Slot(QtCore.QModelIndex)
+    def highlight(self, index):
+        """Prefetch the level behind a row, such as the one hovered"""
+        level = len(self.breadcrumbs)
+
+        if level == 1:
+            self._prefetch_assets(self._frames[-1]["project"],
+                                  model.data(index, "name"),
+                                  urgent=True)
+
+        elif level == 2:
+            _id = model.data(index, "_id")
+            project = self._frames[-1]["project"]
+            self._prefetcher.request(("asset", _id),
+                                     lambda: self.query_asset(_id, project),
+                                     urgent=True)
+
+    def _prefetch_assets(self, project, silo, urgent=False):
+        self._prefetcher.request(
+            ("silo", project, silo, 0, model.PAGE_SIZE),
+            lambda: self.query_silo(project, silo, 0, model.PAGE_SIZE),
+            urgent=urgent
+        )
+
+    def connect(self):
+        """Connect to the database, unless connected, from any thread"""
+        with self._connecting:
+            if self._connected:
+                return
+
+            self._io.install()
+
+            # Navigation may have happened whilst connecting, which
+            # mustn't be reverted by the session of the environment.
+            for step, name in zip(_SESSION_STEPS, list(self._breadcrumbs)):
+                api.Session[step] = name
+
+            self._connected = True
+
+    def wait(self, msecs=-1):
+        """Block until queries running in the background are done
+
+        For tests and benchmarks, queries are otherwise left running
+        on exit.
+
+        """
+
+        for work in (self._worker,
+                     self._scanner,
+                     self._prefetcher,
+                     self._indexer,
+                     self._runner):
+            work.wait(msecs)
+
+    def query(self, key, func, project=None):
+        """Return result of `key` from the cache, or by calling `func`
+
+        Results of `func` are stored in the snapshot, for the next time
+        the launcher is started.
+
+        Queries are made through the active project. Given the name of
+        the `project` of `key`, results are discarded rather than stored
+        should another project have been entered meanwhile.
+
+        """
+
+        def query():
+            self.connect()
+            self._expect(project, key)
+            result = func()
+            self._expect(project, key)
+
+            if self._snapshot is not None:
+                self._snapshot.put(key, result)
+
+            return result
+
+        return self._cache.fetch(key, query)
+
+    def _expect(self, project, key):
+        """Raise should `project` no longer be active, whilst querying `key`
+
+        Called from worker threads, such that the result of `key` isn't
+        stored as that of another project.
+
+        """
+
+        if project is not None and \
+                api.Session.get("AVALON_PROJECT") != project:
+            raise RuntimeError("Left %s whilst querying %s"
+                               % (project, key))
+
+    def save(self):
+        """Write levels queried since last time to the snapshot"""
+        if self._snapshot is None:
+            return
+
+        try:
+            self._snapshot.flush()
+        except Exception as e:
+            terminal.log("Snapshot not saved: %s" % e, terminal.WARNING)
+
+    def recall(self, key):
+        """Return result of `key` as last seen, from the snapshot, or None"""
+        if self._snapshot is not None:
+            return self._snapshot.get(key)
+
+    def query_projects(self):
+        """Return every project, sorted by name"""
+        return self.query(
+            ("projects",),
+            lambda: sorted(self._io.projects(), key=lambda x: x['name'])
+        )
+
+    def query_project(self, name):
+        """Return document and silos of the active project `name`"""
+        def query():
+            project = self._io.find_one({"type": "project"})
+
+            assert project is not None, "This is a bug"
+
+            return project, self._io.distinct("silo")
+
+        return self.query(("project", name), query, name)
+
+    def query_silo(self, project, silo, skip, limit):
+        """Return a page of the assets of `silo`, as shown in the listing"""
+        return self.query(
+            ("silo", project, silo, skip, limit),
+            lambda: list(self._io.find(
+                {
+                    "type": "asset",
+                    "parent": project,
+                    "silo": silo,
+
+                    # Discard hidden items, of which visible is falsy,
+                    # keeping those without it.
+                    "$or": [
+                        {"data.visible": {"$exists": False}},
+                        {"data.visible": {"$nin": [False, 0, None, ""]}},
+                    ],
+                },
+                projection=ASSET_PROJECTION,
+
+                # Sort by group, items without a group at the top,
+                # and inner items by name.
+                sort=[("data.group", 1), ("name", 1), ("_id", 1)]
+            ).skip(skip).limit(limit)),
+            self._project_names.get(project)
+        )
+
+    def query_asset(self, _id, project=None):
+        """Return the fields of asset `_id` of `project` used on entering"""
+        return self.query(
+            ("asset", _id),
+            lambda: self._io.find_one({"_id": _id},
+                                      projection=ENTERED_PROJECTION),
+            self._project_names.get(project)
+        )
+
+    def query_asset_by_name(self, project, silo, name):
+        """Return the fields of asset `name` of `silo` used on entering"""
+        return self.query(
+            ("asset", project, silo, name),
+            lambda: self._io.find_one({
+                "type": "asset",
+                "parent": project,
+                "silo": silo,
+                "name": name,
+            }, projection=ENTERED_PROJECTION),
+            self._project_names.get(project)
+        )
+
+    def query_assets(self, ids, project=None):
+        """Cache the fields of many assets of `project` used on entering"""
+        self.connect()
+
+        name = self._project_names.get(project)
+        key = ("assets", tuple(ids))
+
+        self._expect(name, key)
+        assets = list(self._io.find({"_id": {"$in": list(ids)}},
+                                    projection=ENTERED_PROJECTION))
+        self._expect(name, key)
+
+        for asset in assets:
+            key = ("asset", asset["_id"])
+            self._cache.put(key, asset)
+
+            if self._snapshot is not None:
+                self._snapshot.put(key, asset)
+
     def init(self):
         terminal.log("initialising..")
         header = "Root"
 
-        self._model.push([
-            dict({
-                "_id": project["_id"],
-                "icon": DEFAULTS["icon"]["project"],
-                "name": project["name"],
-            }, **project["data"])
-            for project in sorted(io.projects(), key=lambda x: x['name'])
-            if project["data"].get("visible", True)  # Discard hidden projects
-        ])
+        if self._selected:
+            self._selected[:] = []
+            self._selected_at = None
+            self.selectionChanged.emit()
 
-        frame = {"environment": {}}
-        self._frames[:] = [frame]
-
-        # Discover all registered actions
-        discovered_actions = api.discover(api.Action)
-        self._registered_actions[:] = discovered_actions
+        self._worker.cancel()
+        self._model.push([])
+        self._actions.push([])
 
-        # Validate actions based on compatibility
-        actions = self.collect_compatible_actions(discovered_actions)
-        self._actions.push(actions)
+        frame = frames.Frame()
+        self._frames[:] = [frame]
 
         self.pushed.emit(header)
         self.navigated.emit()
-        terminal.log("ready")
 
-    def on_project_changed(self, index):
-        name = model.data(index, "name")
+        def on_projects(projects):
+            self._model.replace([
+                dict({
+                    "_id": project["_id"],
+                    "icon": DEFAULTS["icon"]["project"],
+                    "name": project["name"],
+                }, **project["data"])
+                for project in projects
+
+                # Discard hidden projects
+                if project["data"].get("visible", True)
+            ])
+
+            self._index.add(
+                ((project["name"],), {
+                    "label": project["data"].get("label"),
+                    "icon": DEFAULTS["icon"]["project"],
+                })
+                for project in projects
+                if project["data"].get("visible", True)
+            )
+
+            # Discover all registered actions
+            self.register_actions(self.discover_actions())
+
+            terminal.log("ready")
+
+        self.load(self.query_projects,
+                  on_projects,
+                  lambda: self.recall(("projects",)))
+
+    def on_project_changed(self, name, _id=None):
         api.Session["AVALON_PROJECT"] = name
 
         # Establish a connection to the project database
         self.log("Connecting to %s" % name, level=INFO)
 
         frame = self.current_frame()
-        project = io.find_one({"type": "project"})
-
-        assert project is not None, "This is a bug"
+        frame["environment"]["project"] = name
 
-        frame["config"] = project["config"]
+        self._model.push([])
+        self._frames.append(frame)
+        self.pushed.emit(name)
 
-        # Get available project actions and the application actions
-        actions = api.discover(api.Action)
-        apps = lib.get_apps(project)
-        self._registered_actions[:] = actions + apps
+        def on_project(result):
+            project, silos = result
 
-        silos = io.distinct("silo")
-        self._model.push([
-            dict({
-                "name": silo,
-                "icon": DEFAULTS["icon"]["silo"],
+            frame["config"] = project["config"]
+            frame["project"] = project["_id"]
+            self._project_names[project["_id"]] = name
+            frame["environment"].update({
+                "project_%s" % key: str(value)
+                for key, value in project["data"].items()
             })
-            for silo in sorted(silos)
-        ])
 
-        frame["project"] = project["_id"]
-        frame["environment"]["project"] = name
-        frame["environment"].update({
-            "project_%s" % key: str(value)
-            for key, value in project["data"].items()
-        })
+            # Get available project actions and the application actions
+            apps = lib.get_apps(project)
+            self.register_actions(self.discover_actions() + apps)
+            frame["apps"] = apps
+
+            self._model.replace([
+                dict({
+                    "name": silo,
+                    "icon": DEFAULTS["icon"]["silo"],
+                })
+                for silo in sorted(silos)
+            ])
 
-        self._frames.append(frame)
-        self.pushed.emit(name)
+            self._index.add(
+                ((name, silo), {"icon": DEFAULTS["icon"]["silo"]})
+                for silo in silos
+            )
 
-    def on_silo_changed(self, index):
-        name = model.data(index, "name")
+            self.index_project(name, project)
+
+        self.load(lambda: self.query_project(name),
+                  on_project,
+                  lambda: self.recall(("project", name)))
+
+    def on_silo_changed(self, name, _id=None):
         api.Session["AVALON_SILO"] = name
 
         frame = self.current_frame()
+        frame["environment"]["silo"] = name
 
-        self._model.push([
-            dict({
+        self._model.push([])
+        self._frames.append(frame)
+        self.pushed.emit(name)
+
+        # Assets are fetched a page at a time as the view scrolls, with
+        # only what the listing displays. The full asset is fetched once
+        # entered, see `on_asset_changed`.
+        def query(skip, limit):
+            return self.query_silo(frame["project"], name, skip, limit)
+
+        def transform(doc):
+            return dict({
                 "_id": doc["_id"],
                 "name": doc["name"],
                 "icon": DEFAULTS["icon"]["asset"],
-            }, **doc["data"])
-            for doc in sorted(
-                io.find({
-                    "type": "asset",
-                    "parent": frame["project"],
-                    "silo": name
-                }),
-
-                # Hard-sort by group
-                # TODO(marcus): Sorting should really happen in
-                # the model, via e.g. a Proxy.
-                key=lambda item: (
-                    # Sort by group
-                    item["data"].get(
-                        "group",
-
-                        # Put items without a
-                        # group at the top
-                        "0"),
-
-                    # Sort inner items by name
-                    item["name"]
+            }, **doc.get("data", {}))
+
+        # Further pages as last seen are fetched as the view scrolls
+        def recall():
+            key = ("silo", frame["project"], name, 0, model.PAGE_SIZE)
+            if self.recall(key) is not None:
+                return model.Lazy(
+                    lambda skip, limit: self.recall(
+                        ("silo", frame["project"], name, skip, limit)
+                    ) or [],
+                    transform
                 )
-            )
 
-            # Discard hidden items
-            if doc["data"].get("visible", True)
-        ])
+        # The first page is fetched in the background
+        self.load(lambda: model.Lazy(query, transform),
+                  self._model.replace,
+                  recall)
 
-        frame["environment"]["silo"] = name
+    def on_asset_changed(self, name, _id=None):
+        api.Session["AVALON_ASSET"] = name
+
+        frame = self.current_frame()
 
+        frame["asset"] = _id
+        frame["environment"]["asset"] = name
+
+        self._model.push([])
         self._frames.append(frame)
         self.pushed.emit(name)
 
-    def on_asset_changed(self, index):
-        name = model.data(index, "name")
-        api.Session["AVALON_ASSET"] = name
+        def on_asset(asset):
+            if asset is None:
+                raise Missing("No asset named %s" % name)
 
-        frame = self.current_frame()
+            frame["asset"] = asset["_id"]
 
-        frame["asset"] = model.data(index, "_id")
-        frame["environment"]["asset"] = name
+            # TODO(marcus): These are going to be accessible
+            # from database, not from the environment.
+            frame["environment"].update({
+                "asset_%s" % key: value
+                for key, value in asset["data"].items()
+            })
 
-        # TODO(marcus): These are going to be accessible
-        # from database, not from the environment.
-        asset = io.find_one({"_id": frame["asset"]})
-        frame["environment"].update({
-            "asset_%s" % key: value
-            for key, value in asset["data"].items()
-        })
-
-        # Get tasks from the project's configuration
-        project_tasks = [task for task in frame["config"].get("tasks", [])]
-
-        # Get the tasks assigned to the asset
-        asset_tasks = asset.get("data", {}).get("tasks", None)
-        if asset_tasks is not None:
-            # If the task is in the project configuration than get the settings
-            # from the project config to also support its icons, etc.
-            task_config = {task['name']: task for task in project_tasks}
-            tasks = [task_config.get(task_name, {"name": task_name})
-                     for task_name in asset_tasks]
-        else:
-            # if no `asset.data['tasks']` override then
-            # get the tasks from project configuration
-            tasks = project_tasks
+            # Get tasks from the project's configuration, the configuration
+            # is shared with the parent frames and mustn't be modified.
+            project_tasks = [
+                dict(task) for task in frame["config"].get("tasks", [])
+            ]
 
-        # If task has no icon use fallback icon
-        for task in tasks:
-            if "icon" not in task:
-                task['icon'] = DEFAULTS['icon']['task']
+            # Get the tasks assigned to the asset
+            asset_tasks = asset.get("data", {}).get("tasks", None)
+            if asset_tasks is not None:
+                # If the task is in the project configuration than get the
+                # settings from the project config to also support its
+                # icons, etc.
+                task_config = {task['name']: task for task in project_tasks}
+                tasks = [task_config.get(task_name, {"name": task_name})
+                         for task_name in asset_tasks]
+            else:
+                # if no `asset.data['tasks']` override then
+                # get the tasks from project configuration
+                tasks = project_tasks
+
+            # If task has no icon use fallback icon
+            for task in tasks:
+                if "icon" not in task:
+                    task['icon'] = DEFAULTS['icon']['task']
+
+            self._model.replace(sorted(tasks, key=lambda t: t["name"]))
+
+        def query():
+            if _id is None:
+                # Entered by name, such as through `open`
+                return self.query_asset_by_name(
+                    frame["project"], frame["environment"]["silo"], name
+                )
 
-        self._model.push(sorted(tasks, key=lambda t: t["name"]))
+            return self.query_asset(_id, frame["project"])
 
-        self._frames.append(frame)
-        self.pushed.emit(name)
+        self.load(query,
+                  on_asset,
+                  lambda: self.recall(("asset", frame["asset"])))
 
-    def on_task_changed(self, index):
-        name = model.data(index, "name")
+    def on_task_changed(self, name, _id=None):
         api.Session["AVALON_TASK"] = name
 
         frame = self.current_frame()
@@ -407,98 +1249,281 @@ class Controller(QtCore.QObject):
         self._frames.append(frame)
         self.pushed.emit(name)
 
+        self.resolve_environments(api.Session.copy())
+
+        # Nothing to load
+        self.loaded()
+
+    def resolve_environments(self, session):
+        """Resolve environments of applications ahead of their launch"""
+        try:
+            apps = self._frames[-1]["apps"]
+        except KeyError:
+            return
+
+        apps = [App for App in apps
+                if issubclass(App, environment.Application)]
+
+        def resolve():
+            for App in apps:
+                try:
+                    App().environ(session)
+                except Exception:
+                    # Reported once launched
+                    continue
+
+        self._worker.submit(resolve)
+
     @Slot(QtCore.QModelIndex)
     def trigger_action(self, index):
+        return self.trigger(model.data(index, "name"))
+
+    def trigger(self, name):
+        """Run action `name` within the current session
+
+        With rows selected, the action is run once per target instead,
+        see `targets`.
+
+        """
+
+        with tracing.span("trigger_action", action=name):
+
+            # Get the action
+            Action = self._action_index.get(name)
+            assert Action, "No action found"
+
+            with tracing.span("Session.copy"):
+                session = api.Session.copy()
+
+            targets = self.targets()
+            if targets:
+                return self.launch_batch(name, Action, session, targets)
+
+            return self.run(name, Action, session)
 
+    def run(self, name, Action, session, label=None):
+        """Run `Action` within `session`, in the background
+
+        The process launched by the action, if any, is followed once
+        the action is done, see `on_action_finished`.
+
+        Returns:
+            runner.Run: Of the action, or of the same action and session
+                triggered just now, such as on double-click
+
+        """
+
+        return self._runner.submit(name, Action, session, label)
+
+    def launch_batch(self, name, Action, session, targets):
+        """Run `Action` once per target, a few at a time
+
+        Arguments:
+            name (str): Name of action
+            Action (type): Action run
+            session (dict): Session of the current level, of which the
+                levels are replaced by those of each target
+            targets (list): Paths of targets, see `targets`
+
+        """
+
+        jobs = list()
+        for path in targets:
+            target = dict(session, **dict(zip(_SESSION_STEPS, path)))
+            label = "/".join(path)
+
+            jobs.append((label, functools.partial(
+                self.run, name, Action, target, "%s %s" % (name, label)
+            )))
+
+        self.log("Running action: %s, for %d targets" % (name, len(jobs)),
+                 level=INFO)
+
+        return self._scheduler.submit(name, jobs)
+
+    def on_job_exited(self, job):
+        """Report progress of a batch, and its outcome once finished"""
+        jobs = job.batch.jobs
+        done = job.batch.count(batch.DONE, batch.FAILED)
+        progress = "%s [%d/%d] %s" % (job.batch.name, done, len(jobs),
+                                      job.label)
+
+        if job.error is not None:
+            # The traceback is logged with the run of the action
+            terminal.log("%s failed: %s" % (
+                progress, job.error.rstrip().splitlines()[-1]),
+                terminal.ERROR)
+        elif job.status == batch.FAILED:
+            terminal.log("%s exited with code %d" % (progress, job.returncode),
+                         terminal.ERROR)
+        else:
+            terminal.log("%s done" % progress, terminal.INFO)
+
+        if not job.batch.finished:
+            return
+
+        failed = [other.label for other in jobs
+                  if other.status == batch.FAILED]
+        terminal.log(
+            "%s finished: %d of %d succeeded%s" % (
+                job.batch.name,
+                len(jobs) - len(failed),
+                len(jobs),
+                ", failed: " + ", ".join(failed) if failed else ""
+            ),
+            terminal.ERROR if failed else terminal.INFO
+        )
+
+    @Slot(QtCore.QModelIndex)
+    def cancel_action(self, index):
+        """Cancel every run of action at `index`, and those of its batches"""
         name = model.data(index, "name")
 
-        # Get the action
-        Action = next((a for a in self._registered_actions if a.name == name),
-                      None)
-        assert Action, "No action found"
-        action = Action()
+        self._scheduler.cancel(name)
+        self._runner.cancel(name)
+
+    def on_action_started(self, run):
+        self.log("Running action: %s" % run.label, level=INFO)
+        self.show_progress(run.name)
+
+    def on_action_progressed(self, run):
+        if run.message:
+            terminal.log("%s: %s" % (run.label, run.message), terminal.INFO)
+
+        self.show_progress(run.name)
+
+    def on_action_finished(self, run):
+        """Follow the process launched by `run`, or report its failure"""
+        if run.error is not None:
+            terminal.log("%s failed:\n%s" % (run.label, run.error.rstrip()),
+                         terminal.ERROR)
+
+        elif run.status == runner.CANCELLED:
+            terminal.log("%s cancelled" % run.label, terminal.INFO)
 
-        # Run the action within current session
-        self.log("Running action: %s" % name, level=INFO)
-        popen = action.process(api.Session.copy())
         # Action might return popen that pipes stdout
         # in which case we listen for it.
-        process = {}
-        if popen and hasattr(popen, "stdout") and popen.stdout is not None:
-
-            class Thread(QtCore.QThread):
-                messaged = Signal(str)
+        elif run.popen is not None:
+            self._processes.add(run.label, run.popen)
+            self._pipes.add(run.label, run.popen)
 
-                def run(self):
-                    for line in lib.stream(process["popen"].stdout):
-                        self.messaged.emit(line.rstrip())
-                    self.messaged.emit("%s killed." % process["name"])
+        self.show_progress(run.name)
 
-            thread = Thread()
-            thread.messaged.connect(
-                lambda line: terminal.log(line, terminal.INFO)
-            )
+    def progress(self, name):
+        """Return progress of runs of action `name`, or -1 if not running"""
+        values = [run.value or 0.0 for run in self._runner.runs()
+                  if run.name == name]
 
-            process.update({
-                "name": name,
-                "action": action,
-                "thread": thread,
-                "popen": popen
-            })
+        return sum(values) / len(values) if values else -1.0
 
-            self._processes.append(process)
+    def show_progress(self, name):
+        self._actions.update({name: {"progress": self.progress(name)}})
 
-            thread.start()
+    def on_process_output(self, lines):
+        for line in lines:
+            terminal.log(line, terminal.INFO)
 
-        return process
+    def on_process_exited(self, name, returncode):
+        terminal.log("%s exited with code %d." % (name, returncode),
+                     terminal.INFO)
 
     def log(self, message, level=DEBUG):
         print(message)
 
-    def collect_compatible_actions(self, actions):
-        """Collect all actions which are compatible with the environment
-
-        Each compatible action will be translated to a dictionary to ensure
-        the action can be visualized in the launcher.
+    def register_actions(self, actions):
+        """Replace the registered actions, and index their compatibility
 
         Args:
             actions (list): list of classes
 
+        """
+
+        self._registered_actions[:] = actions
+        self._action_index = compat.ActionIndex(actions)
+
+    def discover_actions(self):
+        """Return registered actions, discovered once until refreshed"""
+        if self._discovered is None:
+            self._discovered = api.discover(api.Action)
+
+        return list(self._discovered)
+
+    def refresh_actions(self):
+        """Discover registered actions, and show those compatible
+
+        Actions are registered in the background on startup, possibly
+        after the first level has loaded.
+
+        """
+
+        try:
+            apps = self._frames[-1]["apps"]
+        except (IndexError, KeyError):
+            apps = []
+
+        self._discovered = None
+        self.register_actions(self.discover_actions() + apps)
+
+        if self._frames:
+            self._actions.replace(self.collect_compatible_actions())
+
+    def current_session(self):
+        """Build a session from the current frame"""
+        try:
+            environment = self._frames[-1]["environment"]
+        except IndexError:
+            environment = {}
+
+        session = {"AVALON_{}".format(key.upper()): value for
+                   key, value in environment.items()}
+        session["AVALON_PROJECTS"] = api.registered_root()
+
+        return session
+
+    def collect_compatible_actions(self):
+        """Collect all actions which are compatible with the environment
+
+        Each compatible action will be translated to a dictionary to ensure
+        the action can be visualized in the launcher. With rows selected,
+        actions are those compatible with every target.
+
         Returns:
-            list: collection of dictionaries sorted on order int he
+            list: collection of dictionaries sorted on order and name
+
         """
 
-        compatible = []
-        for Action in actions:
-            frame = self.current_frame()
-
-            # Build a session from current frame
-            session = {"AVALON_{}".format(key.upper()): value for
-                       key, value in frame.get("environment", {}).items()}
-            session["AVALON_PROJECTS"] = api.registered_root()
-            if not Action().is_compatible(session):
-                continue
-
-            compatible.append({
-                "name": str(Action.name),
-                "icon": str(Action.icon or "cube"),
-                "label": str(Action.label or Action.name),
-                "color": getattr(Action, "color", None),
-                "order": Action.order
-            })
+        session = self.current_session()
+        targets = self.targets()
 
-        # Sort by order and name
-        compatible = sorted(compatible, key=lambda action: (action["order"],
-                                                            action["name"]))
+        if not targets:
+            compatible = self._action_index.collect(session)
+
+        else:
+            compatible = self._intersect(session, targets)
+
+        for action in compatible:
+            action["progress"] = self.progress(action["name"])
 
         return compatible
 
+    def _intersect(self, session, targets):
+        """Return actions compatible with every target, in order"""
+        compatible = None
+        for path in targets:
+            target = dict(session, **dict(zip(_SESSION_STEPS, path)))
+            found = self._action_index.collect(target)
 
-def dirs(root):
-    try:
-        base, dirs, files = next(os.walk(root))
-    except (IOError, StopIteration):
-        # Ignore non-existing dirs
-        return list()
+            if compatible is None:
+                compatible = found
+            else:
+                names = set(action["name"] for action in found)
+                compatible = [
+                    action for action in compatible
+                    if action["name"] in names
+                ]
+
+        return compatible
 
-    return dirs
+
+def dirs(root):
+    return probe.directories(root)
@@ -0,0 +1,194 @@
+"""Index of plug-ins defined by the modules of many directories
+
+Directories, such as those of AVALON_ACTIONS, are often network shares
+shared by a whole studio, where listing and reading each file takes
+its time. Directories are scanned at the same time, and a module is
+only loaded again once its file has changed.
+
+    index = Index(api.Action)
+    added, removed = index.update(["/server/actions", "/local/actions"])
+
+"""
+
+import os
+import sys
+import stat
+import types
+import inspect
+
+from multiprocessing.pool import ThreadPool
+
+
+class Entry(object):
+    """A module of the index, and the plug-ins it defines"""
+
+    def __init__(self, path, stamp, module, plugins):
+        self.path = path
+        self.stamp = stamp
+        self.module = module
+        self.plugins = plugins
+
+    @property
+    def name(self):
+        return self.module.__name__
+
+
+class Index(object):
+    """Plug-ins defined by modules of directories, by file
+
+    Modules are loaded like `avalon.lib.modules_from_path` loads them,
+    and their `register()` called, if any, once per change of their file.
+    Plug-ins are the subclasses of `superclass` found in a module, be it
+    defined by it or imported into it, like `avalon.api.discover` finds
+    them.
+
+    Arguments:
+        superclass (type): Base class of plug-ins, such as `api.Action`
+        threads (int, optional): Number of directories scanned at once
+
+    """
+
+    def __init__(self, superclass, threads=8):
+        self.superclass = superclass
+
+        # Modules loaded, by absolute path of their file
+        self.entries = dict()
+
+        # Paths of modules, in order of directories and then name
+        self._order = list()
+
+        self._threads = threads
+
+    def plugins(self):
+        """Return plug-ins of every module, in order of directories"""
+        return [
+            plugin
+            for path in self._order if path in self.entries
+            for plugin in self.entries[path].plugins
+        ]
+
+    def update(self, directories):
+        """Load modules of `directories` which changed since last time
+
+        Arguments:
+            directories (list): Directories of modules, in order
+
+        Returns:
+            tuple: Plug-ins added, and plug-ins of modules since
+                changed or removed
+
+        """
+
+        pool = ThreadPool(max(1, min(self._threads, len(directories))))
+
+        try:
+            files = [
+                item
+                for items in pool.map(_scan, directories)
+                for item in items
+            ]
+
+            changed = [
+                (path, stamp) for path, stamp in files
+                if path not in self.entries
+                or self.entries[path].stamp != stamp
+            ]
+
+            sources = pool.map(_read, [path for path, stamp in changed])
+
+        finally:
+            pool.close()
+
+        added, removed = list(), list()
+        present = set(path for path, stamp in files)
+        self._order[:] = [path for path, stamp in files]
+
+        for path in list(self.entries):
+            if path not in present:
+                removed.extend(self.entries.pop(path).plugins)
+
+        # Loaded in order, as modules may depend on each other
+        for (path, stamp), source in zip(changed, sources):
+            if path in self.entries:
+                removed.extend(self.entries.pop(path).plugins)
+
+            entry = self._load(path, stamp, source)
+
+            if entry is not None:
+                self.entries[path] = entry
+                added.extend(entry.plugins)
+
+        return added, removed
+
+    def _load(self, path, stamp, source):
+        name = os.path.splitext(os.path.basename(path))[0]
+
+        if source is None:
+            return None
+
+        module = types.ModuleType(name)
+        module.__file__ = path
+
+        try:
+            exec(compile(source, path, "exec"), module.__dict__)
+        except Exception as e:
+            print("Skipped: \"{0}\" ({1})".format(name, e))
+            return None
+
+        sys.modules[path] = module
+
+        # Run "register" if found
+        if "register" in dir(module):
+            try:
+                module.register()
+            except Exception as e:
+                print("Register method in {0} failed: {1}".format(
+                    module, str(e)))
+
+        plugins = list()
+
+        for name in dir(module):
+            obj = getattr(module, name)
+
+            if inspect.isclass(obj) \
+                    and issubclass(obj, self.superclass) \
+                    and obj is not self.superclass:
+                plugins.append(obj)
+
+        return Entry(path, stamp, module, plugins)
+
+
+def _scan(directory):
+    """Return Python files of `directory`, along with their stamp"""
+    directory = os.path.normpath(directory)
+
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+
+    files = list()
+
+    for name in sorted(names):
+        if name.startswith("_") or not name.endswith(".py"):
+            continue
+
+        path = os.path.join(directory, name)
+
+        try:
+            info = os.stat(path)
+        except OSError:
+            continue
+
+        if stat.S_ISREG(info.st_mode):
+            files.append((path, (info.st_mtime, info.st_size)))
+
+    return files
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except (IOError, OSError):
+        return None
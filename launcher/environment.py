@@ -0,0 +1,241 @@
+"""Environments of applications, resolved once per change to what they use
+
+The environment of an application, as defined by its `.toml` file,
+references keys of the session and of the environment it is launched
+from, such as `{AVALON_WORKDIR}` and `{PYTHONPATH}`. The keys referenced
+by each definition are found once, and its environment resolved again
+only once the value of one of them changes. Applications referencing
+`{AVALON_WORKDIR}` depend on the task, those referencing `{PYTHONPATH}`
+alone do not.
+
+Example:
+    >>> resolver = Resolver()
+    >>> definition = {"MAYA_PROJECT": "{AVALON_WORKDIR}/maya"}
+    >>> resolver.resolve("maya", definition, {"AVALON_WORKDIR": "/work"})
+    {'MAYA_PROJECT': '/work/maya'}
+    >>> sorted(resolver.dependencies("maya", definition))
+    ['AVALON_WORKDIR']
+    >>> _ = resolver.resolve("maya", definition, {"AVALON_WORKDIR": "/work",
+    ...                                           "AVALON_ASSET": "bruce"})
+    >>> resolver.stats()["hits"], resolver.stats()["misses"]
+    (1, 1)
+
+"""
+
+import os
+import re
+import sys
+import string
+import getpass
+
+from avalon import api
+from avalon.vendor import six
+
+from . import cache, lib
+
+self = sys.modules[__name__]
+
+PY2 = sys.version_info[0] == 2
+
+# Resolved environments kept, by application and the values they use
+SIZE = 256
+
+
+def references(value):
+    """Return names of keys referenced by templates of `value`
+
+    Keys are referenced from strings, keys of dictionaries and items
+    of lists, at any depth, like `avalon.lib.dict_format` formats them.
+
+    Example:
+        >>> sorted(references({"PATH": ["{root}/bin", "{PATH}"],
+        ...                    "{app}_VERSION": "{version.major}"}))
+        ['PATH', 'app', 'root', 'version']
+
+    """
+
+    names = set()
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            names.update(references(key))
+            names.update(references(item))
+
+    elif isinstance(value, list):
+        for item in value:
+            names.update(references(item))
+
+    elif isinstance(value, six.string_types):
+        for literal, field, spec, conversion in \
+                string.Formatter().parse(value):
+            if field:
+                # Attributes and indices are of the key before them
+                names.add(re.split(r"[.\[]", field, 1)[0])
+
+            if spec:
+                names.update(references(spec))
+
+    return names
+
+
+def normalize(environment):
+    """Return `environment` of a definition, with lists joined as paths
+
+    Values of any other kind are left out, as they cannot be passed
+    on to a process.
+
+    """
+
+    normalized = dict()
+
+    for key, value in environment.items():
+        if isinstance(value, list):
+            # Treat list values as paths, e.g. PYTHONPATH=[]
+            value = os.pathsep.join(value)
+
+        elif not isinstance(value, six.string_types):
+            print("%s: Unsupported environment reference for %s"
+                  % (value, key))
+            continue
+
+        if PY2 and isinstance(value, unicode):  # noqa
+            # Protect against unicode in the environment
+            value = value.encode(sys.getfilesystemencoding())
+
+        normalized[key] = value
+
+    return normalized
+
+
+class Resolver(object):
+    """Environments of definitions, by the values of keys they reference
+
+    Safe to use from multiple threads, as actions are processed in
+    threads of their own. Results are shared between callers, and
+    must be treated as read-only.
+
+    Arguments:
+        size (int, optional): Maximum number of environments kept,
+            beyond which the least recently used is discarded
+
+    """
+
+    def __init__(self, size=SIZE):
+        self._resolved = cache.Cache(ttl=float("inf"), size=size)
+
+        # Normalized environment and keys referenced, by fingerprint
+        self._definitions = dict()
+
+    def dependencies(self, fingerprint, environment):
+        """Return keys referenced by `environment`, found once"""
+        return self._definition(fingerprint, environment)[1]
+
+    def resolve(self, fingerprint, environment, mapping, format=None):
+        """Return `environment` formatted with `mapping`, once per change
+
+        Arguments:
+            fingerprint (hashable): Identity of the definition of
+                `environment`, which changes along with it
+            environment (dict): Environment of the definition
+            mapping (dict): Values of keys referenced by `environment`,
+                along with any others, such as the session
+            format (callable, optional): Return normalized `environment`
+                formatted with `mapping`, defaults to `str.format`
+
+        """
+
+        normalized, keys = self._definition(fingerprint, environment)
+        key = (fingerprint, tuple(mapping.get(name) for name in keys))
+
+        def resolve():
+            if format is not None:
+                return format(normalized)
+
+            return {
+                name.format(**mapping): value.format(**mapping)
+                for name, value in normalized.items()
+            }
+
+        return self._resolved.fetch(key, resolve)
+
+    def invalidate(self):
+        """Discard every environment resolved, and keys referenced"""
+        self._resolved.invalidate()
+        self._definitions.clear()
+
+    def stats(self):
+        return self._resolved.stats()
+
+    def _definition(self, fingerprint, environment):
+        try:
+            return self._definitions[fingerprint]
+        except KeyError:
+            normalized = normalize(environment)
+            keys = tuple(sorted(references(normalized)))
+            definition = self._definitions[fingerprint] = (normalized, keys)
+            return definition
+
+
+self._resolver = Resolver()
+
+
+def resolve(fingerprint, environment, mapping, format=None):
+    """Resolve `environment` once per change, see `Resolver.resolve`"""
+    return self._resolver.resolve(fingerprint, environment, mapping, format)
+
+
+def workdir(template, session):
+    """Return work directory of `session`, like `avalon.api` computes it"""
+    return os.path.normpath(lib.compile_template(template).format({
+        "root": api.registered_root(),
+        "project": session["AVALON_PROJECT"],
+        "silo": session["AVALON_SILO"],
+        "asset": session["AVALON_ASSET"],
+        "task": session["AVALON_TASK"],
+        "app": session["AVALON_APP"],
+
+        # Optional
+        "user": session.get("AVALON_USER", getpass.getuser()),
+        "hierarchy": session.get("AVALON_HIERARCHY"),
+    }))
+
+
+class Application(api.Application):
+    """Application of which the environment is resolved once per change
+
+    Defined per project and `.toml` file by `lib.get_apps`, which
+    provides the fingerprint of its definition and the work template
+    of its project.
+
+    """
+
+    # Identity of the `.toml` file defining this application
+    fingerprint = None
+
+    # Template of work directories of the project
+    template = None
+
+    # Copies files and launches a process, shows no window
+    threaded = True
+
+    def environ(self, session):
+        """Build application environment"""
+        if self.fingerprint is None or self.template is None:
+            return super(Application, self).environ(session)
+
+        session = dict(session)
+        session["AVALON_APP"] = self.config["application_dir"]
+        session["AVALON_APP_NAME"] = self.name
+        session["AVALON_WORKDIR"] = workdir(self.template, session)
+
+        # Build environment
+        env = os.environ.copy()
+        env.update(session)
+        env.update(resolve(
+            self.fingerprint,
+            self.config.get("environment", {}),
+            env,
+            lambda environment: self._format(environment, **env)
+        ))
+
+        return env
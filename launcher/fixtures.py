@@ -0,0 +1,279 @@
+"""Synthetic projects, queried in place of the database
+
+Projects of any number of silos, assets and tasks, held in memory and
+queried like the launcher queries `avalon.io`, for benchmarks and
+tests to navigate without a database.
+
+    database = Database(projects=2, silos=3, assets=1000, tasks=4)
+    controller = control.Controller(root, database=database)
+
+Like `avalon.io`, queries other than `projects` are answered from the
+active project of the session only.
+
+"""
+
+import collections
+
+
+class Cursor(list):
+    """Documents found, skipped and limited like a cursor of pymongo"""
+
+    def skip(self, count):
+        return Cursor(self[count:])
+
+    def limit(self, count):
+        return Cursor(self[:count]) if count else self
+
+
+class Database(object):
+    """Projects of `silos` x `assets` x `tasks`, generated on creation
+
+    Assets are named "asset00000" onwards per silo, and grouped into
+    groups of 100, and every other asset is given a label.
+
+    Arguments:
+        projects (int, optional): Number of projects
+        silos (int, optional): Number of silos per project
+        assets (int, optional): Number of assets per silo
+        tasks (int, optional): Number of tasks per project, assigned to
+            every asset
+        apps (list, optional): Names of applications per project,
+            which are expected to be defined on disk
+        session (dict, optional): Session of the active project,
+            defaults to `avalon.api.Session`
+
+    """
+
+    def __init__(self,
+                 projects=1,
+                 silos=2,
+                 assets=100,
+                 tasks=4,
+                 apps=None,
+                 session=None):
+
+        if session is None:
+            from avalon import api
+            session = api.Session
+
+        self.session = session
+
+        # Number of queries answered, by method
+        self.queries = collections.Counter()
+
+        self._projects = list()
+        self._documents = dict()
+        self._by_id = dict()
+        self._by_silo = dict()
+        self._by_name = dict()
+
+        for p in range(projects):
+            name = "project%d" % p
+            project = {
+                "_id": name,
+                "type": "project",
+                "name": name,
+                "data": {"fps": 25, "resolution_width": 1920},
+                "config": {
+                    "apps": [{"name": app} for app in apps or []],
+                    "tasks": [{"name": "task%d" % t} for t in range(tasks)],
+                    "template": {
+                        "work": "{root}/{project}/{silo}/{asset}/work/{task}"
+                    },
+                },
+            }
+
+            documents = [project]
+
+            for s in range(silos):
+                silo = "silo%d" % s
+                children = self._by_silo[(name, silo)] = list()
+
+                for a in range(assets):
+                    asset = {
+                        "_id": "%s/%s/asset%05d" % (name, silo, a),
+                        "type": "asset",
+                        "name": "asset%05d" % a,
+                        "parent": name,
+                        "silo": silo,
+                        "data": {
+                            "group": "group%d" % (a // 100),
+                            "label": "Asset %d" % a if a % 2 else None,
+                            "frameStart": 1001,
+                            "frameEnd": 1100,
+                        },
+                    }
+
+                    children.append(asset)
+                    self._by_name[(name, silo, asset["name"])] = asset
+                    documents.append(asset)
+
+            self._projects.append(project)
+            self._documents[name] = documents
+
+            for document in documents:
+                self._by_id[document["_id"]] = (name, document)
+
+    def install(self):
+        pass
+
+    def uninstall(self):
+        pass
+
+    def projects(self):
+        """Return every project"""
+        self.queries["projects"] += 1
+        return iter(self._projects)
+
+    def find(self, filter, projection=None, sort=None):
+        """Return documents of the active project matching `filter`
+
+        Arguments:
+            filter (dict): Values by field, "data.label" for nested
+                fields, each either equal, or {"$in": values},
+                {"$nin": values}, {"$ne": value} or {"$exists": bool},
+                along with "$or" of a list of filters
+            projection (dict, optional): Fields returned, by name
+            sort (list, optional): Pairs of field and 1 or -1
+
+        """
+
+        self.queries["find"] += 1
+
+        documents = [
+            document for document in self._candidates(filter)
+            if _matches(document, filter)
+        ]
+
+        # Sorted by the last field first, such that ties keep the
+        # order of the fields before it, and None first, like MongoDB.
+        for field, direction in reversed(sort or []):
+            documents.sort(key=lambda document: _sortable(document, field),
+                           reverse=direction < 0)
+
+        if projection:
+            documents = [_project(document, projection)
+                         for document in documents]
+
+        return Cursor(documents)
+
+    def find_one(self, filter, projection=None):
+        self.queries["find_one"] += 1
+
+        for document in self._candidates(filter):
+            if _matches(document, filter):
+                return _project(document, projection) if projection \
+                    else document
+
+    def distinct(self, key):
+        """Return values of `key` amongst documents of the active project"""
+        self.queries["distinct"] += 1
+
+        values = list()
+        for document in self._active():
+            value = _get(document, key)
+
+            if value is not None and value not in values:
+                values.append(value)
+
+        return values
+
+    def _active(self):
+        return self._documents.get(self.session.get("AVALON_PROJECT"), [])
+
+    def _candidates(self, filter):
+        """Return documents possibly matching `filter`, from an index"""
+        _id = filter.get("_id")
+        project = self.session.get("AVALON_PROJECT")
+
+        if isinstance(_id, dict) and "$in" in _id:
+            ids = _id["$in"]
+        elif _id is not None:
+            ids = [_id]
+        else:
+            ids = None
+
+        if ids is not None:
+            found = (self._by_id.get(_id, (None, None)) for _id in ids)
+
+            # Scoped to the active project, like the database is
+            return [document for name, document in found if name == project]
+
+        if "silo" in filter and "name" in filter:
+            asset = self._by_name.get((project, filter["silo"],
+                                       filter["name"]))
+            return [asset] if asset is not None else []
+
+        if "silo" in filter:
+            return self._by_silo.get((project, filter["silo"]), [])
+
+        return self._active()
+
+
+# Value of fields not in a document, unlike those equal to None
+_missing = object()
+
+
+def _get(document, field, default=None):
+    for key in field.split("."):
+        if not isinstance(document, dict) or key not in document:
+            return default
+        document = document[key]
+
+    return document
+
+
+def _matches(document, filter):
+    for field, expected in filter.items():
+        if field == "$or":
+            if not any(_matches(document, other) for other in expected):
+                return False
+            continue
+
+        value = _get(document, field, _missing)
+        exists = value is not _missing
+
+        if not exists:
+            value = None
+
+        if isinstance(expected, dict):
+            if "$exists" in expected and exists != expected["$exists"]:
+                return False
+            if "$in" in expected and value not in expected["$in"]:
+                return False
+            if "$nin" in expected and value in expected["$nin"]:
+                return False
+            if "$ne" in expected and value == expected["$ne"]:
+                return False
+
+        elif value != expected:
+            return False
+
+    return True
+
+
+def _sortable(document, field):
+    value = _get(document, field)
+    return (value is not None, value if value is not None else "")
+
+
+def _project(document, projection):
+    """Return fields of `document` in `projection`, along with its _id"""
+    result = {"_id": document["_id"]}
+
+    for field, included in projection.items():
+        if not included:
+            continue
+
+        value = _get(document, field)
+        if value is None:
+            continue
+
+        keys = field.split(".")
+        target = result
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+
+        target[keys[-1]] = value
+
+    return result
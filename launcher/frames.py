@@ -0,0 +1,176 @@
+"""Structurally shared frames of the asset hierarchy
+
+A frame holds the environment at a given level of the hierarchy.
+Rather than copying the full frame of the parent level on every
+navigation, each level only stores the keys it adds, and falls
+back to its parent for everything else.
+
+"""
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    # Python 2
+    from collections import MutableMapping
+
+_DELETED = object()
+
+
+class Layer(MutableMapping):
+    """Mapping layered on top of a parent mapping
+
+    Writes only ever touch this layer, reads fall through to the
+    parent. The parent is never modified, which means it may be
+    shared by any number of children.
+
+    Reads of every key, such as `items`, are answered from a flattened
+    view of the chain, kept until this layer or a parent is written to.
+
+    Example:
+        >>> parent = Layer({"a": 1})
+        >>> child = Layer({"b": 2}, parent=parent)
+        >>> child["a"] = 3
+        >>> sorted(child.items())
+        [('a', 3), ('b', 2)]
+        >>> sorted(parent.items())
+        [('a', 1)]
+
+    """
+
+    __slots__ = ("_data", "_parent", "_flat")
+
+    def __init__(self, data=None, parent=None):
+        self._data = dict(data or {})
+        self._parent = parent
+
+        # Flattened view, along with the view of the parent it was
+        # made from, see `_flattened`
+        self._flat = None
+
+    @property
+    def parent(self):
+        return self._parent
+
+    def __getitem__(self, key):
+        try:
+            value = self._data[key]
+        except KeyError:
+            if self._parent is None:
+                raise
+            return self._parent[key]
+
+        if value is _DELETED:
+            raise KeyError(key)
+
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._flat = None
+
+    def __delitem__(self, key):
+        # Ensure it exists
+        self[key]
+
+        if self._parent is not None and key in self._parent:
+            # Mask, rather than modify, the shared key
+            self._data[key] = _DELETED
+        else:
+            del self._data[key]
+
+        self._flat = None
+
+    def __iter__(self):
+        return iter(self._flattened())
+
+    def __len__(self):
+        return len(self._flattened())
+
+    def items(self):
+        return self._flattened().items()
+
+    def flatten(self):
+        """Return a plain dictionary of every key visible in this layer"""
+        return dict(self._flattened())
+
+    def _flattened(self):
+        """Return the view of every key visible in this layer
+
+        The view is shared by every read until this layer or a parent is
+        written to, which replaces rather than modifies it, and must be
+        treated as read-only.
+
+        """
+
+        parent = self._parent._flattened() if self._parent is not None \
+            else None
+
+        if self._flat is not None and self._flat[0] is parent:
+            return self._flat[1]
+
+        if not self._data:
+            # Nothing of its own, such as a child not yet written to
+            data = parent if parent is not None else {}
+            self._flat = (parent, data)
+            return data
+
+        data = dict(parent) if parent is not None else {}
+        data.update(self._data)
+
+        if _DELETED in data.values():
+            data = {
+                key: value
+                for key, value in data.items()
+                if value is not _DELETED
+            }
+
+        self._flat = (parent, data)
+
+        return data
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, dict(self.items()))
+
+
+class Frame(Layer):
+    """Level in the asset hierarchy
+
+    The "environment" of a frame is itself layered on top of the
+    environment of its parent frame, such that pushing a level only
+    allocates the keys introduced by that level.
+
+    Values other than "environment", such as the project "config",
+    are shared with the parent frame and must be treated as read-only.
+
+    Example:
+        >>> root = Frame()
+        >>> root["environment"]["project"] = "hulk"
+        >>> frame = root.child()
+        >>> frame["environment"]["silo"] = "assets"
+        >>> sorted(frame["environment"].items())
+        [('project', 'hulk'), ('silo', 'assets')]
+        >>> sorted(root["environment"].items())
+        [('project', 'hulk')]
+
+    """
+
+    __slots__ = ()
+
+    def __init__(self, data=None, parent=None):
+        super(Frame, self).__init__(data, parent)
+
+        if "environment" not in self._data:
+            self._data["environment"] = Layer(
+                parent=parent["environment"] if parent is not None else None
+            )
+
+    def child(self):
+        """Return a new frame sharing all of the keys of this frame"""
+        return Frame(parent=self)
@@ -0,0 +1,122 @@
+"""Navigate the launcher by name, without a window
+
+The controller loads each level in the background, through the event
+loop of Qt, as the window clicks its way through the hierarchy. These
+navigate it by name instead, returning once each level has loaded,
+for scripts, tests and benchmarks.
+
+    database = fixtures.Database(assets=1000)
+    controller = headless.create(database=database)
+    headless.open(controller, ["project0", "silo0", "asset00010"])
+    headless.pop(controller)
+
+"""
+
+import os
+import sys
+
+from PyQt5 import QtCore
+
+from . import control, model, terminal
+
+self = sys.modules[__name__]
+self._app = None
+
+# Seconds to wait for a level to load
+TIMEOUT = 10.0
+
+
+def create(root=None, database=None):
+    """Return a controller listing projects, once listed
+
+    Arguments:
+        root (str, optional): Root of projects, defaults to
+            AVALON_PROJECTS
+        database (optional): Queried in place of `avalon.io`,
+            such as `fixtures.Database`
+
+    """
+
+    if QtCore.QCoreApplication.instance() is None:
+        self._app = QtCore.QCoreApplication(sys.argv[:1])
+
+    terminal.init()
+
+    if root is None:
+        root = os.getenv("AVALON_PROJECTS", "")
+
+    controller = control.Controller(root, database=database)
+    controller.init()
+    wait(controller)
+
+    return controller
+
+
+def wait(controller, timeout=TIMEOUT):
+    """Process events until the current level of `controller` has loaded
+
+    Raises:
+        RuntimeError: When the level failed to load, or took longer
+            than `timeout` seconds
+
+    """
+
+    results = list()
+    loop = QtCore.QEventLoop()
+
+    def on_finished(ok):
+        results.append(ok)
+        loop.quit()
+
+    timer = QtCore.QTimer()
+    timer.setSingleShot(True)
+    timer.timeout.connect(loop.quit)
+    timer.start(int(timeout * 1000))
+
+    controller.loadFinished.connect(on_finished)
+
+    try:
+        while controller.loading or controller.opening():
+            if not timer.isActive():
+                raise RuntimeError("Timed out loading %s"
+                                   % "/".join(controller.breadcrumbs))
+
+            loop.exec_()
+
+    finally:
+        controller.loadFinished.disconnect(on_finished)
+        timer.stop()
+
+    if False in results:
+        raise RuntimeError("Failed loading %s"
+                           % "/".join(controller.breadcrumbs))
+
+
+def push(controller, name):
+    """Enter item `name` of the current level, and wait for it to load"""
+    open(controller, list(controller.breadcrumbs) + [name])
+
+
+def pop(controller):
+    """Leave the current level, back to the one above"""
+    controller.pop()
+    wait(controller)
+
+
+def open(controller, path):
+    """Enter each level of `path`, by name, and wait for the last to load
+
+    Arguments:
+        path (list): Names of project, silo, asset and task
+
+    """
+
+    controller.open(path)
+    wait(controller)
+
+
+def actions(controller):
+    """Return names of actions compatible with the current level"""
+    actions = controller.actions
+    return [model.data(actions.index(row), "name")
+            for row in range(actions.rowCount())]
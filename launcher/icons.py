@@ -0,0 +1,160 @@
+"""Icons of Font Awesome, rasterised once and shared by every view
+
+Listings show an icon per row, and rows are created anew on every
+navigation. Rather than each looking up its glyph by name and laying
+out text, icons are drawn once per name, color and size into images
+shared by every row, through an image provider.
+
+    Image {
+        source: "image://icons/map/%23eeeeee/16"
+    }
+
+Images this small are packed into a shared texture atlas by Qt Quick.
+
+"""
+
+import io
+import re
+import sys
+import threading
+
+from PyQt5 import QtCore, QtGui, QtQuick
+
+from . import lib
+
+self = sys.modules[__name__]
+self._codepoints = None
+
+PY2 = sys.version_info[0] == 2
+
+# Glyphs by name, as used by QML before, see `codepoints`
+GLYPHS = lib.resource("qml", "awesome.js")
+FONT = lib.resource("font", "fontawesome", "FontAwesome.otf")
+
+# Icons spun by views, rather than glyphs of their own
+ROTATE = "-rotate"
+
+
+def codepoints():
+    """Return codepoint of each icon, by name, parsed once
+
+    Example:
+        >>> hex(codepoints()["map"])
+        '0xf279'
+
+    """
+
+    if self._codepoints is None:
+        pattern = re.compile(r'^\s*"([^"]+)":\s*"(.)",?\s*$')
+        table = dict()
+
+        with io.open(GLYPHS, encoding="utf-8") as f:
+            for line in f:
+                match = pattern.match(line)
+
+                if match is not None:
+                    name, glyph = match.groups()
+                    table[name] = ord(glyph)
+
+        self._codepoints = table
+
+    return self._codepoints
+
+
+def glyph(name):
+    """Return character of icon `name`, or an empty string if unknown
+
+    Example:
+        >>> glyph("spinner-rotate") == glyph("spinner")
+        True
+        >>> glyph("missing")
+        ''
+
+    """
+
+    if name.endswith(ROTATE):
+        name = name[:-len(ROTATE)]
+
+    try:
+        codepoint = codepoints()[name]
+    except KeyError:
+        return ""
+
+    return (unichr if PY2 else chr)(codepoint)  # noqa
+
+
+class Atlas(QtQuick.QQuickImageProvider):
+    """Images of icons, by name, color and size, drawn once each
+
+    Requested as "image://icons/<name>/<color>/<size>", with the color
+    percent-encoded. Requires a QGuiApplication, for fonts.
+
+    Arguments:
+        font (str, optional): Path to Font Awesome
+
+    """
+
+    def __init__(self, font=FONT):
+        super(Atlas, self).__init__(QtQuick.QQuickImageProvider.Image)
+
+        index = QtGui.QFontDatabase.addApplicationFont(font)
+        families = QtGui.QFontDatabase.applicationFontFamilies(index)
+
+        self._family = families[0] if families else "FontAwesome"
+        self._images = dict()
+
+        # Images are requested from the threads of asynchronous images
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._images)
+
+    def requestImage(self, id, requestedSize):
+        name, color, size = self.parse(id)
+
+        if requestedSize.isValid():
+            size = max(requestedSize.width(), requestedSize.height(), 1)
+
+        key = (name, color, size)
+
+        with self._lock:
+            try:
+                image = self._images[key]
+            except KeyError:
+                image = self._images[key] = self.draw(name, color, size)
+
+        return image, image.size()
+
+    def parse(self, id):
+        """Return name, color and size of image `id`"""
+        parts = QtCore.QUrl.fromPercentEncoding(
+            id.encode("utf-8")).split("/")
+
+        name = parts[0]
+        color = parts[1] if len(parts) > 1 and parts[1] else "#eeeeee"
+
+        try:
+            size = int(parts[2])
+        except (IndexError, ValueError):
+            size = 16
+
+        return name, color, size
+
+    def draw(self, name, color, size):
+        """Return icon `name` drawn in `color`, `size` pixels square"""
+        image = QtGui.QImage(size, size,
+                             QtGui.QImage.Format_ARGB32_Premultiplied)
+        image.fill(QtCore.Qt.transparent)
+
+        font = QtGui.QFont(self._family)
+        font.setPixelSize(size)
+        font.setWeight(QtGui.QFont.Light)
+
+        painter = QtGui.QPainter(image)
+        painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor(color))
+        painter.drawText(image.rect(), QtCore.Qt.AlignCenter, glyph(name))
+        painter.end()
+
+        return image
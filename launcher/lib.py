@@ -4,10 +4,26 @@ import string
 
 from PyQt5 import QtCore
 
+from . import cache, tracing
+
 self = sys.modules[__name__]
 self._path = os.path.dirname(__file__)
 self._current_task = None
 
+# Maximum number of application definitions and classes kept, beyond
+# which the least recently used are discarded
+APPS = 256
+
+# Application definitions by fingerprint, being the path and the
+# (mtime, size) of the file they were parsed from.
+self._app_definitions = cache.Cache(ttl=float("inf"), size=APPS)
+
+# Application classes by fingerprint of their definition, and project
+self._app_classes = cache.Cache(ttl=float("inf"), size=APPS)
+
+# Templates by the string they were compiled from
+self._templates = dict()
+
 
 class FormatDict(dict):
     def __missing__(self, key):
@@ -53,9 +69,49 @@ def stream(stream):
         yield line
 
 
+def load_definition(name):
+    """Return the definition of application `name`, parsed once per change
+
+    Definitions are parsed again only once the size or modification
+    time of their `.toml` file changes.
+
+    Arguments:
+        name (str): Name of application, e.g. "maya2018"
+
+    Returns:
+        tuple: Path and (mtime, size) of the `.toml` file, and the
+            parsed definition, unlike `avalon.lib.get_application`
+            which returns the definition alone.
+
+    """
+
+    import avalon.lib
+
+    path = avalon.lib.which_app(name)
+
+    if path is None:
+        raise ValueError(
+            "No application definition could be found for '%s'" % name
+        )
+
+    stat = os.stat(path)
+    stamp = (stat.st_mtime, stat.st_size)
+
+    definition = self._app_definitions.fetch(
+        (path, stamp), lambda: avalon.lib.get_application(name)
+    )
+
+    return path, stamp, definition
+
+
 def get_apps(project):
     """Define dynamic Application classes for project using `.toml` files
 
+    Classes are reused for as long as neither the project's entry of an
+    application nor its `.toml` file changes, such that switching back
+    and forth between projects does not define them again. Their
+    environment is resolved once per change, see `launcher.environment`.
+
     Args:
         project (dict): project document from the database
 
@@ -63,35 +119,50 @@ def get_apps(project):
         list: list of dictionaries
     """
 
-    import avalon.lib
-    import avalon.api as api
+    from . import environment
+
+    template = project["config"].get("template", {}).get("work")
 
     apps = []
     for app in project["config"]["apps"]:
+        start = tracing.clock()
+
         try:
-            app_definition = avalon.lib.get_application(app['name'])
+            path, stamp, app_definition = load_definition(app['name'])
         except Exception as exc:
             print("Unable to load application: %s - %s" % (app['name'], exc))
             continue
 
-        # Get from app definition, if not there from app in project
-        icon = app_definition.get("icon", app.get("icon", "folder-o"))
-        color = app_definition.get("color", app.get("color", None))
-        order = app_definition.get("order", app.get("order", 0))
-        label = app.get("label", app_definition.get("label", app["name"]))
-
-        action = type(
-            "app_%s" % app["name"],
-            (api.Application,),
-            {
-                "name": app['name'],
-                "label": label,
-                "icon": icon,
-                "color": color,
-                "order": order,
-                "config": app_definition.copy()
-            }
-        )
+        key = ((path, stamp), project["name"], repr(sorted(app.items())),
+               template)
+
+        action = self._app_classes.get(key)
+
+        if action is None:
+            # Get from app definition, if not there from app in project
+            icon = app_definition.get("icon", app.get("icon", "folder-o"))
+            color = app_definition.get("color", app.get("color", None))
+            order = app_definition.get("order", app.get("order", 0))
+            label = app.get("label", app_definition.get("label", app["name"]))
+
+            action = type(
+                "app_%s" % app["name"],
+                (environment.Application,),
+                {
+                    "name": app['name'],
+                    "label": label,
+                    "icon": icon,
+                    "color": color,
+                    "order": order,
+                    "config": app_definition.copy(),
+                    "fingerprint": (path, stamp),
+                    "template": template,
+                }
+            )
+
+            self._app_classes.put(key, action)
+
+        tracing.complete("get_app", start, app=app["name"])
 
         apps.append(action)
 
@@ -99,8 +170,113 @@ def get_apps(project):
 
 
 def partial_format(s, mapping):
+    return compile_template(s).format(mapping)
+
+
+def compile_template(template):
+    """Return `template` compiled, compiling it on first use
+
+    Example:
+        >>> compile_template("{root}/{project}") is \\
+        ...     compile_template("{root}/{project}")
+        True
+
+    """
+
+    try:
+        return self._templates[template]
+    except KeyError:
+        compiled = self._templates[template] = Template(template)
+        return compiled
+
+
+class Template(object):
+    """Template parsed once into literals and fields, for many mappings
+
+    Formatting is partial, keys missing from a mapping being left
+    as they are, like `partial_format`.
+
+    Example:
+        >>> template = Template("{root}/{project}/work/{task}")
+        >>> template.format({"root": "/projects", "project": "hulk"})
+        '/projects/hulk/work/{task}'
+        >>> template.resolve({"root": "/projects", "project": "hulk"})
+        '/projects/hulk/work/'
+
+    Arguments:
+        template (str): Template, such as config['template']['work']
+
+    """
+
+    def __init__(self, template):
+        self.template = template
+
+        # Pairs of literal text and the field following it, if any
+        self._segments = list()
+        self._formatter = string.Formatter()
+
+        for literal, field, spec, conversion in \
+                self._formatter.parse(template):
+
+            if field is not None and (
+                    not _is_name(field) or "{" in (spec or "")):
+
+                # Attributes, indices and nested fields are formatted
+                # as a whole, as rarely as they occur in paths.
+                self._segments = None
+                break
+
+            self._segments.append((literal, field, spec, conversion))
+
+    def format(self, mapping):
+        """Return template formatted with `mapping`"""
+        return self._format(mapping, True)
+
+    def resolve(self, mapping):
+        """Return template formatted until the first key missing"""
+        return self._format(mapping, False)
+
+    def format_many(self, mappings):
+        """Return template formatted with each of `mappings`"""
+        return [self._format(mapping, True) for mapping in mappings]
+
+    def resolve_many(self, mappings):
+        """Return template formatted with each of `mappings`, until
+        the first key missing from each"""
+        return [self._format(mapping, False) for mapping in mappings]
+
+    def _format(self, mapping, partial):
+        if self._segments is None:
+            result = self._formatter.vformat(
+                self.template, (), FormatDict(**mapping))
+
+            return result if partial else result.split("{", 1)[0]
+
+        parts = list()
+        convert = self._formatter.convert_field
+
+        for literal, field, spec, conversion in self._segments:
+            parts.append(literal)
+
+            if field is None:
+                continue
+
+            try:
+                value = mapping[field]
+            except KeyError:
+                if not partial:
+                    break
+
+                value = "{" + field + "}"
+
+            if conversion:
+                value = convert(value, conversion)
+
+            parts.append(format(value, spec))
+
+        return "".join(parts)
 
-    formatter = string.Formatter()
-    mapping = FormatDict(**mapping)
 
-    return formatter.vformat(s, (), mapping)
+def _is_name(field):
+    """Return whether `field` is a plain key, rather than an expression"""
+    return field.replace("_", "a").isalnum() and not field[0].isdigit()
@@ -1,10 +1,50 @@
+import bisect
+
 from PyQt5 import QtCore
 
+from . import worker
+
+Signal = QtCore.pyqtSignal
+
+# Beyond this many moved rows, a reset is cheaper than moving each row
+MAX_MOVES = 128
+
+# Number of items fetched at a time by lazy lists
+PAGE_SIZE = 200
+
 
 class Model(QtCore.QAbstractListModel):
-    def __init__(self, items, roles, parent=None):
+    """Stack of lists of items, of which the last one is visible
+
+    Arguments:
+        items (list): Initial items
+        roles (list): Keys of items exposed as roles
+        parent (QObject, optional): Parent of model
+        incremental (bool, optional): Emit row-level changes between the
+            outgoing and incoming items on push and pop, rather than
+            resetting the model. Items are identified by their `_id`,
+            or their `name` in its absence.
+
+    """
+
+    # Fetching the next page of a lazy list failed, which is fetched
+    # no further.
+    #
+    # Arguments:
+    #   error (str): Formatted traceback
+    #
+    fetchFailed = Signal(str)
+
+    def __init__(self, items, roles, parent=None, incremental=False):
         super(Model, self).__init__(parent)
         self._items = [items or list()]
+        self._incremental = incremental
+
+        # Pages of lazy lists are fetched in the background
+        self._worker = None
+
+        # Keys of each list of items, for incremental changes
+        self._keys = [[_key(item) for item in self._items[-1]]]
         self._role_to_key = {
             QtCore.Qt.UserRole + index: role.encode("utf-8")
             for index, role in enumerate(roles)
@@ -22,16 +62,175 @@ class Model(QtCore.QAbstractListModel):
         self._items[-1].append(item)
         self.endInsertRows()
 
+        if self._incremental:
+            self._keys[-1].append(_key(item))
+
     def push(self, items):
+        if self._incremental:
+            self._items.append(list(self._items[-1]))
+            self._keys.append(self._keys[-1])
+            return self._transition(items, [_key(item) for item in items])
+
         self.beginResetModel()
         self._items.append(items)
         self.endResetModel()
 
     def pop(self):
+        if self._incremental:
+            items, keys = self._items.pop(), self._keys.pop()
+
+            # Lists further down the stack remain untouched
+            previous, self._items[-1] = self._items[-1], list(items)
+            previous_keys, self._keys[-1] = self._keys[-1], keys
+            return self._transition(previous, previous_keys)
+
         self.beginResetModel()
         self._items.pop()
         self.endResetModel()
 
+    def replace(self, items):
+        """Replace the current list of items, such as once loaded"""
+        if self._incremental:
+            self._items[-1] = list(self._items[-1])
+            return self._transition(items, [_key(item) for item in items])
+
+        self.beginResetModel()
+        self._items[-1] = items
+        self.endResetModel()
+
+    def _transition(self, items, keys):
+        """Turn the current list into `items` through row-level changes"""
+        rows = self._items[-1]
+        changes = diff(self._keys[-1], keys)
+        self._keys[-1] = keys
+
+        if changes is None:
+            self.beginResetModel()
+            self._items[-1] = items
+            self.endResetModel()
+            return
+
+        parent = QtCore.QModelIndex()
+        for change, first, last in changes:
+            if change == "remove":
+                self.beginRemoveRows(parent, first, last)
+                del rows[first:last + 1]
+                self.endRemoveRows()
+
+            elif change == "move":
+                # Qt expects the row to move before, in its current indices
+                destination = last + 1 if last > first else last
+                self.beginMoveRows(parent, first, first, parent, destination)
+                rows.insert(last, rows.pop(first))
+                self.endMoveRows()
+
+            else:
+                self.beginInsertRows(parent, first, last)
+                rows[first:first] = items[first:last + 1]
+                self.endInsertRows()
+
+        self._items[-1] = items
+
+        # Rows kept may still differ in other roles than their key
+        first = None
+        for row, (before, after) in enumerate(zip(rows, items)):
+            if before is not after and before != after:
+                if first is None:
+                    first = row
+            elif first is not None:
+                self.dataChanged.emit(self.index(first), self.index(row - 1))
+                first = None
+
+        if first is not None:
+            self.dataChanged.emit(self.index(first),
+                                  self.index(len(items) - 1))
+
+    def update(self, values):
+        """Update items of the current list, such as once probed
+
+        Arguments:
+            values (dict): Values to update, by key of item, see `_key`
+
+        """
+
+        rows = self._items[-1]
+        changed = list()
+
+        for row, item in enumerate(rows):
+            try:
+                update = values[_key(item)]
+            except KeyError:
+                continue
+
+            if any(item.get(key) != value for key, value in update.items()):
+                rows[row] = dict(item, **update)
+                changed.append(row)
+
+        if changed:
+            self.dataChanged.emit(self.index(changed[0]),
+                                  self.index(changed[-1]))
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        rows = self._items[-1]
+        return not (getattr(rows, "exhausted", True) or rows.fetching)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        """Fetch the next page of a lazy list in the background
+
+        Called by views from the GUI thread, which is never to wait on
+        the query. Rows are inserted once fetched, into the list they
+        were fetched for, wherever it is on the stack by then.
+
+        """
+
+        if not self.canFetchMore(parent):
+            return
+
+        if self._worker is None:
+            self._worker = worker.Worker(threads=1, parent=self)
+
+        rows = self._items[-1]
+        rows.fetching = True
+
+        self._worker.submit(
+            rows.fetch,
+            lambda items: self._on_fetched(rows, items),
+            lambda error: self._on_fetch_failed(rows, error)
+        )
+
+    def _on_fetched(self, rows, items):
+        rows.fetching = False
+
+        for level, current in enumerate(self._items):
+            if current is rows:
+                break
+        else:
+            # Popped meanwhile
+            return
+
+        if not items:
+            return
+
+        visible = level == len(self._items) - 1
+
+        if visible:
+            self.beginInsertRows(QtCore.QModelIndex(),
+                                 len(rows),
+                                 len(rows) + len(items) - 1)
+
+        rows.extend(items)
+
+        if visible:
+            self.endInsertRows()
+
+        if self._incremental:
+            self._keys[level].extend(_key(item) for item in items)
+
+    def _on_fetch_failed(self, rows, error):
+        rows.fetching = False
+        rows.exhausted = True
+        self.fetchFailed.emit(error)
+
     def rowCount(self, parent=None):
         return len(self._items[-1])
 
@@ -44,6 +243,184 @@ class Model(QtCore.QAbstractListModel):
         return self._role_to_key
 
 
+class Lazy(list):
+    """Items fetched a page at a time, as the view needs them
+
+    Pushed onto a Model like any other list of items, of which only
+    the first page is fetched up-front.
+
+    Arguments:
+        query (callable): Called with the number of results to skip and
+            the maximum number of results to return, returning an iterable
+        transform (callable, optional): Called with each result, returning
+            the item to store
+        page (int, optional): Maximum number of items fetched at a time
+
+    Example:
+        >>> items = Lazy(lambda skip, limit: range(5)[skip:skip + limit],
+        ...              page=2)
+        >>> items, items.exhausted
+        ([0, 1], False)
+        >>> items.extend(items.fetch())
+        >>> items.extend(items.fetch())
+        >>> items, items.exhausted
+        ([0, 1, 2, 3, 4], True)
+
+    """
+
+    def __init__(self, query, transform=None, page=PAGE_SIZE):
+        super(Lazy, self).__init__()
+        self._query = query
+        self._transform = transform
+        self._page = page
+        self.exhausted = False
+
+        # Whether the next page is being fetched, see `Model.fetchMore`
+        self.fetching = False
+
+        self.extend(self.fetch())
+
+    def fetch(self):
+        """Return the next page of items, without storing them"""
+        if self.exhausted:
+            return []
+
+        results = self._query(len(self), self._page)
+
+        if self._transform is not None:
+            results = (self._transform(result) for result in results)
+
+        items = list(results)
+        self.exhausted = len(items) < self._page
+
+        return items
+
+
+def _key(item):
+    key = item.get("_id")
+    return item.get("name") if key is None else key
+
+
+def _stable(sequence):
+    """Return indices of a longest increasing subsequence of `sequence`"""
+    tails = []
+    tail_indices = []
+    previous = [None] * len(sequence)
+
+    for index, value in enumerate(sequence):
+        position = bisect.bisect_left(tails, value)
+
+        if position:
+            previous[index] = tail_indices[position - 1]
+
+        if position == len(tails):
+            tails.append(value)
+            tail_indices.append(index)
+        else:
+            tails[position] = value
+            tail_indices[position] = index
+
+    stable = set()
+    index = tail_indices[-1] if tail_indices else None
+    while index is not None:
+        stable.add(index)
+        index = previous[index]
+
+    return stable
+
+
+def diff(old, new, max_moves=MAX_MOVES):
+    """Return changes turning the list of keys `old` into `new`
+
+    Changes are returned as a list of tuples to apply in order.
+
+        ("remove", first, last)
+        ("move", source, destination)
+        ("insert", first, last)
+
+    Indices of each change are relative to the list as it is after
+    every preceding change, and the destination of a move is the
+    index of the row once moved.
+
+    Returns None where row-level changes are not worthwhile, such as
+    on duplicate keys, on no rows being kept or on more than `max_moves`
+    moves.
+
+    Example:
+        >>> diff(["a", "b", "c"], ["b", "a", "d"])
+        [('remove', 2, 2), ('move', 0, 1), ('insert', 2, 2)]
+
+    """
+
+    # Changing to an unrelated list is the most common change,
+    # check for it against the smaller of the two lists.
+    smaller, larger = sorted((old, new), key=len)
+    if smaller and set(smaller).isdisjoint(larger):
+        return None
+
+    old_keys = set(old)
+    new_keys = set(new)
+
+    if len(old_keys) != len(old) or len(new_keys) != len(new):
+        return None
+
+    changes = []
+    rows = [key for key in old if key in new_keys]
+    target = [key for key in new if key in old_keys]
+
+    # Remove from the bottom up, such that indices remain valid
+    if len(rows) != len(old):
+        last = None
+        for index in range(len(old) - 1, -1, -1):
+            if old[index] in new_keys:
+                if last is not None:
+                    changes.append(("remove", index + 1, last))
+                    last = None
+            elif last is None:
+                last = index
+
+        if last is not None:
+            changes.append(("remove", 0, last))
+
+    # Move the fewest rows possible, leaving the longest
+    # run of rows already in order where they are.
+    if rows != target:
+        positions = dict((key, index) for index, key in enumerate(target))
+        stable = set(rows[index] for index in
+                     _stable([positions[key] for key in rows]))
+
+        if len(rows) - len(stable) > max_moves:
+            return None
+
+        for index, key in enumerate(target):
+            if key in stable:
+                continue
+
+            source = rows.index(key)
+            rows.pop(source)
+            destination = rows.index(target[index - 1]) + 1 if index else 0
+            rows.insert(destination, key)
+
+            if source != destination:
+                changes.append(("move", source, destination))
+
+    # Insert ranges in order, such that each lands on its final index
+    if len(target) != len(new):
+        first = None
+        for index, key in enumerate(new):
+            if key not in old_keys:
+                if first is None:
+                    first = index
+            elif first is not None:
+                changes.append(("insert", first, index - 1))
+                first = None
+
+        if first is not None:
+            changes.append(("insert", first, len(new) - 1))
+
+    return changes
+
+
 def data(index, key):
     key = key.encode("utf-8")
     role = index.model()._key_to_role[key]
@@ -0,0 +1,249 @@
+"""Output of launched processes, read from a single thread
+
+Every pipe of every launched process is watched by one thread, which
+reads whatever output is available in chunks and splits it into lines.
+Lines are delivered to the GUI thread in batches, and processes are
+forgotten once they have exited.
+
+    multiplexer = Multiplexer()
+    multiplexer.messaged.connect(lambda lines: print("\\n".join(lines)))
+    multiplexer.add("maya", subprocess.Popen(..., stdout=subprocess.PIPE))
+
+Pipes cannot be waited on together on Windows, where each pipe is
+instead read by a thread of its own.
+
+"""
+
+import os
+import locale
+import threading
+
+from PyQt5 import QtCore
+
+from . import tracing
+
+try:
+    import selectors
+except ImportError:
+    # Python 2
+    selectors = None
+
+Signal = QtCore.pyqtSignal
+
+# Maximum number of bytes read from a pipe at a time
+CHUNK = 64 * 1024
+
+# Milliseconds between each batch of output delivered
+INTERVAL = 50
+
+SELECT = selectors is not None and os.name != "nt"
+
+
+class Process(object):
+    """A process being watched, and what remains of its output"""
+
+    def __init__(self, name, popen):
+        self.name = name
+        self.popen = popen
+        self.pipes = [
+            pipe for pipe in (getattr(popen, "stdout", None),
+                              getattr(popen, "stderr", None))
+            if pipe is not None
+        ]
+
+        # Incomplete last line of each pipe, by file descriptor
+        self.partial = {pipe.fileno(): b"" for pipe in self.pipes}
+
+        # Time until the first output, for tracing
+        self.started = tracing.clock()
+        self.output = False
+
+
+class Multiplexer(QtCore.QObject):
+    """Read the output of many processes at once
+
+    Arguments:
+        interval (int, optional): Milliseconds between each batch of
+            output delivered
+        parent (QObject, optional): Parent of multiplexer
+
+    """
+
+    # Lines output by any process since the last batch
+    #
+    # Arguments:
+    #   lines (list): Lines, without line endings
+    #
+    messaged = Signal(object)
+
+    # A process exited, and is no longer watched
+    #
+    # Arguments:
+    #   name (str): Name the process was added with
+    #   returncode (int): Exit status of the process
+    #
+    exited = Signal(str, int)
+
+    def __init__(self, interval=INTERVAL, parent=None):
+        super(Multiplexer, self).__init__(parent)
+
+        self.processes = list()
+
+        self._lock = threading.Lock()
+        self._lines = list()
+        self._encoding = locale.getpreferredencoding(False) or "utf-8"
+
+        # Pipes are handed to the reading thread, and woken up for
+        self._incoming = list()
+        self._thread = None
+        self._wakeup = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+
+    def add(self, name, popen):
+        """Watch the output of `popen`, until it exits
+
+        Arguments:
+            name (str): Name of the process, passed along on exit
+            popen (subprocess.Popen): Process, of which stdout and
+                stderr are read if piped
+
+        Returns:
+            Process: The process being watched
+
+        """
+
+        process = Process(name, popen)
+        self.processes.append(process)
+
+        if process.pipes:
+            if SELECT:
+                self._select(process)
+            else:
+                for pipe in process.pipes:
+                    thread = threading.Thread(target=self._drain,
+                                              args=(process, pipe))
+                    thread.daemon = True
+                    thread.start()
+
+        self._timer.start()
+
+        return process
+
+    def flush(self):
+        """Deliver output so far, and forget about exited processes"""
+
+        # Pipes are closed after their last lines are stored, such that
+        # every line of these processes is part of this batch.
+        exited = list()
+        for process in self.processes[:]:
+            if process.pipes:
+                continue
+
+            returncode = process.popen.poll()
+            if returncode is None:
+                continue
+
+            self.processes.remove(process)
+            exited.append((process.name, returncode))
+
+        with self._lock:
+            lines, self._lines = self._lines, list()
+
+        if lines:
+            self.messaged.emit(lines)
+
+        for name, returncode in exited:
+            self.exited.emit(name, returncode)
+
+        if not self.processes:
+            self._timer.stop()
+
+    def _select(self, process):
+        with self._lock:
+            self._incoming.append(process)
+
+            if self._thread is None:
+                self._wakeup = os.pipe()
+                self._thread = threading.Thread(target=self._loop)
+                self._thread.daemon = True
+                self._thread.start()
+            else:
+                os.write(self._wakeup[1], b"x")
+
+    def _loop(self):
+        """Read every pipe as output becomes available"""
+        selector = selectors.DefaultSelector()
+        selector.register(self._wakeup[0], selectors.EVENT_READ)
+
+        while True:
+            with self._lock:
+                incoming, self._incoming = self._incoming, list()
+
+                # Quit once nothing is left to read, with the
+                # lock held such that nothing can be added
+                if not incoming and len(selector.get_map()) == 1:
+                    selector.close()
+                    os.close(self._wakeup[0])
+                    os.close(self._wakeup[1])
+                    self._thread = None
+                    return
+
+            for process in incoming:
+                for pipe in process.pipes:
+                    selector.register(pipe, selectors.EVENT_READ, process)
+
+            for key, events in selector.select():
+                if key.data is None:
+                    os.read(key.fd, CHUNK)
+                    continue
+
+                if not self._read(key.data, key.fileobj):
+                    selector.unregister(key.fileobj)
+
+    def _drain(self, process, pipe):
+        """Read `pipe` until closed, for when pipes cannot be selected"""
+        while self._read(process, pipe):
+            pass
+
+    def _read(self, process, pipe):
+        """Read a chunk of `pipe`, returning False once closed"""
+        fd = pipe.fileno()
+
+        try:
+            chunk = os.read(fd, CHUNK)
+        except OSError:
+            chunk = b""
+
+        if chunk and not process.output:
+            process.output = True
+            tracing.complete("first output", process.started,
+                             process=process.name,
+                             pid=process.popen.pid)
+
+        data = process.partial[fd] + chunk
+
+        if chunk:
+            lines = data.split(b"\n")
+            process.partial[fd] = lines.pop()
+        else:
+            # Closed, along with what remains of the last line
+            lines = [data] if data else []
+
+        lines = [
+            line.rstrip(b"\r").decode(self._encoding, "replace")
+            for line in lines
+        ]
+
+        with self._lock:
+            self._lines.extend(lines)
+
+            if not chunk:
+                process.pipes.remove(pipe)
+
+        if not chunk:
+            pipe.close()
+
+        return bool(chunk)
@@ -0,0 +1,97 @@
+"""Speculatively load levels the user is likely to enter next
+
+Prefetched results are stored in the cache of the controller, such
+that entering the level completes without a query of its own.
+
+"""
+
+from PyQt5 import QtCore
+
+from . import worker
+
+
+class Prefetcher(QtCore.QObject):
+    """Rate-limited queue of queries run in the background
+
+    Requests are run one at a time, at most one per `interval`, and
+    only while `busy` returns False, such that prefetching never
+    crowds out queries the user is waiting on.
+
+    Arguments:
+        cache (launcher.cache.Cache): Cache results are stored in
+        budget (int, optional): Maximum number of requests run until
+            the next call to `cancel`, 0 disables prefetching
+        interval (int, optional): Milliseconds between requests
+        busy (callable, optional): Return whether to hold off for now
+        parent (QObject, optional): Parent of prefetcher
+
+    """
+
+    def __init__(self, cache, budget=10, interval=50, busy=None, parent=None):
+        super(Prefetcher, self).__init__(parent)
+
+        self._cache = cache
+        self._budget = budget
+        self._remaining = budget
+        self._busy = busy or (lambda: False)
+        self._queue = list()
+        self._queued = set()
+        self._worker = worker.Worker(threads=1, parent=self)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._on_tick)
+
+    def request(self, key, query, urgent=False):
+        """Run `query` in the background, unless `key` is already cached
+
+        Arguments:
+            key (tuple): Key of the result in the cache
+            query (callable): Called without arguments, storing its
+                result in the cache
+            urgent (bool, optional): Run before other requests, such as
+                for the row under the mouse
+
+        """
+
+        if key in self._queued or key in self._cache:
+            return
+
+        if urgent:
+            self._queue.insert(0, (key, query))
+        else:
+            self._queue.append((key, query))
+
+        self._queued.add(key)
+
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self):
+        """Forget about pending requests, and renew the budget"""
+        self._queue[:] = []
+        self._queued.clear()
+        self._worker.cancel()
+        self._timer.stop()
+        self._remaining = self._budget
+
+    def wait(self, msecs=-1):
+        """Block until the request running is done, for tests and exit"""
+        return self._worker.wait(msecs)
+
+    def _on_tick(self):
+        if not self._queue or self._remaining <= 0:
+            return self._timer.stop()
+
+        if self._busy():
+            return
+
+        key, query = self._queue.pop(0)
+        self._queued.discard(key)
+
+        if key in self._cache:
+            return
+
+        # Failures are left for the user's own request to report
+        self._remaining -= 1
+        self._worker.submit(query, error=lambda message: None)
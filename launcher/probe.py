@@ -0,0 +1,262 @@
+"""Existence and modification time of many paths, probed in the background
+
+Project roots are often network shares, where each call to stat takes
+its time. Paths are probed a directory at a time, listing each
+directory once for all paths requested within it, and directories
+probed simultaneously. Results are kept for a few seconds.
+
+    probe = Probe()
+    probe.probed.connect(lambda results: print(results))
+    known = probe.request(["/projects/hulk/work", "/projects/hulk/publish"])
+
+Directories of results may optionally be watched for changes, which
+is only worthwhile on local disks.
+
+"""
+
+import os
+import sys
+import functools
+import contextlib
+import collections
+
+from PyQt5 import QtCore
+
+from . import cache, worker
+
+try:
+    from os import scandir
+except ImportError:
+    # Python 2
+    scandir = None
+
+Signal = QtCore.pyqtSignal
+
+# Seconds results are kept
+TTL = 5.0
+
+# Maximum number of results kept
+SIZE = 10000
+
+
+class Probe(QtCore.QObject):
+    """Probe paths in the background, delivering results in batches
+
+    Arguments:
+        ttl (float, optional): Seconds results are kept
+        threads (int, optional): Number of directories probed at once
+        watch (bool, optional): Probe paths again once their directory
+            changes, rather than after `ttl` only
+        parent (QObject, optional): Parent of probe
+
+    """
+
+    # Paths of a directory were probed
+    #
+    # Arguments:
+    #   results (dict): Whether each path exists, along with its time
+    #       of modification or None, by path
+    #
+    probed = Signal(object)
+
+    def __init__(self, ttl=TTL, threads=4, watch=False, parent=None):
+        super(Probe, self).__init__(parent)
+
+        self._cache = cache.Cache(ttl=ttl, size=SIZE)
+        self._worker = worker.Worker(threads=threads, parent=self)
+
+        # Paths being probed, which needn't be requested again
+        self._pending = set()
+
+        # Callbacks of `exists`, by path being probed
+        self._waiting = collections.defaultdict(list)
+
+        # Paths probed, by directory watched
+        self._watched = collections.defaultdict(set)
+        self._watcher = None
+
+        if watch:
+            self._watcher = QtCore.QFileSystemWatcher(self)
+            self._watcher.directoryChanged.connect(self._on_changed)
+
+    def request(self, paths):
+        """Return results known of `paths`, probing the remainder
+
+        Results of paths not yet known are delivered through `probed`,
+        a directory at a time.
+
+        Arguments:
+            paths (list): Absolute, normalised paths
+
+        Returns:
+            dict: Results known, by path, see `probed`
+
+        """
+
+        known = dict()
+        missing = collections.defaultdict(list)
+
+        for path in paths:
+            result = self._cache.get(path)
+
+            if result is not None:
+                known[path] = result
+
+            elif path not in self._pending:
+                self._pending.add(path)
+                missing[os.path.dirname(path)].append(path)
+
+        for directory, paths in missing.items():
+            self._submit(directory, paths)
+
+        return known
+
+    def exists(self, path, callback):
+        """Call `callback` with whether `path` exists, once known
+
+        Arguments:
+            path (str): Absolute, normalised path
+            callback (callable): Called with True or False, from the
+                thread of the probe
+
+        """
+
+        result = self._cache.get(path)
+
+        if result is not None:
+            return callback(result[0])
+
+        self._waiting[path].append(callback)
+
+        if path not in self._pending:
+            self._pending.add(path)
+            self._submit(os.path.dirname(path), [path])
+
+    def invalidate(self, path=None):
+        """Forget result of `path`, or every result if None"""
+        self._cache.invalidate(path)
+
+    def _submit(self, directory, paths):
+        self._worker.submit(
+            functools.partial(self._probe, directory, paths),
+            self._on_probed,
+            functools.partial(self._on_failed, paths)
+        )
+
+    def _probe(self, directory, paths):
+        """Probe `paths` in the calling thread, for `_on_probed`
+
+        Whether `directory` exists, and may be watched, is found here
+        too, rather than from the GUI thread.
+
+        """
+
+        results = probe(directory, paths)
+        watchable = self._watcher is not None and os.path.isdir(directory)
+        return results, watchable
+
+    def _on_probed(self, probed):
+        results, watchable = probed
+
+        for path, result in results.items():
+            self._cache.put(path, result)
+            self._pending.discard(path)
+
+            for callback in self._waiting.pop(path, []):
+                callback(result[0])
+
+        if self._watcher is not None:
+            for path in results:
+                directory = os.path.dirname(path)
+
+                if directory not in self._watched and watchable:
+                    self._watcher.addPath(directory)
+
+                self._watched[directory].add(path)
+
+        self.probed.emit(results)
+
+    def _on_failed(self, paths, error):
+        """Forget `paths`, such that they are probed again once requested"""
+        sys.stderr.write(error)
+
+        for path in paths:
+            self._pending.discard(path)
+
+            for callback in self._waiting.pop(path, []):
+                callback(False)
+
+    def _on_changed(self, directory):
+        paths = self._watched.pop(directory, set())
+
+        for path in paths:
+            self._cache.invalidate(path)
+
+        self._watcher.removePath(directory)
+        self.request(sorted(paths))
+
+
+def probe(directory, paths):
+    """Return whether each of `paths` exists, along with its mtime
+
+    Paths are expected to be immediate children of `directory`,
+    which is listed once for all of them.
+
+    Arguments:
+        directory (str): Parent of `paths`
+        paths (list): Absolute paths
+
+    Returns:
+        dict: (exists, mtime) by path, mtime being None if missing
+
+    """
+
+    results = dict.fromkeys(paths, (False, None))
+
+    if scandir is None:
+        for path in paths:
+            try:
+                results[path] = (True, os.stat(path).st_mtime)
+            except OSError:
+                pass
+
+        return results
+
+    wanted = {os.path.basename(path): path for path in paths}
+
+    try:
+        entries = scandir(directory)
+    except OSError:
+        return results
+
+    with contextlib.closing(entries):
+        for entry in entries:
+            path = wanted.get(entry.name)
+
+            if path is None:
+                continue
+
+            try:
+                results[path] = (True, entry.stat().st_mtime)
+            except OSError:
+                pass
+
+    return results
+
+
+def directories(root):
+    """Return names of directories within `root`, without stat per entry"""
+    if scandir is None:
+        try:
+            base, dirs, files = next(os.walk(root))
+        except (IOError, StopIteration):
+            return list()
+
+        return dirs
+
+    try:
+        with contextlib.closing(scandir(root)) as entries:
+            return [entry.name for entry in entries if entry.is_dir()]
+    except OSError:
+        # Ignore non-existing dirs
+        return list()
@@ -0,0 +1,280 @@
+"""Processes launched by actions, and the resources they use
+
+Resources of every running process are sampled together, once per
+interval, such that the cost of sampling stays the same regardless
+of how many processes are running.
+
+Resources are read from /proc on Linux, and through psutil elsewhere,
+where available.
+
+"""
+
+import os
+import sys
+import time
+
+from PyQt5 import QtCore
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+Slot = QtCore.pyqtSlot
+
+# Milliseconds between each sample of resources
+INTERVAL = 1000
+
+# Number of exited processes kept, beyond which the oldest are removed
+HISTORY = 20
+
+LINUX = sys.platform.startswith("linux")
+
+if LINUX:
+    _TICKS = float(os.sysconf("SC_CLK_TCK"))
+    _PAGE = os.sysconf("SC_PAGE_SIZE")
+
+
+def sample(pids):
+    """Return CPU time and resident memory of each process of `pids`
+
+    Processes no longer running, or for which resources cannot be
+    read on this platform, are left out.
+
+    Arguments:
+        pids (list): Process identifiers
+
+    Returns:
+        dict: Seconds of CPU time and bytes of memory, by pid
+
+    """
+
+    samples = dict()
+
+    for pid in pids:
+        try:
+            if LINUX:
+                with open("/proc/%d/stat" % pid) as f:
+                    stat = f.read()
+
+                # The name of the process may itself contain spaces
+                fields = stat.rsplit(")", 1)[-1].split()
+                cpu = (int(fields[11]) + int(fields[12])) / _TICKS
+                memory = int(fields[21]) * _PAGE
+
+            elif psutil is not None:
+                process = psutil.Process(pid)
+                times = process.cpu_times()
+                cpu = times.user + times.system
+                memory = process.memory_info().rss
+
+            else:
+                break
+
+        except Exception:
+            # Exited since
+            continue
+
+        samples[pid] = (cpu, memory)
+
+    return samples
+
+
+def usage():
+    """Return CPU time and memory used by the machine as a whole
+
+    Returns:
+        tuple: Seconds of CPU time spent busy and in total across
+            every core since boot, and percentage of memory in use,
+            or None where unavailable
+
+    """
+
+    try:
+        if LINUX:
+            with open("/proc/stat") as f:
+                fields = [int(field) for field in f.readline().split()[1:]]
+
+            # Idle and waiting on input and output
+            total = sum(fields) / _TICKS
+            busy = total - (fields[3] + fields[4]) / _TICKS
+
+            memory = dict()
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    key, value = line.split(":", 1)
+                    memory[key] = int(value.split()[0])
+
+            percent = 100.0 * (1 - memory["MemAvailable"] /
+                               float(memory["MemTotal"]))
+
+            return busy, total, percent
+
+        elif psutil is not None:
+            times = psutil.cpu_times()
+            total = sum(times)
+            busy = total - times.idle - getattr(times, "iowait", 0.0)
+
+            return busy, total, psutil.virtual_memory().percent
+
+    except Exception:
+        pass
+
+    return None
+
+
+class Processes(QtCore.QAbstractListModel):
+    """Processes launched, along with the resources they use
+
+    Arguments:
+        interval (int, optional): Milliseconds between each sample
+        parent (QObject, optional): Parent of model
+
+    """
+
+    roles = [
+        "name",
+        "pid",
+        "status",
+        "started",
+        "wall",
+        "cpu",
+        "memory",
+        "returncode",
+    ]
+
+    def __init__(self, interval=INTERVAL, parent=None):
+        super(Processes, self).__init__(parent)
+
+        self._items = list()
+        self._roles = {
+            QtCore.Qt.UserRole + index: role.encode("utf-8")
+            for index, role in enumerate(self.roles)
+        }
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.sample)
+
+    def add(self, name, popen):
+        """Keep track of `popen`, launched as `name`"""
+        now = time.time()
+
+        self.beginInsertRows(QtCore.QModelIndex(),
+                             len(self._items),
+                             len(self._items))
+        self._items.append({
+            "name": name,
+            "pid": popen.pid,
+            "status": "running",
+            "started": time.strftime("%H:%M:%S", time.localtime(now)),
+            "wall": 0.0,
+            "cpu": 0.0,
+            "memory": 0.0,
+            "returncode": None,
+
+            # Private to this model
+            "popen": popen,
+            "time": now,
+            "sampled": (now, 0.0),
+        })
+        self.endInsertRows()
+
+        self._timer.start()
+
+    def sample(self):
+        """Update every running process, at once"""
+        now = time.time()
+        running = [
+            item for item in self._items
+            if item["returncode"] is None
+        ]
+
+        for item in running:
+            returncode = item["popen"].poll()
+
+            if returncode is not None:
+                item["returncode"] = returncode
+                item["status"] = "exited"
+
+            item["wall"] = now - item["time"]
+
+        samples = sample([
+            item["pid"] for item in running
+            if item["returncode"] is None
+        ])
+
+        for item in running:
+            try:
+                cpu, memory = samples[item["pid"]]
+            except KeyError:
+                continue
+
+            # Percentage of a single core since the previous sample
+            previous, previous_cpu = item["sampled"]
+            if now > previous:
+                item["cpu"] = (cpu - previous_cpu) / (now - previous) * 100
+
+            item["sampled"] = (now, cpu)
+            item["memory"] = memory / float(1024 ** 2)
+
+        if self._items:
+            self.dataChanged.emit(self.index(0),
+                                  self.index(len(self._items) - 1))
+
+        self._forget()
+
+        if not any(item["returncode"] is None for item in self._items):
+            self._timer.stop()
+
+    def _forget(self):
+        """Remove the oldest exited processes beyond the history"""
+        exited = [
+            row for row, item in enumerate(self._items)
+            if item["returncode"] is not None
+        ]
+
+        for row in reversed(exited[:max(len(exited) - HISTORY, 0)]):
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            self._items.pop(row)
+            self.endRemoveRows()
+
+    @Slot(int)
+    def terminate(self, row):
+        """Ask process at `row` to exit"""
+        self._signal(row, "terminate")
+
+    @Slot(int)
+    def kill(self, row):
+        """Force process at `row` to exit"""
+        self._signal(row, "kill")
+
+    def _signal(self, row, method):
+        item = self._items[row]
+
+        if item["returncode"] is not None:
+            return
+
+        try:
+            getattr(item["popen"], method)()
+        except OSError:
+            # Exited since
+            return
+
+        item["status"] = "terminating"
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=None):
+        return len(self._items)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        try:
+            key = self._roles[role].decode("utf-8")
+        except KeyError:
+            return None
+
+        return self._items[index.row()][key]
+
+    def roleNames(self):
+        return self._roles
@@ -54,6 +54,26 @@ Flow {
                 color: "white"
             }
 
+            // Progress of the action, whilst running in the background
+            Rectangle {
+                visible: model.progress >= 0
+                anchors.left: parent.left
+                anchors.bottom: parent.bottom
+                width: parent.width * Math.max(model.progress, 0.05)
+                height: 2
+                color: "#5a9"
+            }
+
+            MyButton {
+                visible: model.progress >= 0
+                anchors.top: parent.top
+                anchors.right: parent.right
+                width: 12
+                height: 12
+                custom_icon: "times"
+                onClicked: controller.cancel_action(actionRepeater.model.index(index, null))
+            }
+
             onClicked: controller.trigger_action(actionRepeater.model.index(index, null))
         }
     }
@@ -1,6 +1,5 @@
 import QtQuick 2.6
-
-import "awesome.js" as Awesome
+import QtQuick.Window 2.2
 
 
 Item {
@@ -9,36 +8,65 @@ Item {
     property string name
     property bool rotate: root.name.match(/.*-rotate/) !== null
 
-    property alias color: text.color
+    property color color: "#eee"
     property int size: 16
 
-    property bool shadow: false
+    // Color last drawn, faded out as the current one fades in
+    property color previousColor
+    property bool completed: false
 
-    property var icons: Awesome.map
+    Component.onCompleted: {
+        root.previousColor = root.color
+        root.completed = true
+    }
 
-    property alias weight: text.font.weight
+    implicitWidth: root.size
+    implicitHeight: root.size
 
-    width: text.width
-    height: text.height
+    // Drawn in physical pixels, and shown in logical pixels, such that
+    // icons are sharp on high-DPI screens. Only some versions of Qt scale
+    // a sourceSize by the pixel ratio, so the size is part of the source.
+    property int pixels: Math.ceil(root.size * Screen.devicePixelRatio)
 
-    FontLoader { id: fontAwesome; source: Qt.resolvedUrl("../font/fontawesome/FontAwesome.otf") }
+    function source(color) {
+        return root.name ? "image://icons/" + root.name + "/" + encodeURIComponent(color) + "/" + root.pixels : ""
+    }
 
-    Text {
-        id: text
-        anchors.centerIn: parent
+    // Colors animate by fading from one image to the next, rather than
+    // drawing every color in between.
+    onColorChanged: {
+        if (!root.completed)
+            return
 
-        property string name: root.name.match(/.*-rotate/) !== null ? root.name.substring(0, root.name.length - 7) : root.name
+        previous.source = root.source(root.previousColor)
+        root.previousColor = root.color
+        fade.restart()
+    }
 
-        font.family: fontAwesome.name
-        font.weight: Font.Light
-        text: root.icons.hasOwnProperty(name) ? root.icons[name] : ""
-        color: "#eee"
-        style: shadow ? Text.Raised : Text.Normal
-        styleColor: Qt.rgba(0,0,0,0.5)
-        font.pixelSize: root.size
+    Image {
+        id: previous
+        anchors.fill: image
 
-        Behavior on color {
-            ColorAnimation { duration: 200 }
+        rotation: image.rotation
+        opacity: 1 - image.opacity
+        visible: opacity > 0
+    }
+
+    // Drawn once per name, color and size, and shared, see icons.py
+    Image {
+        id: image
+        anchors.centerIn: parent
+        width: root.size
+        height: root.size
+
+        source: root.source(root.color)
+
+        NumberAnimation on opacity {
+            id: fade
+            running: false
+            from: 0
+            to: 1
+            duration: 200
         }
 
         NumberAnimation on rotation {
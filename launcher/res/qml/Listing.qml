@@ -38,14 +38,45 @@ ListView {
                 verticalAlignment: Text.AlignVCenter
                 horizontalAlignment: Text.AlignLeft
             }
+
+            /** Work directory, and when it was last modified
+             */
+            Text {
+                text: Qt.formatDate(new Date(model.modified * 1000))
+                color: "#888"
+                font.pixelSize: 10
+                visible: model.workdir === true
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            AwesomeIcon {
+                name: "folder-o"
+                opacity: 0.4
+                visible: model.workdir === true
+                width: height
+                Layout.rightMargin: 5
+            }
         }
 
         background: Rectangle {
-            opacity: control.down ? 0.3 : 0.0
+            opacity: control.down ? 0.3 : model.selected ? 0.15 : 0.0
             color: "white"
         }
 
+        /** Ctrl+click selects rows, across which actions are run
+         */
+        MouseArea {
+            anchors.fill: parent
+            onPressed: mouse.accepted = (mouse.modifiers & Qt.ControlModifier) !== 0
+            onClicked: controller.select(listView.model.index(index, null))
+        }
+
         width: listView.width - listView.leftMargin - listView.rightMargin
+        hoverEnabled: true
+        onHoveredChanged: {
+            if (hovered)
+                controller.highlight(listView.model.index(index, null))
+        }
         onClicked: controller.push(listView.model.index(index, null))
     }
 }
@@ -0,0 +1,81 @@
+import QtQuick 2.6
+import QtQuick.Controls 2.0
+import QtQuick.Layouts 1.3
+
+/** Processes launched by actions, and the resources they use
+ */
+ListView {
+    id: listView
+
+    clip: true
+    boundsBehavior: Flickable.StopAtBounds
+    ScrollBar.vertical: ScrollBar { }
+
+    function duration(seconds) {
+        var minutes = Math.floor(seconds / 60)
+        var hours = Math.floor(minutes / 60)
+        return hours + "h " + (minutes % 60) + "m " + Math.floor(seconds % 60) + "s"
+    }
+
+    delegate: RowLayout {
+        width: listView.width
+        height: 20
+        spacing: 8
+
+        opacity: model.returncode === null ? 1.0 : 0.4
+
+        Text {
+            text: model.name
+            color: "#eee"
+            elide: Text.ElideRight
+            Layout.fillWidth: true
+        }
+
+        Text {
+            text: model.pid
+            color: "#888"
+        }
+
+        Text {
+            text: model.returncode === null
+                ? model.status
+                : model.status + " (" + model.returncode + ")"
+            color: "#888"
+        }
+
+        Text {
+            text: model.started + ", " + listView.duration(model.wall)
+            color: "#888"
+        }
+
+        Text {
+            text: model.cpu.toFixed(0) + "%"
+            color: "#eee"
+            horizontalAlignment: Text.AlignRight
+            Layout.preferredWidth: 40
+        }
+
+        Text {
+            text: model.memory.toFixed(0) + " MB"
+            color: "#eee"
+            horizontalAlignment: Text.AlignRight
+            Layout.preferredWidth: 60
+        }
+
+        MyButton {
+            custom_icon: "stop"
+            enabled: model.returncode === null
+            implicitWidth: parent.height
+            implicitHeight: parent.height
+            onClicked: listView.model.terminate(index)
+        }
+
+        MyButton {
+            custom_icon: "times"
+            enabled: model.returncode === null
+            implicitWidth: parent.height
+            implicitHeight: parent.height
+            onClicked: listView.model.kill(index)
+        }
+    }
+}
@@ -80,6 +80,25 @@ ApplicationWindow {
                     model: controller.breadcrumbs
                 }
 
+                /** Shown while the current level is loading
+                 */
+                BusyIndicator {
+                    implicitWidth: parent.height
+                    implicitHeight: parent.height
+                    running: controller.loading
+                    visible: running
+                }
+
+                /** Shown while the current level is as last seen,
+                 *  until loaded from the database
+                 */
+                AwesomeIcon {
+                    name: "history"
+                    opacity: 0.4
+                    visible: controller.stale
+                    Layout.alignment: Qt.AlignVCenter
+                }
+
                 /** Open explorer in set context based on template
                  */
                 MyButton {
@@ -95,6 +114,17 @@ ApplicationWindow {
                     opacity: 0.4
                 }
 
+                /** Toggle Processes on/off
+                 */
+                MyButton {
+                    id: processesButton
+                    custom_icon: "tasks"
+                    checkable: true
+                    implicitHeight: parent.height
+                    implicitWidth: parent.height
+                    Layout.alignment: Qt.AlignRight
+                }
+
                 /** Toggle Terminal on/off
                  */
                 MyButton {
@@ -120,6 +150,110 @@ ApplicationWindow {
                 }
             }
         }
+
+        /** Go to any level of projects entered so far, by name
+         */
+        TextField {
+            id: searchField
+            Layout.fillWidth: true
+            Layout.leftMargin: 5
+            Layout.rightMargin: 5
+            placeholderText: "Search.."
+            selectByMouse: true
+            font.pixelSize: 11
+
+            onTextChanged: {
+                controller.search(text)
+                searchPopup.visible = text.length > 0
+            }
+
+            onAccepted: {
+                if (searchView.count) {
+                    go(searchView.currentIndex)
+                }
+            }
+
+            Keys.onDownPressed: searchView.incrementCurrentIndex()
+            Keys.onUpPressed: searchView.decrementCurrentIndex()
+            Keys.onEscapePressed: clear()
+
+            function go(index) {
+                controller.goto(index)
+                clear()
+            }
+
+            Popup {
+                id: searchPopup
+                y: parent.height
+                width: parent.width
+                height: Math.min(searchView.contentHeight + 10, 250)
+                padding: 5
+                visible: false
+                closePolicy: Popup.CloseOnPressOutside
+
+                background: Rectangle {
+                    color: "#333"
+                    border.color: "#222"
+                }
+
+                ListView {
+                    id: searchView
+                    anchors.fill: parent
+                    clip: true
+                    model: controller.results
+                    highlightMoveDuration: 0
+                    highlight: Rectangle { color: "#555" }
+
+                    ScrollBar.vertical: ScrollBar { }
+
+                    delegate: MouseArea {
+                        width: ListView.view.width
+                        height: 24
+                        hoverEnabled: true
+
+                        onEntered: searchView.currentIndex = index
+                        onClicked: searchField.go(index)
+
+                        RowLayout {
+                            anchors.fill: parent
+                            anchors.leftMargin: 5
+                            anchors.rightMargin: 5
+
+                            AwesomeIcon {
+                                name: model.icon
+                                color: "#eee"
+                                size: 12
+                            }
+
+                            Label {
+                                text: model.label
+                                color: "#eee"
+                            }
+
+                            Label {
+                                text: model.parents
+                                color: "#888"
+                                font.pixelSize: 10
+                                elide: Text.ElideLeft
+                                horizontalAlignment: Text.AlignRight
+                                Layout.fillWidth: true
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    /** Stages of starting up still running, once the window is shown
+     */
+    footer: Label {
+        text: startup.message
+        color: "#888"
+        font.pixelSize: 10
+        padding: 5
+        elide: Text.ElideRight
+        visible: !startup.done
     }
 
     /** Main Layout
@@ -170,7 +304,7 @@ ApplicationWindow {
         clip: true
 
         anchors {
-            bottom: terminalContainer.top
+            bottom: processesContainer.top
             left: parent.left
             right: attributeEditorContainer.left
             top: browserContainer.bottom
@@ -179,7 +313,7 @@ ApplicationWindow {
 
         Label {
             id: actionsLabel
-            text: "Actions"
+            text: controller.selected ? "Actions, for " + controller.selected + " selected" : "Actions"
             color: "#eee"
             font.pixelSize: 12
             anchors {
@@ -189,6 +323,22 @@ ApplicationWindow {
             }
         }
 
+        /** Deselect rows, running actions for the current level alone
+         */
+        MyButton {
+            custom_icon: "times"
+            visible: controller.selected > 0
+            width: actionsLabel.height
+            height: actionsLabel.height
+            anchors {
+                left: actionsLabel.right
+                verticalCenter: actionsLabel.verticalCenter
+                leftMargin: 5
+            }
+
+            onClicked: controller.deselect()
+        }
+
         Flickable {
             anchors.left: parent.left
             anchors.right: parent.right
@@ -218,7 +368,7 @@ ApplicationWindow {
 
         anchors {
             top: parent.top
-            bottom: terminalContainer.top
+            bottom: processesContainer.top
             right: parent.right
             margins: 5
         }
@@ -234,6 +384,33 @@ ApplicationWindow {
         }
     }
 
+    Rectangle {
+        id: processesContainer
+
+        height: processesButton.checked ? 150 : 0
+
+        anchors {
+            left: parent.left
+            right: parent.right
+            bottom: terminalContainer.top
+            margins: 5
+        }
+
+        Behavior on height { SmoothedAnimation { velocity: 2000 } }
+
+        border.color: "#222"
+        color: "#333"
+
+        clip: true
+        visible: height > 0
+
+        Processes {
+            anchors.fill: parent
+            anchors.margins: 5
+            model: controller.processes
+        }
+    }
+
     Rectangle {
         id: terminalContainer
 
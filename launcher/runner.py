@@ -0,0 +1,268 @@
+"""Run actions in the background, such that slow ones leave the window be
+
+Actions often do a lot before launching anything, such as building
+workfiles or copying templates. Actions declaring `threaded = True`
+have `Action.process` called from a thread of its own, and its result,
+such as the process launched, delivered back to the GUI thread.
+
+Whilst running, an action may report its progress, and check whether
+it has been cancelled, through `current()`.
+
+    class Publish(api.Action):
+        threaded = True
+
+        def process(self, session):
+            run = runner.current()
+
+            for index, path in enumerate(paths):
+                if run.cancelled:
+                    return
+
+                run.progress(index / float(len(paths)), "Copying..")
+                copy(path)
+
+Actions not declaring so are processed from the GUI thread, as they
+may show windows of their own, which Qt only supports from there.
+
+"""
+
+import time
+import threading
+import traceback
+
+from PyQt5 import QtCore
+
+from . import worker, tracing
+
+Signal = QtCore.pyqtSignal
+
+# Run of the action processed by each thread
+_local = threading.local()
+
+# Seconds after being triggered within which triggering an action
+# again, within the same session, does nothing, such as on double-click.
+DEBOUNCE = 1.0
+
+# Status of each run
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+def current():
+    """Return the run of the action being processed in this thread
+
+    Returns:
+        Run: Of the calling action, or a run which reports its progress
+            to no one outside of the runner.
+
+    """
+
+    return getattr(_local, "run", None) or Run(None, None, None)
+
+
+class Run(object):
+    """An action being run, and how it went
+
+    Arguments:
+        name (str): Name of action
+        Action (type): Action run
+        session (dict): Session the action is run within
+        label (str, optional): Run for display, defaults to `name`
+        report (callable, optional): Called with the run, progress and
+            message whenever progress is reported, from any thread
+
+    """
+
+    def __init__(self, name, Action, session, label=None, report=None):
+        self.name = name
+        self.Action = Action
+        self.session = session
+        self.label = label or name
+        self.status = PENDING
+        self.value = None
+        self.message = ""
+        self.popen = None
+        self.error = None
+        self.started = time.time()
+
+        self._report = report
+        self._cancelled = False
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def progress(self, value, message=""):
+        """Report progress of the action, from 0 to 1, from any thread"""
+        if self._report is not None:
+            self._report(self, float(value), message)
+
+    def cancel(self):
+        """Ask the action to stop
+
+        Actions not yet started are never started, those running are
+        expected to check `cancelled`, and processes launched by an
+        action cancelled meanwhile are terminated.
+
+        """
+
+        self._cancelled = True
+
+
+class Runner(QtCore.QObject):
+    """Run actions in a pool of threads, delivering results as signals
+
+    Arguments:
+        threads (int, optional): Maximum number of actions run at once
+        parent (QObject, optional): Parent of runner
+
+    """
+
+    # An action was submitted, and is about to be processed
+    #
+    # Arguments:
+    #   run (Run): Run of action
+    #
+    started = Signal(object)
+
+    # An action reported its progress
+    #
+    # Arguments:
+    #   run (Run): Run of action, with its latest value and message
+    #
+    progressed = Signal(object)
+
+    # An action returned, failed or was cancelled
+    #
+    # Arguments:
+    #   run (Run): Run of action, with the process it launched, if any
+    #
+    finished = Signal(object)
+
+    # Progress reported from the thread of an action
+    _reported = Signal(object, float, str)
+
+    def __init__(self, threads=4, parent=None):
+        super(Runner, self).__init__(parent)
+
+        self._worker = worker.Worker(threads=threads, parent=self)
+        self._runs = list()
+
+        self._reported.connect(self._on_reported)
+
+    def submit(self, name, Action, session, label=None):
+        """Run `Action` within `session`, unless it was just now
+
+        Arguments:
+            name (str): Name of action
+            Action (type): Action run
+            session (dict): Session the action is run within
+            label (str, optional): Run for display, defaults to `name`
+
+        Returns:
+            Run: Of this action, or the run of the same action and
+                session still running or triggered within `DEBOUNCE`
+
+        """
+
+        now = time.time()
+        self._runs[:] = [
+            run for run in self._runs
+            if not run.finished or now - run.started < DEBOUNCE
+        ]
+
+        for run in self._runs:
+            if (run.name, run.session) == (name, session) and \
+                    not run.cancelled:
+                return run
+
+        run = Run(name, Action, session, label, self._reported.emit)
+        self._runs.append(run)
+        self.started.emit(run)
+
+        if getattr(Action, "threaded", False):
+            self._worker.submit(
+                lambda: self._process(run),
+                lambda popen: self._on_done(run, popen),
+                lambda error: self._on_failed(run, error)
+            )
+
+        else:
+            try:
+                popen = self._process(run)
+            except Exception:
+                self._on_failed(run, traceback.format_exc())
+            else:
+                self._on_done(run, popen)
+
+        return run
+
+    def runs(self):
+        """Return actions still running, oldest first"""
+        return [run for run in self._runs if not run.finished]
+
+    def cancel(self, name=None):
+        """Cancel every run of action `name`, or of every action"""
+        for run in self.runs():
+            if name is None or run.name == name:
+                run.cancel()
+
+                if run.status == PENDING:
+                    # Never started, and never finishing
+                    self._on_done(run, None)
+
+    def wait(self, msecs=-1):
+        """Block until every action running is done, for tests and exit"""
+        return self._worker.wait(msecs)
+
+    def _process(self, run):
+        """Process `run` in the calling thread"""
+        if run.cancelled:
+            return None
+
+        run.status = RUNNING
+        _local.run = run
+
+        try:
+            with tracing.span("process", action=run.name):
+                return run.Action().process(dict(run.session))
+        finally:
+            _local.run = None
+
+    def _on_reported(self, run, value, message):
+        run.value = value
+        run.message = message
+        self.progressed.emit(run)
+
+    def _on_done(self, run, popen):
+        if popen is not None and hasattr(popen, "poll"):
+            run.popen = popen
+
+            if run.cancelled and popen.poll() is None:
+                try:
+                    popen.terminate()
+                except OSError:
+                    # Exited since
+                    pass
+
+        if run.finished:
+            # Cancelled before it started, and started regardless
+            return
+
+        run.status = CANCELLED if run.cancelled else DONE
+        self.finished.emit(run)
+
+    def _on_failed(self, run, error):
+        if run.finished:
+            return
+
+        run.error = error
+        run.status = FAILED
+        self.finished.emit(run)
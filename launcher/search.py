@@ -0,0 +1,295 @@
+"""Search the hierarchy by approximate name, as it is typed
+
+Projects, silos, assets and tasks are indexed by the trigrams of their
+name and label, along with the first one and two letters of each word.
+Entries are found by the trigrams they share with a query, all of
+them if any entry has all of them, and otherwise at least half of
+them, tolerating a typo or two.
+
+    index = Index()
+    index.add([(("hulk", "assets", "bruce"), {"label": "Bruce Banner"})])
+    index.search("banenr")  # Approximate
+    index.search("bruce anim")  # The anim task of bruce
+
+The last word of a query is matched against the name of an entry,
+and each word before it against the levels above it.
+
+"""
+
+import re
+import heapq
+import threading
+import collections
+
+# Entries per trigram beyond which the trigram is too common to find
+# entries with, give or take a typo, and entries ranked per search.
+COMMON = 1000
+
+_split = re.compile(r"[\W_]+", re.UNICODE).split
+_EMPTY = frozenset()
+
+
+class Index(object):
+    """Entries of the hierarchy, by the trigrams of their names
+
+    Safe to add to from one thread whilst searching from another.
+
+    Example:
+        >>> index = Index()
+        >>> index.add([
+        ...     (("hulk",), {}),
+        ...     (("hulk", "assets"), {}),
+        ...     (("hulk", "assets", "bruce"), {"label": "Bruce Banner"}),
+        ...     (("hulk", "assets", "bruce", "anim"), {}),
+        ... ])
+        >>> [path for path, data in index.search("bruse")]
+        [('hulk', 'assets', 'bruce')]
+        >>> [path for path, data in index.search("bruce anim")]
+        [('hulk', 'assets', 'bruce', 'anim')]
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # Entries by number, along with the text searched
+        self._paths = list()
+        self._data = list()
+        self._texts = list()
+        self._numbers = dict()
+
+        # Numbers of entries, by trigram and by the level above them
+        self._grams = collections.defaultdict(set)
+        self._children = collections.defaultdict(set)
+
+        # Numbers of the levels above each entry
+        self._ancestors = list()
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, path):
+        return tuple(path) in self._numbers
+
+    def get(self, path, default=None):
+        """Return data of entry `path`, or `default` if not added"""
+        with self._lock:
+            number = self._numbers.get(tuple(path))
+            return default if number is None else self._data[number]
+
+    def add(self, entries):
+        """Add `entries`, replacing the data of those already added
+
+        Arguments:
+            entries (iterable): Pairs of path, such as
+                ("hulk", "assets", "bruce"), and a dictionary of data
+                returned along with it, of which "label" is searched too.
+                Levels are expected to be added before those below them.
+
+        """
+
+        for path, data in entries:
+            path = tuple(path)
+            text = " ".join((path[-1], data.get("label") or "")).lower()
+
+            with self._lock:
+                number = self._numbers.get(path)
+
+                if number is not None:
+                    self._data[number] = data
+
+                    if self._texts[number] == text:
+                        continue
+
+                    for gram in _grams(self._texts[number]):
+                        self._grams[gram].discard(number)
+
+                    self._texts[number] = text
+
+                else:
+                    number = len(self._paths)
+                    self._numbers[path] = number
+                    self._children[path[:-1]].add(number)
+                    self._paths.append(path)
+                    self._data.append(data)
+                    self._texts.append(text)
+                    self._ancestors.append(frozenset(
+                        self._numbers.get(path[:depth])
+                        for depth in range(1, len(path))
+                    ))
+
+                for gram in _grams(text):
+                    self._grams[gram].add(number)
+
+    def search(self, query, limit=20):
+        """Return entries best matching `query`, best first
+
+        Arguments:
+            query (str): Words, the last of which is matched against
+                names, and those before it against the levels above
+            limit (int, optional): Maximum number of entries returned
+
+        Returns:
+            list: Pairs of path and data, as added
+
+        """
+
+        words = [word for word in _split(query.lower()) if word]
+
+        if not words:
+            return []
+
+        word = words[-1]
+
+        with self._lock:
+            numbers, shared = self._match(word)
+
+            numbers = self._within(
+                numbers, [self._match(parent)[0] for parent in words[:-1]]
+            )
+
+            # Too many to rank, such as on the first letter typed. Those
+            # sharing the most trigrams are ranked, and of those sharing
+            # as many, the first added, being levels above the others.
+            if len(numbers) > COMMON:
+                if shared:
+                    numbers = heapq.nsmallest(
+                        COMMON, numbers,
+                        key=lambda number: (-shared[number], number)
+                    )
+                else:
+                    numbers = heapq.nsmallest(COMMON, numbers)
+
+            scored = list()
+            for number in numbers:
+                path = self._paths[number]
+                text = self._texts[number]
+
+                score = shared.get(number, 0) - len(path) - len(text) * 0.01
+                if text.startswith(word):
+                    score += 20
+                elif word in text:
+                    score += 10
+
+                scored.append((score, -number, path, self._data[number]))
+
+        best = heapq.nlargest(limit, scored)
+        return [(path, data) for score, number, path, data in best]
+
+    def _match(self, word):
+        """Return numbers of entries matching `word`, give or take a typo
+
+        Returns:
+            tuple: Numbers of entries, and the number of trigrams each
+                shares with `word`, if not all of them
+
+        """
+
+        grams = _grams(word)
+        postings = sorted(
+            (self._grams.get(gram, _EMPTY) for gram in grams),
+            key=len
+        )
+
+        # Every trigram, such as when typing the start of a name
+        numbers = postings[0].intersection(*postings[1:])
+
+        if numbers:
+            return numbers, {}
+
+        # Most trigrams, found through rare trigrams
+        rare = [posting for posting in postings if len(posting) <= COMMON]
+        common = postings[len(rare):]
+
+        counts = collections.Counter()
+        for posting in rare:
+            counts.update(posting)
+
+        candidates = set(counts)
+
+        if not candidates and common:
+            # Any, such as when misspelling a common word
+            candidates = set(heapq.nsmallest(COMMON, common[0]))
+
+        for posting in common:
+            counts.update(candidates & posting)
+
+        # Entries sharing fewer than half the trigrams are unrelated
+        threshold = max(1, len(grams) // 2)
+
+        counts = dict(
+            (number, count) for number, count in counts.items()
+            if count >= threshold
+        )
+
+        return set(counts), counts
+
+    def _within(self, numbers, parents):
+        """Return those of `numbers` below an entry of each of `parents`
+
+        Arguments:
+            numbers (set): Numbers of entries
+            parents (list): Sets of numbers of entries, one per level
+
+        """
+
+        # From the top down, whilst there are not many more entries
+        # below a level than there are `numbers`, narrowing them down
+        # for those with more below them.
+        pending = sorted(parents, key=len)
+
+        while pending:
+            for parent in pending:
+                below = self._below(parent, min(len(numbers), COMMON))
+
+                if below is not None:
+                    numbers = numbers & below
+                    pending.remove(parent)
+                    break
+            else:
+                break
+
+        # From the bottom up
+        ancestors = self._ancestors
+
+        for parent in pending:
+            numbers = set(
+                number for number in numbers
+                if not parent.isdisjoint(ancestors[number])
+            )
+
+        return numbers
+
+    def _below(self, numbers, limit):
+        """Return entries below `numbers`, or None if more than `limit`"""
+        below = set()
+        level = numbers
+
+        while level:
+            level = _EMPTY.union(*(
+                self._children.get(self._paths[number], _EMPTY)
+                for number in level
+            ))
+            below.update(level)
+
+            if len(below) > limit:
+                return None
+
+        return below
+
+
+def _grams(text):
+    """Return trigrams of each word of `text`, and their first letters"""
+    grams = set()
+
+    for word in _split(text):
+        if not word:
+            continue
+
+        grams.add("^" + word[:1])
+        grams.add("^" + word[:2])
+
+        for index in range(len(word) - 2):
+            grams.add(word[index:index + 3])
+
+    return grams
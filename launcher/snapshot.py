@@ -0,0 +1,186 @@
+"""Snapshot of the hierarchy last seen, kept on disk between sessions
+
+Levels of the hierarchy are shown from the snapshot whilst the
+database is being connected to and queried, such that the launcher
+is usable the moment it starts.
+
+Example:
+    >>> snapshot = Snapshot(":memory:")
+    >>> snapshot.put(("projects",), [{"name": "hulk"}])
+    >>> snapshot.get(("projects",))
+    [{'name': 'hulk'}]
+    >>> snapshot.get(("project", "hulk")) is None
+    True
+    >>> snapshot.flush()
+
+"""
+
+import os
+import sys
+import time
+import pickle
+import hashlib
+import sqlite3
+import threading
+
+# Incremented whenever the layout of the snapshot changes,
+# discarding snapshots of any other version on open.
+VERSION = 1
+
+# Seconds until a level not seen since is discarded
+MAX_AGE = 30 * 24 * 3600
+
+
+def default_path(mongo=None, database=None):
+    """Return the path of the snapshot of the current user, per database
+
+    Snapshots are kept per database, such that the hierarchy of one is
+    never shown as last seen of another, in the local cache directory
+    of the user, as home directories are often on network drives on
+    which SQLite locking is unreliable.
+
+    Arguments:
+        mongo (str, optional): Address of the database, defaults to
+            AVALON_MONGO
+        database (str, optional): Name of the database, defaults to
+            AVALON_DB
+
+    Example:
+        >>> default_path("mongodb://a", "avalon") != \\
+        ...     default_path("mongodb://b", "avalon")
+        True
+
+    """
+
+    if mongo is None:
+        mongo = os.getenv("AVALON_MONGO", "")
+
+    if database is None:
+        database = os.getenv("AVALON_DB", "")
+
+    identity = hashlib.sha1(
+        ("%s/%s" % (mongo, database)).encode("utf-8")
+    ).hexdigest()[:12]
+
+    return os.path.join(cache_dir(), "avalon", "launcher-%s.db" % identity)
+
+
+def cache_dir():
+    """Return the directory of local, disposable files of the current user
+
+    That is LOCALAPPDATA on Windows, ~/Library/Caches on macOS and
+    XDG_CACHE_HOME, defaulting to ~/.cache, elsewhere.
+
+    """
+
+    home = os.path.expanduser("~")
+
+    if sys.platform == "win32":
+        return os.getenv("LOCALAPPDATA") or home
+
+    if sys.platform == "darwin":
+        return os.path.join(home, "Library", "Caches")
+
+    return os.getenv("XDG_CACHE_HOME") or os.path.join(home, ".cache")
+
+
+class Snapshot(object):
+    """Results of queries, stored by key in a SQLite database
+
+    Results are pickled, and must not be read from a snapshot
+    written by anyone but the current user.
+
+    Results are written together on `flush`, rather than one at a time
+    as they are stored, such as by queries running in the background.
+
+    Safe to use from multiple threads, and by multiple launchers
+    at once; the last one to flush a result wins.
+
+    Arguments:
+        path (str): Path to the database, created if missing, or
+            ":memory:" for a snapshot not kept on disk
+        max_age (float, optional): Seconds until a result not stored
+            since is discarded
+
+    """
+
+    def __init__(self, path, max_age=MAX_AGE):
+        if path != ":memory:":
+            dirname = os.path.dirname(path)
+            if dirname and not os.path.isdir(dirname):
+                os.makedirs(dirname)
+
+        self.path = path
+        self._lock = threading.Lock()
+
+        # Pickled results stored since the last flush, by key
+        self._pending = dict()
+        self._connection = sqlite3.connect(path,
+                                           timeout=5,
+                                           check_same_thread=False)
+
+        with self._lock, self._connection as connection:
+            version, = connection.execute("PRAGMA user_version").fetchone()
+
+            if version != VERSION:
+                connection.execute("DROP TABLE IF EXISTS results")
+                connection.execute("PRAGMA user_version = %d" % VERSION)
+
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, "
+                "time REAL, "
+                "result BLOB)"
+            )
+
+            connection.execute("DELETE FROM results WHERE time < ?",
+                               (time.time() - max_age,))
+
+    def get(self, key, default=None):
+        """Return result of `key`, or `default` if missing"""
+        with self._lock:
+            try:
+                row = self._pending[repr(key)][1:]
+            except KeyError:
+                row = self._connection.execute(
+                    "SELECT result FROM results WHERE key = ?", (repr(key),)
+                ).fetchone()
+
+        if row is None:
+            return default
+
+        try:
+            return pickle.loads(bytes(row[0]))
+
+        except Exception:
+            # Written by an incompatible version of a dependency
+            return default
+
+    def put(self, key, result):
+        """Store `result` of `key` until the next `flush`"""
+        blob = sqlite3.Binary(pickle.dumps(result, 2))
+
+        with self._lock:
+            self._pending[repr(key)] = (time.time(), blob)
+
+    def flush(self):
+        """Write results stored since the last flush, at once"""
+        with self._lock:
+            if not self._pending:
+                return
+
+            with self._connection as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                    [(key, stamp, blob) for key, (stamp, blob)
+                     in self._pending.items()]
+                )
+
+            self._pending.clear()
+
+    def close(self):
+        """Flush, and close the database"""
+        self.flush()
+
+        with self._lock:
+            self._connection.close()
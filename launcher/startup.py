@@ -0,0 +1,193 @@
+"""Start the launcher in stages, without waiting on any one of them
+
+The window is shown first, after which the database is connected to,
+actions are registered and projects are listed, each in the
+background. Stages neither wait on each other nor on the window, such
+that one failing or being slow leaves the rest unaffected.
+
+    pipeline = Pipeline()
+    pipeline.add("database", io.install, label="Connecting to database")
+    pipeline.add("interface")  # Completed when the window is shown
+    pipeline.start()
+
+    ...
+    pipeline.complete("interface")
+
+"""
+
+import traceback
+
+from PyQt5 import QtCore
+
+from . import worker, terminal, tracing
+
+Signal = QtCore.pyqtSignal
+Property = QtCore.pyqtProperty
+
+# Seconds after which a stage is reported as slow
+PATIENCE = 3.0
+
+# Status of each stage
+PENDING = "pending"
+RUNNING = "running"
+SLOW = "slow"
+DONE = "done"
+FAILED = "failed"
+
+
+class Stage(object):
+    """A step of starting up, and how it went"""
+
+    def __init__(self, name, func=None, callback=None, label=None):
+        self.name = name
+        self.func = func
+        self.callback = callback
+        self.label = label or name
+        self.status = PENDING
+        self.started = None
+        self.duration = None
+
+
+class Pipeline(QtCore.QObject):
+    """Stages of starting up, run simultaneously in the background
+
+    Stages with a function are run in a thread of their own, and
+    `callback` called with its result from the thread of the pipeline.
+    Stages without are completed by whoever knows they are done,
+    through `complete`.
+
+    Arguments:
+        patience (float, optional): Seconds after which a running
+            stage is reported as slow
+        parent (QObject, optional): Parent of pipeline
+
+    """
+
+    # A stage started, finished or is taking its time
+    #
+    # Arguments:
+    #   name (str): Name of stage
+    #   status (str): New status of stage
+    #
+    progressed = Signal(str, str)
+
+    # Every stage has finished, whether or not successfully
+    finished = Signal()
+
+    def __init__(self, patience=PATIENCE, parent=None):
+        super(Pipeline, self).__init__(parent)
+
+        self.stages = list()
+
+        self._patience = patience
+        self._started = None
+        self._worker = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(250)
+        self._timer.timeout.connect(self._on_tick)
+
+    def add(self, name, func=None, callback=None, label=None):
+        """Add a stage, run on `start`
+
+        Arguments:
+            name (str): Name of stage, unique to this pipeline
+            func (callable, optional): Called without arguments in the
+                background, otherwise the stage runs until `complete`
+            callback (callable, optional): Called with the return value
+                of `func`, once done
+            label (str, optional): Shown whilst the stage is running
+
+        """
+
+        self.stages.append(Stage(name, func, callback, label))
+
+    def start(self):
+        """Run every stage, from now"""
+        self._started = tracing.clock()
+        self._worker = worker.Worker(
+            threads=max(1, len([s for s in self.stages if s.func])),
+            parent=self
+        )
+
+        for stage in self.stages:
+            stage.started = self._started
+            self._set_status(stage, RUNNING)
+
+            if stage.func is None:
+                continue
+
+            self._worker.submit(
+                stage.func,
+                lambda result, stage=stage: self._on_done(stage, result),
+                lambda message, stage=stage: self._on_failed(stage, message)
+            )
+
+        self._timer.start()
+
+    def complete(self, name, ok=True):
+        """Mark stage `name` as done, or as failed unless `ok`
+
+        Stages are completed once, after which this does nothing.
+
+        """
+
+        for stage in self.stages:
+            if stage.name == name and stage.status in (RUNNING, SLOW):
+                if ok:
+                    self._on_done(stage, None)
+                else:
+                    self._on_failed(stage)
+
+    @Property(bool, notify=progressed)
+    def done(self):
+        return all(stage.status in (DONE, FAILED) for stage in self.stages)
+
+    @Property(str, notify=progressed)
+    def message(self):
+        """Labels of stages still running, for display"""
+        labels = list()
+
+        for stage in self.stages:
+            if stage.status == RUNNING:
+                labels.append(stage.label)
+            elif stage.status == SLOW:
+                labels.append(stage.label + " (slow)")
+
+        return ", ".join(labels)
+
+    def _on_done(self, stage, result):
+        stage.duration = tracing.clock() - stage.started
+        tracing.complete("stage", stage.started, stage=stage.name)
+
+        try:
+            if stage.callback is not None:
+                stage.callback(result)
+        except Exception:
+            return self._on_failed(stage, traceback.format_exc())
+
+        self._set_status(stage, DONE)
+
+    def _on_failed(self, stage, message=None):
+        stage.duration = tracing.clock() - stage.started
+        self._set_status(stage, FAILED)
+
+        if message is not None:
+            terminal.log("%s failed:\n%s" % (stage.label, message.rstrip()),
+                         terminal.ERROR)
+
+    def _on_tick(self):
+        for stage in self.stages:
+            if stage.status != RUNNING:
+                continue
+
+            if tracing.clock() - stage.started > self._patience:
+                self._set_status(stage, SLOW)
+
+    def _set_status(self, stage, status):
+        stage.status = status
+        self.progressed.emit(stage.name, status)
+
+        if self.done:
+            self._timer.stop()
+            self.finished.emit()
@@ -1,6 +1,7 @@
+import os
 import sys
 
-from .model import Model
+from PyQt5 import QtCore
 
 self = sys.modules[__name__]
 self.model = None
@@ -10,9 +11,120 @@ INFO = 1 << 1
 WARNING = 1 << 2
 ERROR = 1 << 3
 
+# Maximum number of lines kept, beyond which the oldest are discarded
+CAPACITY = 10000
 
-def init():
-    self.model = Model([], roles=["line", "level"])
+# Milliseconds between each batch of lines added to the view
+INTERVAL = 50
+
+
+class Buffer(QtCore.QAbstractListModel):
+    """Most recent lines logged, of which the oldest are discarded
+
+    Lines are added to the model in batches, once per `interval`,
+    rather than once per line, such that a process printing many
+    lines at a time doesn't bring the view to a crawl.
+
+    Arguments:
+        capacity (int, optional): Maximum number of lines kept, 0 keeping
+            none at all
+        interval (int, optional): Milliseconds between batches
+        parent (QObject, optional): Parent of buffer
+
+    """
+
+    def __init__(self, capacity=CAPACITY, interval=INTERVAL, parent=None):
+        super(Buffer, self).__init__(parent)
+
+        self._capacity = capacity
+
+        # Lines are stored in a ring, the first being at `_start`
+        self._rows = [None] * capacity
+        self._start = 0
+        self._count = 0
+
+        # Lines not yet added, of which only the last `capacity`
+        # could ever be visible.
+        self._pending = list()
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+
+        self._roles = {
+            QtCore.Qt.UserRole + 0: b"line",
+            QtCore.Qt.UserRole + 1: b"level",
+        }
+
+    def append(self, item):
+        """Add `item` with the next batch"""
+        if self._capacity <= 0:
+            return
+
+        self._pending.append(item)
+
+        if len(self._pending) > 2 * self._capacity:
+            del self._pending[:-self._capacity]
+
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Add pending items, discarding the oldest beyond capacity"""
+        self._timer.stop()
+
+        pending = self._pending[-self._capacity:]
+        self._pending[:] = []
+
+        if not pending:
+            return
+
+        overflow = min(self._count + len(pending) - self._capacity,
+                       self._count)
+
+        if overflow > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, overflow - 1)
+
+            for row in range(overflow):
+                self._rows[(self._start + row) % self._capacity] = None
+
+            self._start = (self._start + overflow) % self._capacity
+            self._count -= overflow
+            self.endRemoveRows()
+
+        self.beginInsertRows(QtCore.QModelIndex(),
+                             self._count,
+                             self._count + len(pending) - 1)
+
+        for item in pending:
+            self._rows[(self._start + self._count) % self._capacity] = item
+            self._count += 1
+
+        self.endInsertRows()
+
+    def rowCount(self, parent=None):
+        return self._count
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        try:
+            key = self._roles[role].decode("utf-8")
+        except KeyError:
+            return None
+
+        item = self._rows[(self._start + index.row()) % self._capacity]
+        return item[key]
+
+    def roleNames(self):
+        return self._roles
+
+
+def init(capacity=None):
+    if capacity is None:
+        capacity = int(os.getenv("AVALON_LAUNCHER_TERMINAL_LINES",
+                                 str(CAPACITY)))
+
+    self.model = Buffer(capacity)
 
 
 def log(line, level=INFO):
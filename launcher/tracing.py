@@ -0,0 +1,315 @@
+"""Timings of the launcher, viewable in chrome://tracing
+
+Spans are recorded into memory whilst enabled, and exported as
+Chrome trace events. Disabled, which is the default, spans cost next
+to nothing.
+
+Example:
+    >>> enable()
+    >>> with span("push", level=1):
+    ...     pass
+    >>> [event["name"] for event in events()]
+    ['push']
+    >>> disable()
+
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import contextlib
+import collections
+import functools
+
+self = sys.modules[__name__]
+self._enabled = False
+self._profiler = None
+
+# Maximum number of events kept, beyond which the oldest are discarded
+CAPACITY = 100000
+
+self._events = collections.deque(maxlen=CAPACITY)
+
+# Monotonic, where available
+clock = getattr(time, "perf_counter", time.time)
+
+
+def enable():
+    """Start recording spans"""
+    self._events.clear()
+    self._enabled = True
+
+
+def disable():
+    """Stop recording spans"""
+    self._enabled = False
+
+
+def enabled():
+    return self._enabled
+
+
+def complete(name, start, end=None, **args):
+    """Record span `name` from `start` until `end`, or now
+
+    Arguments:
+        name (str): Name of span
+        start (float): Time span started, from `clock`
+        end (float, optional): Time span ended, from `clock`
+        **args: Shown alongside the span
+
+    """
+
+    if not self._enabled:
+        return
+
+    if end is None:
+        end = clock()
+
+    self._events.append({
+        "name": name,
+        "ph": "X",
+        "ts": start * 1e6,
+        "dur": (end - start) * 1e6,
+        "pid": os.getpid(),
+        "tid": threading.current_thread().ident,
+        "args": args,
+    })
+
+
+def instant(name, **args):
+    """Record a moment in time, such as a process printing"""
+    if not self._enabled:
+        return
+
+    self._events.append({
+        "name": name,
+        "ph": "i",
+        "s": "p",
+        "ts": clock() * 1e6,
+        "pid": os.getpid(),
+        "tid": threading.current_thread().ident,
+        "args": args,
+    })
+
+
+@contextlib.contextmanager
+def span(name, **args):
+    """Record the time taken by the enclosed block as `name`"""
+    if not self._enabled:
+        yield
+        return
+
+    start = clock()
+
+    try:
+        yield
+    finally:
+        complete(name, start, **args)
+
+
+def traced(func):
+    """Record the time taken by each call to `func`"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def profile_imports():
+    """Start timing every module imported, until `report_imports`"""
+    if self._profiler is None:
+        self._profiler = ImportProfiler()
+        self._profiler.install()
+
+
+def report_imports():
+    """Stop timing imports, and return time taken by each, as text"""
+    profiler, self._profiler = self._profiler, None
+
+    if profiler is None:
+        return ""
+
+    profiler.uninstall()
+    return profiler.report()
+
+
+def events():
+    """Return events recorded, oldest first"""
+    return list(self._events)
+
+
+def export(path):
+    """Write recorded events to `path`, in the Chrome trace format"""
+    with open(path, "w") as f:
+        json.dump({
+            "traceEvents": events(),
+            "displayTimeUnit": "ms",
+        }, f, default=str)
+
+
+class ImportProfiler(object):
+    """Time taken by each module imported, like `python -X importtime`
+
+    Installed first amongst the finders of `sys.meta_path`, timing the
+    execution of every module found by the finders after it. Modules
+    are recorded as spans too, whilst tracing is enabled.
+
+    Loaders of modules found are replaced by copies of a subclass of
+    their own, such that they remain instances of their class, and
+    only the creation and execution of their module is timed.
+
+    Requires Python 3.4 and above.
+
+    Example:
+        >>> profiler = ImportProfiler()
+        >>> profiler.install()
+        >>> import launcher.vendor
+        >>> profiler.uninstall()
+        >>> [name for depth, name, own, total in profiler.imports]
+        ['launcher.vendor']
+
+    """
+
+    def __init__(self):
+        # (depth, name, self, cumulative), in order of completion
+        self.imports = list()
+
+        # Time spent in imports made by each module being imported,
+        # per thread, as modules may be imported from many at once.
+        self._local = threading.local()
+
+        # Timed subclasses, by class of loader
+        self._loaders = dict()
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+
+            find = getattr(finder, "find_spec", None)
+
+            if find is None:
+                # Left to the import system, in order
+                return None
+
+            spec = find(name, path, target)
+
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+
+        if not hasattr(loader, "exec_module") or \
+                not hasattr(loader, "__dict__") or \
+                isinstance(loader, type):
+            # Left untimed, such as built-in modules
+            return spec
+
+        try:
+            timed = object.__new__(self._timed(type(loader)))
+        except TypeError:
+            # Loaders implemented in C
+            return spec
+
+        timed.__dict__.update(loader.__dict__)
+        timed._timing = (self, (0.0, 0.0))
+        spec.loader = timed
+
+        return spec
+
+    def _timed(self, cls):
+        """Return subclass of loader `cls` timing modules it loads"""
+        try:
+            return self._loaders[cls]
+        except KeyError:
+            pass
+
+        class Timed(cls):
+            def create_module(self, spec):
+                create = getattr(super(Timed, self), "create_module", None)
+
+                if create is None:
+                    return None
+
+                profiler, created = self._timing
+                module, duration, children = profiler._create(create, spec)
+                self._timing = (profiler, (duration, children))
+                return module
+
+            def exec_module(self, module):
+                profiler, created = self._timing
+                profiler._exec(super(Timed, self).exec_module,
+                               module,
+                               created)
+
+        Timed.__name__ = cls.__name__
+        self._loaders[cls] = Timed
+        return Timed
+
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = [0.0]
+            return self._local.stack
+
+    def _create(self, create, spec):
+        """Create module of `spec`, returning it along with time taken
+
+        Extension modules do their work on creation, and may import
+        other modules whilst doing so.
+
+        """
+
+        stack = self._stack()
+        start = clock()
+        stack.append(0.0)
+
+        try:
+            return create(spec), clock() - start, stack[-1]
+        finally:
+            stack.pop()
+
+    def _exec(self, execute, module, created=(0.0, 0.0)):
+        stack = self._stack()
+        start = clock()
+        stack.append(created[1])
+
+        try:
+            execute(module)
+        finally:
+            end = clock()
+            children = stack.pop()
+
+            total = end - start + created[0]
+            stack[-1] += total
+
+            self.imports.append((len(stack) - 1,
+                                 module.__name__,
+                                 total - children,
+                                 total))
+
+            complete("import " + module.__name__, start - created[0], end)
+
+    def report(self):
+        """Return imports as text, like `python -X importtime`"""
+        lines = ["import time: self [us] | cumulative | imported package"]
+
+        for depth, name, own, total in self.imports:
+            lines.append("import time: %9d | %10d | %s%s" % (
+                own * 1e6, total * 1e6, "  " * depth, name))
+
+        return "\n".join(lines)
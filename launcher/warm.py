@@ -0,0 +1,261 @@
+"""Python interpreters started ahead of time, for running tools
+
+Tools such as the Loader are run as a module of a new interpreter,
+which first has to start and import Qt and Avalon. A pool keeps a few
+interpreters with these already imported, idle until handed a module
+to run, and replaces each once handed out.
+
+    pool = Pool(size=2)
+    pool.start()
+
+    # Some time later, run like `python -u -m avalon.tools.loader hulk`
+    popen = pool.run("avalon.tools.loader", ["hulk"])
+
+Idle interpreters connect to the pool through a local socket, and
+wait for the module to run along with its arguments and environment.
+Modules imported ahead of time are left as they were imported, which
+means they must not depend on the environment at the time of import.
+
+Usage, for each interpreter:
+    $ python -u -m launcher.warm <port> [<module> ...]
+
+"""
+
+import os
+import sys
+import json
+import runpy
+import socket
+import binascii
+import threading
+import importlib
+
+self = sys.modules[__name__]
+self._pool = None
+
+# Imported ahead of time by each interpreter
+IMPORTS = [
+    "PyQt5.QtWidgets",
+    "avalon.api",
+    "avalon.io",
+    "avalon.tools.loader",
+    "avalon.tools.projectmanager",
+]
+
+# Shared secret, proving an interpreter was started by the pool
+TOKEN = "AVALON_LAUNCHER_WARM_TOKEN"
+
+
+class Pool(object):
+    """Interpreters ready to run a module, kept at `size`
+
+    Arguments:
+        size (int, optional): Number of idle interpreters kept
+        executable (str, optional): Python executable to start
+        imports (list, optional): Modules imported ahead of time
+        launch (callable, optional): Start `executable` with `args`,
+            returning its Popen, defaults to `avalon.lib.launch`
+
+    """
+
+    def __init__(self, size=2, executable="python", imports=None,
+                 launch=None):
+        if launch is None:
+            from avalon import lib
+            launch = lib.launch
+
+        self._size = size
+        self._executable = executable
+        self._imports = IMPORTS if imports is None else imports
+        self._launch = launch
+        self._token = binascii.hexlify(os.urandom(16)).decode("ascii")
+
+        # Started interpreters, and those connected by pid
+        self._popens = list()
+        self._ready = dict()
+
+        # Actions are run from threads of their own, see `launcher.runner`
+        self._lock = threading.Lock()
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(("127.0.0.1", 0))
+        self._server.listen(16)
+        self._server.setblocking(False)
+
+    def start(self):
+        """Start interpreters, until `size` are running"""
+        self._popens[:] = [p for p in self._popens if p.poll() is None]
+
+        for pid in list(self._ready):
+            if pid not in [popen.pid for popen in self._popens]:
+                self._ready.pop(pid).close()
+
+        environment = dict(os.environ, **{TOKEN: self._token})
+        port = str(self._server.getsockname()[1])
+
+        while len(self._popens) < self._size:
+            self._popens.append(self._launch(
+                executable=self._executable,
+                args=["-u", "-m", __name__, port] + self._imports,
+                environment=environment
+            ))
+
+    def ready(self):
+        """Return number of interpreters ready to run a module"""
+        with self._lock:
+            self._accept()
+            return len(self._ready)
+
+    def run(self, module, args, environment=None):
+        """Run `module` on an idle interpreter, as `python -u -m module`
+
+        Arguments:
+            module (str): Name of module, run as __main__
+            args (list): Arguments passed to `module`
+            environment (dict, optional): Environment of `module`,
+                defaults to the current environment
+
+        Returns:
+            subprocess.Popen: Interpreter running `module`, or None
+                if no interpreter is ready yet
+
+        """
+
+        with self._lock:
+            return self._run(module, args, environment)
+
+    def _run(self, module, args, environment):
+        self._accept()
+
+        job = json.dumps({
+            "module": module,
+            "args": list(args),
+            "environment": dict(environment or os.environ),
+        }) + "\n"
+
+        for popen in self._popens[:]:
+            connection = self._ready.pop(popen.pid, None)
+
+            if connection is None or popen.poll() is not None:
+                continue
+
+            try:
+                connection.sendall(job.encode("utf-8"))
+            except socket.error:
+                continue
+            finally:
+                connection.close()
+
+            self._popens.remove(popen)
+            self.start()
+
+            return popen
+
+        # Replace interpreters that exited before becoming ready
+        self.start()
+
+    def close(self):
+        """Stop idle interpreters"""
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        for connection in self._ready.values():
+            connection.close()
+
+        for popen in self._popens:
+            if popen.poll() is None:
+                popen.kill()
+
+        self._ready.clear()
+        self._popens[:] = []
+        self._server.close()
+
+    def _accept(self):
+        """Take note of interpreters ready since last time"""
+        while True:
+            try:
+                connection, address = self._server.accept()
+            except socket.error:
+                # None waiting
+                return
+
+            connection.setblocking(True)
+            connection.settimeout(1.0)
+
+            try:
+                hello = connection.makefile("rb").readline()
+                token, pid = hello.decode("utf-8").split()
+                pid = int(pid)
+            except (socket.error, ValueError):
+                connection.close()
+                continue
+
+            if token != self._token:
+                connection.close()
+                continue
+
+            connection.settimeout(None)
+            self._ready[pid] = connection
+
+
+def install(size=None):
+    """Start the pool used by `run`, of `size` or AVALON_LAUNCHER_WARM"""
+    if size is None:
+        size = int(os.getenv("AVALON_LAUNCHER_WARM", "0"))
+
+    if size <= 0 or self._pool is not None:
+        return
+
+    self._pool = Pool(size)
+    self._pool.start()
+
+
+def run(module, args, environment=None):
+    """Run `module` on an idle interpreter, if installed and ready
+
+    Returns:
+        subprocess.Popen: Interpreter running `module`, or None
+
+    """
+
+    if self._pool is None:
+        return None
+
+    return self._pool.run(module, args, environment)
+
+
+def _main(port, imports):
+    """Wait for a module to run, with `imports` already imported"""
+    token = os.environ.pop(TOKEN)
+
+    for name in imports:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # Imported again by the module run, if needed at all
+            pass
+
+    connection = socket.create_connection(("127.0.0.1", port))
+    connection.sendall(("%s %d\n" % (token, os.getpid())).encode("utf-8"))
+
+    line = connection.makefile("rb").readline()
+    connection.close()
+
+    if not line:
+        # The pool was closed
+        return 0
+
+    job = json.loads(line.decode("utf-8"))
+
+    os.environ.clear()
+    os.environ.update(job["environment"])
+    sys.argv[:] = [job["module"]] + job["args"]
+
+    runpy.run_module(job["module"], run_name="__main__", alter_sys=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(int(sys.argv[1]), sys.argv[2:]))
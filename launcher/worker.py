@@ -0,0 +1,146 @@
+"""Run blocking work, such as queries, off of the GUI thread
+
+Results are delivered back to the GUI thread through Qt signals.
+
+    worker = Worker()
+    task = worker.submit(lambda: io.find_one({"type": "project"}),
+                         callback=on_project)
+
+    # Navigated elsewhere, `on_project` is never called
+    task.cancel()
+
+"""
+
+import sys
+import traceback
+
+from PyQt5 import QtCore
+
+Signal = QtCore.pyqtSignal
+
+
+class Task(QtCore.QObject):
+    """Work submitted to a Worker
+
+    The callbacks are called from the thread the task was created in,
+    and only if the task hasn't been cancelled by then.
+
+    """
+
+    # Emitted from the worker thread, received in the owning thread
+    _finished = Signal(object)
+    _failed = Signal(str)
+
+    def __init__(self, func, callback=None, error=None, parent=None):
+        super(Task, self).__init__(parent)
+
+        self.func = func
+        self.cancelled = False
+        self.done = False
+
+        self._callback = callback
+        self._error = error
+
+        self._finished.connect(self._on_finished)
+        self._failed.connect(self._on_failed)
+
+    def cancel(self):
+        """Discard the result of this task, if not already delivered
+
+        Work already running is left to finish, but its result is
+        never delivered.
+
+        """
+
+        self.cancelled = True
+
+    def run(self):
+        """Perform the work, called from the worker thread"""
+        if self.cancelled:
+            return
+
+        try:
+            result = self.func()
+        except Exception:
+            self._failed.emit(traceback.format_exc())
+        else:
+            self._finished.emit(result)
+
+    def _on_finished(self, result):
+        self.done = True
+
+        if not self.cancelled and self._callback is not None:
+            self._callback(result)
+
+    def _on_failed(self, message):
+        self.done = True
+
+        if self.cancelled:
+            return
+
+        if self._error is not None:
+            self._error(message)
+        else:
+            sys.stderr.write(message)
+
+
+class _Runnable(QtCore.QRunnable):
+    def __init__(self, task):
+        super(_Runnable, self).__init__()
+        self.task = task
+
+    def run(self):
+        self.task.run()
+
+
+class Worker(QtCore.QObject):
+    """Pool of threads running tasks in the background
+
+    Arguments:
+        threads (int, optional): Maximum number of simultaneous tasks
+        parent (QObject, optional): Parent of worker
+
+    """
+
+    def __init__(self, threads=2, parent=None):
+        super(Worker, self).__init__(parent)
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(threads)
+        self._tasks = list()
+
+    def submit(self, func, callback=None, error=None):
+        """Call `func` in the background, and `callback` with its result
+
+        Arguments:
+            func (callable): Called without arguments in a worker thread
+            callback (callable, optional): Called with the return value
+                of `func`, in the thread of the caller
+            error (callable, optional): Called with the formatted traceback
+                of an exception raised by `func`, in the thread of the caller
+
+        Returns:
+            Task: The submitted task, which may be cancelled
+
+        """
+
+        task = Task(func, callback, error)
+
+        # Forget about tasks once delivered
+        self._tasks[:] = [t for t in self._tasks if not t.done]
+        self._tasks.append(task)
+
+        self._pool.start(_Runnable(task))
+
+        return task
+
+    def cancel(self):
+        """Cancel every task not yet delivered"""
+        for task in self._tasks:
+            task.cancel()
+
+        self._tasks[:] = []
+
+    def wait(self, msecs=-1):
+        """Block until every running task is done, for tests and exit"""
+        return self._pool.waitForDone(msecs)
@@ -3,15 +3,25 @@ import sys
 import shutil
 import tempfile
 
-from launcher import schema
-from launcher.vendor import yaml
+from avalon import schema
+from avalon.vendor import toml
 
 self = sys.modules[__name__]
 
 
 def setup():
+    from PyQt5 import QtCore
+
+    # Models, such as of processes, start timers of their own
+    self.app = QtCore.QCoreApplication.instance() or \
+        QtCore.QCoreApplication([])
+
     self.root = tempfile.mkdtemp()
 
+    # Never the snapshot of the user
+    os.environ["AVALON_LAUNCHER_SNAPSHOT"] = os.path.join(self.root,
+                                                          "launcher.db")
+
     self.config = {
         "schema": "avalon-core:config-1.0",
         "apps": [
@@ -94,8 +104,8 @@ def setup():
         self.root
     ])
 
-    with open(os.path.join(self.root, "python.yml"), "w") as f:
-        yaml.dump({
+    with open(os.path.join(self.root, "python.toml"), "w") as f:
+        toml.dump({
             "executable": "python",
             "application_dir": "python",
             "label": "Python 2.7"
@@ -103,6 +113,7 @@ def setup():
 
 
 def teardown():
+    os.environ.pop("AVALON_LAUNCHER_SNAPSHOT", None)
     shutil.rmtree(self.root)
 
 
@@ -116,3 +127,1323 @@ def test_inventory():
 
 def test_application():
     schema.validate(self.application, "application")
+
+
+def test_frame_sharing():
+    """Pushing a frame leaves its parent untouched"""
+    from launcher import frames
+
+    root = frames.Frame({"config": {"tasks": []}})
+    root["environment"]["project"] = "hulk"
+
+    child = root.child()
+    child["environment"]["silo"] = "assets"
+    del child["environment"]["project"]
+
+    assert child["config"] is root["config"]
+    assert dict(child["environment"]) == {"silo": "assets"}
+    assert dict(root["environment"]) == {"project": "hulk"}
+
+    # Reads follow writes, of the frame and of its parents alike
+    grandchild = child.child()
+    assert dict(grandchild["environment"]) == {"silo": "assets"}
+
+    root["environment"]["fps"] = 25
+    child["environment"]["project"] = "batman"
+    del grandchild["environment"]["silo"]
+    assert dict(grandchild["environment"]) == {"fps": 25,
+                                               "project": "batman"}
+    assert dict(child["environment"]) == {"fps": 25,
+                                          "project": "batman",
+                                          "silo": "assets"}
+
+
+def test_action_index():
+    """Declared compatibility is answered without evaluating actions"""
+    from launcher import compat
+
+    class Action(object):
+        name = None
+        label = None
+        icon = None
+        order = 0
+
+        def is_compatible(self, session):
+            return True
+
+    class Always(Action):
+        name = "always"
+
+    class Task(Action):
+        name = "task"
+        requires = ["AVALON_TASK"]
+
+    class Hulk(Action):
+        name = "hulk"
+        accepts = {"AVALON_PROJECT": ["hulk"]}
+
+    class Custom(Action):
+        name = "custom"
+        requires = ["AVALON_PROJECT"]
+        calls = []
+
+        def is_compatible(self, session):
+            self.calls.append(session)
+            return session["AVALON_PROJECT"] == "batman"
+
+    index = compat.ActionIndex([Task, Custom, Hulk, Always], base=Action)
+
+    def names(session):
+        return [action["name"] for action in index.collect(session)]
+
+    assert names({}) == ["always"]
+    assert not Custom.calls, "Custom actions should be filtered first"
+
+    assert names({"AVALON_PROJECT": "hulk"}) == ["always", "hulk"]
+    assert names({"AVALON_PROJECT": "batman", "AVALON_TASK": "anim"}) == [
+        "always", "custom", "task"
+    ]
+    assert len(Custom.calls) == 2
+
+
+def test_model_diff():
+    """Row-level changes turn one list of keys into another"""
+    from launcher import model
+
+    old = ["a", "b", "c", "d", "e"]
+    new = ["e", "a", "c", "x", "d"]
+
+    rows = list(old)
+    for change, first, last in model.diff(old, new):
+        if change == "remove":
+            del rows[first:last + 1]
+        elif change == "move":
+            rows.insert(last, rows.pop(first))
+        else:
+            rows[first:first] = new[first:last + 1]
+
+    assert rows == new
+
+    assert model.diff(old, old) == []
+    assert model.diff(old, ["x", "y"]) is None, "Unrelated lists are reset"
+
+
+def test_lazy_model():
+    """Lazy levels are fetched a page at a time, in the background"""
+    import time
+    from PyQt5 import QtCore
+    from launcher import model
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    queries = []
+
+    def query(skip, limit):
+        queries.append(skip)
+        return [{"name": str(index)}
+                for index in range(1000)[skip:skip + limit]]
+
+    def disconnected(skip, limit):
+        if skip:
+            raise IOError("Connection lost")
+
+        return query(skip, limit)
+
+    listing = model.Model([], roles=["name"], incremental=True)
+    pages = model.Lazy(query, page=400)
+    listing.push(pages)
+
+    assert listing.rowCount() == 400
+    assert queries == [0]
+
+    start = time.time()
+    while listing.canFetchMore() and time.time() - start < 5:
+        listing.fetchMore()
+
+        # Fetched one page at a time
+        assert not listing.canFetchMore()
+
+        while pages.fetching:
+            app.processEvents()
+
+    assert listing.rowCount() == 1000
+    assert queries == [0, 400, 800]
+
+    # A failed page stops paging, rather than the application
+    errors = []
+    listing.fetchFailed.connect(errors.append)
+    listing.push(model.Lazy(disconnected, page=400))
+    listing.fetchMore()
+
+    start = time.time()
+    while not errors and time.time() - start < 5:
+        app.processEvents()
+
+    assert "Connection lost" in errors[0], errors
+    assert listing.rowCount() == 400
+    assert not listing.canFetchMore()
+    listing.pop()
+
+    listing.push([{"name": "task"}])
+    listing.pop()
+
+    assert listing.rowCount() == 1000
+    assert not listing.canFetchMore()
+
+
+def test_worker_responsive():
+    """Slow queries leave the GUI thread responsive"""
+    import time
+    from PyQt5 import QtCore
+    from launcher import worker
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    class SlowIO(object):
+        """Stand-in for `avalon.io`, with a slow connection"""
+
+        def find_one(self, filter):
+            time.sleep(0.5)
+            return {"type": "project", "name": "hulk"}
+
+    io = SlowIO()
+    results = []
+    ticks = []
+
+    timer = QtCore.QTimer()
+    timer.timeout.connect(lambda: ticks.append(time.time()))
+    timer.start(10)
+
+    pool = worker.Worker()
+    pool.submit(lambda: io.find_one({"type": "project"}), results.append)
+    cancelled = pool.submit(lambda: io.find_one({"type": "project"}),
+                            results.append)
+    cancelled.cancel()
+
+    start = time.time()
+    while len(results) < 1 and time.time() - start < 5:
+        app.processEvents()
+
+    pool.wait()
+    app.processEvents()
+    timer.stop()
+
+    assert results == [{"type": "project", "name": "hulk"}]
+
+    # The event loop kept spinning whilst querying
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    assert len(ticks) > 10 and max(gaps) < 0.25, gaps
+
+
+def test_cache_expiry():
+    """Cached results expire with time and are bounded in number"""
+    from launcher import cache
+
+    now = [0]
+    results = cache.Cache(ttl=10, size=2, clock=lambda: now[0])
+
+    results.put("a", 1)
+    results.put("b", 2)
+    assert results.get("a") == 1
+
+    # "b" is least recently used
+    results.put("c", 3)
+    assert "b" not in results
+    assert "a" in results
+
+    now[0] = 10
+    assert results.get("a") is None
+
+    stats = results.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+
+    # Disabled, such as from configuration
+    disabled = cache.Cache(size=0)
+    assert disabled.fetch("a", lambda: 1) == 1
+    assert "a" not in disabled
+    assert disabled.stats()["size"] == 0
+
+
+def test_prefetch_budget():
+    """Prefetching waits for the user, and stops at its budget"""
+    import time
+    from PyQt5 import QtCore
+    from launcher import cache, prefetch
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    results = cache.Cache()
+    busy = [True]
+    prefetcher = prefetch.Prefetcher(results, budget=2, interval=1,
+                                     busy=lambda: busy[0])
+
+    def request(key):
+        prefetcher.request(key, lambda: results.fetch(key, lambda: key))
+
+    for key in ("a", "b", "c"):
+        request(key)
+
+    def spin(seconds):
+        start = time.time()
+        while time.time() - start < seconds:
+            app.processEvents()
+        prefetcher._worker.wait()
+        app.processEvents()
+
+    spin(0.1)
+    assert len(results) == 0
+
+    busy[0] = False
+    spin(0.1)
+    assert "a" in results and "b" in results
+    assert "c" not in results
+
+    # Navigating elsewhere renews the budget
+    prefetcher.cancel()
+    request("c")
+    spin(0.1)
+    assert "c" in results
+
+
+def test_snapshot_version():
+    """Snapshots of another version are discarded on open"""
+    import sqlite3
+    from launcher import snapshot
+
+    path = os.path.join(tempfile.mkdtemp(), "launcher.db")
+
+    try:
+        snap = snapshot.Snapshot(path)
+        snap.put(("projects",), [{"name": "hulk"}])
+        snap.close()
+
+        assert snapshot.Snapshot(path).get(("projects",)) == [
+            {"name": "hulk"}
+        ]
+
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA user_version = %d"
+                           % (snapshot.VERSION + 1))
+        connection.close()
+
+        assert snapshot.Snapshot(path).get(("projects",)) is None
+
+    finally:
+        shutil.rmtree(os.path.dirname(path))
+
+
+def test_snapshot_flush():
+    """Results are written together, on flush"""
+    from launcher import snapshot
+
+    path = os.path.join(tempfile.mkdtemp(), "launcher.db")
+
+    try:
+        snap = snapshot.Snapshot(path)
+        snap.put(("projects",), [{"name": "hulk"}])
+        snap.put(("project", "hulk"), {"name": "hulk"})
+
+        # Read back before written
+        assert snap.get(("projects",)) == [{"name": "hulk"}]
+        assert snapshot.Snapshot(path).get(("projects",)) is None
+
+        snap.flush()
+        other = snapshot.Snapshot(path)
+        assert other.get(("project", "hulk")) == {"name": "hulk"}
+
+        # Written on close, too
+        snap.put(("projects",), [])
+        snap.close()
+        assert other.get(("projects",)) == []
+        other.close()
+
+    finally:
+        shutil.rmtree(os.path.dirname(path))
+
+    # Local to the user, rather than in their home directory
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    os.environ["XDG_CACHE_HOME"] = "/local/cache"
+
+    try:
+        if sys.platform not in ("win32", "darwin"):
+            assert snapshot.default_path().startswith("/local/cache/avalon/")
+
+    finally:
+        if xdg is None:
+            os.environ.pop("XDG_CACHE_HOME")
+        else:
+            os.environ["XDG_CACHE_HOME"] = xdg
+
+
+def test_app_cache():
+    """Application classes are reused until their definition changes"""
+    from launcher import lib
+
+    root = tempfile.mkdtemp()
+    path = os.path.join(root, "myapp.toml")
+    old_path = os.environ["PATH"]
+    os.environ["PATH"] = root + os.pathsep + old_path
+
+    def write(label, mtime):
+        with open(path, "w") as f:
+            f.write("\n".join([
+                'schema = "avalon-core:application-1.0"',
+                'label = "%s"' % label,
+                'executable = "myapp"',
+                'application_dir = "myapp"',
+            ]))
+
+        os.utime(path, (mtime, mtime))
+
+    hulk = {"name": "hulk", "config": {"apps": [{"name": "myapp"}]}}
+    batman = {"name": "batman", "config": {"apps": [
+        {"name": "myapp", "label": "My App 2"}
+    ]}}
+
+    try:
+        write("My App", 1000)
+        first, = lib.get_apps(hulk)
+        other, = lib.get_apps(batman)
+        again, = lib.get_apps(hulk)
+
+        assert first is again
+        assert other is not first
+        assert other.label == "My App 2"
+
+        write("My New App", 2000)
+        changed, = lib.get_apps(hulk)
+
+        assert changed is not first
+        assert changed.label == "My New App"
+
+    finally:
+        os.environ["PATH"] = old_path
+        shutil.rmtree(root)
+
+
+def test_terminal_ring():
+    """The terminal keeps the most recent lines, added in batches"""
+    from PyQt5 import QtCore
+    from launcher import terminal
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    buffer = terminal.Buffer(capacity=3)
+    inserted = []
+    buffer.rowsInserted.connect(lambda parent, first, last:
+                                inserted.append((first, last)))
+
+    for index in range(5):
+        buffer.append({"line": str(index), "level": terminal.INFO})
+
+    app.processEvents()
+    assert buffer.rowCount() == 0
+
+    buffer.flush()
+    buffer.append({"line": "5", "level": terminal.INFO})
+    buffer.flush()
+
+    line = QtCore.Qt.UserRole
+    assert [buffer.data(buffer.index(row), line)
+            for row in range(buffer.rowCount())] == ["3", "4", "5"]
+
+    # One insertion per batch
+    assert inserted == [(0, 2), (2, 2)]
+
+    # Disabled, such as from configuration
+    empty = terminal.Buffer(capacity=0)
+    empty.append({"line": "0", "level": terminal.INFO})
+    empty.flush()
+    assert empty.rowCount() == 0
+
+
+def test_process_output():
+    """Output of processes is delivered in full, and exits are reaped"""
+    import time
+    import subprocess
+    from PyQt5 import QtCore
+    from launcher import pipes
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    multiplexer = pipes.Multiplexer(interval=1)
+    lines = []
+    exited = []
+    multiplexer.messaged.connect(lines.extend)
+    multiplexer.exited.connect(lambda name, code: exited.append(name))
+
+    script = "\n".join([
+        "import sys",
+        "for line in range(1000):",
+        "    sys.stdout.write('line %d\\n' % line)",
+        "sys.stderr.write('incomplete')",
+    ])
+
+    for name in ("first", "second"):
+        multiplexer.add(name, subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        ))
+
+    start = time.time()
+    while multiplexer.processes and time.time() - start < 10:
+        app.processEvents()
+
+    assert sorted(exited) == ["first", "second"]
+    assert not multiplexer.processes
+    assert len(lines) == 2002, len(lines)
+    assert lines.count("incomplete") == 2
+
+
+def test_process_manager():
+    """Launched processes are sampled, terminated and reaped"""
+    import time
+    import subprocess
+    from launcher import processes
+
+    popen = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(10)"]
+    )
+
+    try:
+        if processes.LINUX:
+            time.sleep(0.2)
+            cpu, memory = processes.sample([popen.pid])[popen.pid]
+            assert memory > 0
+
+        model = processes.Processes()
+        model.add("sleep", popen)
+        model.terminate(0)
+
+        start = time.time()
+        while popen.poll() is None and time.time() - start < 5:
+            time.sleep(0.01)
+
+        model.sample()
+        item = model._items[0]
+        assert item["status"] == "exited"
+        assert item["returncode"] is not None
+
+    finally:
+        if popen.poll() is None:
+            popen.kill()
+
+
+def test_trace_export():
+    """Spans are exported as Chrome trace events"""
+    import json
+    from launcher import tracing
+
+    path = os.path.join(tempfile.mkdtemp(), "trace.json")
+
+    try:
+        tracing.enable()
+
+        with tracing.span("trigger_action", action="maya"):
+            with tracing.span("process"):
+                pass
+
+        tracing.disable()
+
+        with tracing.span("ignored"):
+            pass
+
+        tracing.export(path)
+
+        with open(path) as f:
+            events = json.load(f)["traceEvents"]
+
+        # Inner spans end first
+        assert [event["name"] for event in events] == [
+            "process", "trigger_action"
+        ]
+
+        outer = events[1]
+        assert outer["ph"] == "X"
+        assert outer["args"] == {"action": "maya"}
+        assert events[0]["ts"] >= outer["ts"]
+
+    finally:
+        shutil.rmtree(os.path.dirname(path))
+
+
+def test_warm_pool():
+    """Modules run on warm interpreters, which are replaced once used"""
+    import time
+    import subprocess
+    from launcher import warm
+
+    def launch(executable, args, environment=None):
+        return subprocess.Popen([executable] + args,
+                                env=environment,
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True)
+
+    root = os.path.dirname(os.path.abspath(warm.__file__))
+    old_path = os.environ.get("PYTHONPATH", "")
+    os.environ["PYTHONPATH"] = os.pathsep.join([
+        os.path.dirname(root), old_path
+    ])
+
+    pool = warm.Pool(size=1, executable=sys.executable, imports=["json"],
+                     launch=launch)
+
+    try:
+        pool.start()
+
+        start = time.time()
+        while not pool.ready() and time.time() - start < 10:
+            time.sleep(0.01)
+
+        popen = pool.run("json.tool", ["--help"])
+        output = popen.communicate()[0]
+        assert "json.tool" in output or "usage" in output, output
+
+        # Replaced by another
+        start = time.time()
+        while not pool.ready() and time.time() - start < 10:
+            time.sleep(0.01)
+
+        assert pool.ready() == 1
+
+    finally:
+        pool.close()
+        os.environ["PYTHONPATH"] = old_path
+
+
+def test_startup_stages():
+    """Stages of starting up neither wait on nor block each other"""
+    import time
+    from PyQt5 import QtCore
+    from launcher import startup, terminal
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    terminal.init()
+
+    def slow():
+        time.sleep(0.6)
+        return "connected"
+
+    def fail():
+        raise ValueError("Bad action")
+
+    connected = list()
+    pipeline = startup.Pipeline(patience=0.1)
+    pipeline.add("interface")
+    pipeline.add("database", slow, connected.append)
+    pipeline.add("actions", fail)
+
+    finished = list()
+    pipeline.finished.connect(lambda: finished.append(True))
+    pipeline.start()
+
+    def spin(seconds):
+        start = time.time()
+        while time.time() - start < seconds:
+            app.processEvents()
+
+    # The window is shown whilst still connecting
+    spin(0.3)
+    pipeline.complete("interface")
+
+    status = {stage.name: stage.status for stage in pipeline.stages}
+    assert status == {
+        "interface": startup.DONE,
+        "database": startup.SLOW,
+        "actions": startup.FAILED,
+    }, status
+    assert pipeline.message == "database (slow)", pipeline.message
+    assert not finished
+
+    pipeline._worker.wait()
+    spin(0.1)
+
+    assert connected == ["connected"]
+    assert finished == [True]
+    assert pipeline.done
+
+
+def test_action_discovery():
+    """Modules of actions are loaded again only once changed"""
+    from avalon import api
+    from launcher import discovery
+
+    first, second = tempfile.mkdtemp(), tempfile.mkdtemp()
+
+    def write(directory, name, source):
+        path = os.path.join(directory, name)
+
+        with open(path, "w") as f:
+            f.write("from avalon import api\n" + source)
+
+        return path
+
+    try:
+        maya = write(first, "maya.py", "class Maya(api.Action): pass\n")
+        write(first, "_private.py", "raise ValueError\n")
+        nuke = write(second, "nuke.py", (
+            "class Nuke(api.Action): pass\n"
+            "def register():\n"
+            "    global registered\n"
+            "    registered = True\n"
+        ))
+
+        index = discovery.Index(api.Action)
+
+        added, removed = index.update([first, second])
+        assert sorted(a.__name__ for a in added) == ["Maya", "Nuke"]
+        assert removed == []
+        assert index.entries[nuke].module.registered
+
+        # Unchanged, and not loaded again
+        module = index.entries[maya].module
+        assert index.update([first, second]) == ([], [])
+        assert index.entries[maya].module is module
+
+        write(first, "maya.py", "class Maya2(api.Action): pass\n")
+        os.utime(maya, (0, 0))
+
+        added, removed = index.update([first, second])
+        assert [a.__name__ for a in added] == ["Maya2"]
+        assert [a.__name__ for a in removed] == ["Maya"]
+
+        # Directories no longer listed
+        added, removed = index.update([first])
+        assert added == []
+        assert [a.__name__ for a in removed] == ["Nuke"]
+
+    finally:
+        shutil.rmtree(first)
+        shutil.rmtree(second)
+
+
+def test_environment_actions():
+    """Actions of AVALON_ACTIONS are registered like they were discovered"""
+    from avalon import api
+    from launcher import actions
+
+    first, second = tempfile.mkdtemp(), tempfile.mkdtemp()
+
+    for directory, name, source in (
+            (first, "_helpers.py", "class Shared(api.Action): pass\n"),
+            (first, "maya.py", "from _helpers import Shared\n"
+                               "class Maya(api.Action): pass\n"),
+            (first, "nuke.py", "from _helpers import Shared\n"),
+            (second, "maya.py", "class Maya(api.Action): pass\n"),
+            (second, "loader.py", "class LoaderAction(api.Action): pass\n")):
+        with open(os.path.join(directory, name), "w") as f:
+            f.write("from avalon import api\n" + source)
+
+    environ = os.environ.get("AVALON_ACTIONS")
+    os.environ["AVALON_ACTIONS"] = os.pathsep.join([first, second])
+    sys.path.insert(0, first)
+
+    try:
+        actions.register_default_actions()
+        actions.register_environment_actions()
+
+        discovered = api.discover(api.Action)
+        names = sorted(action.__name__ for action in discovered)
+
+        # Imported actions are registered once, the first of each name
+        # wins, and actions registered otherwise take precedence.
+        assert names == ["LoaderAction", "Maya", "ProjectManagerAction",
+                         "Shared"], names
+        assert actions.LoaderAction in discovered
+        assert [action.__module__ for action in discovered
+                if action.__name__ == "Maya"] == ["maya"]
+
+        # Deregistered elsewhere meanwhile
+        api.deregister_plugin(api.Action, actions._registered[0])
+
+        os.environ["AVALON_ACTIONS"] = second
+        actions.register_environment_actions()
+        names = sorted(action.__name__ for action in api.discover(api.Action))
+        assert names == ["LoaderAction", "Maya", "ProjectManagerAction"]
+
+    finally:
+        os.environ["AVALON_ACTIONS"] = ""
+        actions.register_environment_actions()
+
+        if environ is None:
+            os.environ.pop("AVALON_ACTIONS")
+        else:
+            os.environ["AVALON_ACTIONS"] = environ
+
+        for action in (actions.ProjectManagerAction, actions.LoaderAction):
+            api.deregister_plugin(api.Action, action)
+
+        sys.path.remove(first)
+        shutil.rmtree(first)
+        shutil.rmtree(second)
+
+
+def test_template_partial():
+    """Compiled templates format like string.Formatter, keys missing or not"""
+    import string
+    from launcher import lib
+
+    templates = (
+        "{root}/{project}/{silo}/{asset}/work/{task}",
+        "{root}/{project!r}/{version:03d}",
+        "{root}/{asset[name]}/{width:{fill}}",
+        "{{root}}/{project}",
+    )
+
+    mappings = (
+        {},
+        {"root": "/projects", "project": "hulk", "version": 3},
+        {"root": "/projects", "asset": {"name": "hulk"},
+         "width": "x", "fill": ">4"},
+    )
+
+    for template in templates:
+        for mapping in mappings:
+            try:
+                expected = string.Formatter().vformat(
+                    template, (), lib.FormatDict(**mapping))
+            except Exception as e:
+                expected = type(e)
+
+            try:
+                result = lib.partial_format(template, mapping)
+            except Exception as e:
+                result = type(e)
+
+            assert result == expected, (template, mapping, result)
+
+    template = lib.compile_template(templates[0])
+    assert template is lib.compile_template(templates[0])
+    assert template.resolve_many([
+        {"root": "/projects", "project": "hulk", "asset": "bruce"},
+        {"root": "/projects"},
+    ]) == ["/projects/hulk/", "/projects/"]
+
+
+def test_probe_workdirs():
+    """Paths are probed a directory at a time, and remembered"""
+    import time
+    from PyQt5 import QtCore
+    from launcher import probe
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    root = tempfile.mkdtemp()
+    os.makedirs(os.path.join(root, "bruce", "work"))
+    os.makedirs(os.path.join(root, "tony"))
+
+    paths = [
+        os.path.join(root, "bruce", "work"),
+        os.path.join(root, "bruce", "publish"),
+        os.path.join(root, "tony", "work"),
+        os.path.join(root, "natasha", "work"),
+    ]
+
+    try:
+        assert probe.probe(os.path.join(root, "bruce"), paths[:2]) == {
+            paths[0]: (True, os.stat(paths[0]).st_mtime),
+            paths[1]: (False, None),
+        }
+
+        results = dict()
+        batches = list()
+
+        def on_probed(batch):
+            batches.append(batch)
+            results.update(batch)
+
+        prober = probe.Probe(ttl=60)
+        prober.probed.connect(on_probed)
+
+        assert prober.request(paths) == {}
+
+        start = time.time()
+        while len(results) < len(paths) and time.time() - start < 5:
+            app.processEvents()
+
+        # One batch per directory
+        assert len(batches) == 3, batches
+        assert [results[path][0] for path in paths] == [
+            True, False, False, False
+        ]
+
+        # Known from then on
+        assert prober.request(paths) == results
+
+        assert sorted(probe.directories(root)) == ["bruce", "tony"]
+
+        # Paths failing to probe are probed again once requested
+        class Flaky(probe.Probe):
+            calls = list()
+
+            def _probe(self, directory, paths):
+                self.calls.append(paths)
+
+                if len(self.calls) == 1:
+                    raise OSError("Permission denied")
+
+                return super(Flaky, self)._probe(directory, paths)
+
+        flaky = Flaky(ttl=60)
+        existing = list()
+
+        # Probed once for both
+        flaky.exists(paths[0], existing.append)
+        flaky.exists(paths[0], existing.append)
+
+        start = time.time()
+        while len(existing) < 2 and time.time() - start < 5:
+            app.processEvents()
+
+        assert existing == [False, False]
+
+        flaky.exists(paths[0], existing.append)
+
+        start = time.time()
+        while len(existing) < 3 and time.time() - start < 5:
+            app.processEvents()
+
+        assert existing == [False, False, True]
+        assert Flaky.calls == [[paths[0]], [paths[0]]]
+
+    finally:
+        shutil.rmtree(root)
+
+
+def test_search_index():
+    """Levels are found by approximate name, within the levels named"""
+    from launcher import search
+
+    index = search.Index()
+    index.add([(("hulk",), {}), (("thor",), {})])
+    index.add([(("hulk", "assets"), {}), (("thor", "assets"), {})])
+    index.add(
+        ((project, "assets", asset), {"_id": asset})
+        for project in ("hulk", "thor")
+        for asset in ("bruce", "tony", "natasha")
+    )
+    index.add(
+        ((project, "assets", asset, task), {})
+        for project in ("hulk", "thor")
+        for asset in ("bruce", "tony")
+        for task in ("modeling", "animation")
+    )
+
+    assert len(index) == 18
+    assert index.get(("thor", "assets", "tony")) == {"_id": "tony"}
+
+    # Misspelled
+    assert [path for path, data in index.search("natsaha")] == [
+        ("hulk", "assets", "natasha"),
+        ("thor", "assets", "natasha"),
+    ]
+
+    # Within levels named
+    assert [path for path, data in index.search("thor tony anim")] == [
+        ("thor", "assets", "tony", "animation"),
+    ]
+
+    # Replaced, rather than added twice
+    index.add([(("hulk", "assets", "bruce"), {"label": "Bruce Banner"})])
+    assert len(index) == 18
+    assert index.search("banner")[0][0] == ("hulk", "assets", "bruce")
+
+    # Ranked by trigrams shared, even when too many are found to rank
+    index = search.Index()
+    index.add([(("props",), {})])
+    for prefix in ("zbanne", "yanner"):
+        index.add([(("props", "%s%04d" % (prefix, number)), {})
+                   for number in range(900)])
+    index.add([(("props", "banner"), {})])
+    assert index.search("bannerr")[0][0] == ("props", "banner")
+
+
+def test_headless_navigation():
+    """Levels are entered by name, without a window"""
+    from PyQt5 import QtCore
+    from launcher import headless, fixtures, terminal
+
+    snapshot = os.environ.get("AVALON_LAUNCHER_SNAPSHOT")
+    os.environ["AVALON_LAUNCHER_SNAPSHOT"] = ""
+
+    try:
+        database = fixtures.Database(projects=2, silos=2, assets=300)
+        controller = headless.create("/projects", database=database)
+
+        assert controller.model.rowCount() == 2
+
+        headless.open(controller, ["project1", "silo1", "asset00250"])
+        assert controller.breadcrumbs == ["project1", "silo1", "asset00250"]
+        assert controller.environment[0] == {
+            "key": "project", "value": "project1"
+        }
+
+        # Tasks of the asset, entered by name beyond the first page
+        assert controller.model.rowCount() == 4
+
+        headless.push(controller, "task2")
+        headless.pop(controller)
+        assert controller.breadcrumbs == ["project1", "silo1", "asset00250"]
+
+        # Levels in common are kept
+        pushed = list()
+        controller.pushed.connect(pushed.append)
+        headless.open(controller, ["project1", "silo1", "asset00001"])
+        assert pushed == ["asset00001"], pushed
+
+        try:
+            headless.open(controller, ["project1", "silo0", "missing"])
+        except RuntimeError:
+            pass
+        else:
+            assert False, "Opened a missing asset"
+
+        terminal.model.flush()
+        lines = [terminal.model.data(terminal.model.index(row),
+                                     QtCore.Qt.UserRole)
+                 for row in range(terminal.model.rowCount())]
+        assert "No asset named missing" in lines, lines[-3:]
+
+        controller.wait()
+
+    finally:
+        if snapshot is None:
+            os.environ.pop("AVALON_LAUNCHER_SNAPSHOT")
+        else:
+            os.environ["AVALON_LAUNCHER_SNAPSHOT"] = snapshot
+
+
+def test_hidden_assets():
+    """Assets of which visible is falsy are hidden, as they were before"""
+    from launcher import headless, fixtures, model
+
+    snapshot = os.environ.get("AVALON_LAUNCHER_SNAPSHOT")
+    os.environ["AVALON_LAUNCHER_SNAPSHOT"] = ""
+
+    try:
+        database = fixtures.Database(projects=1, silos=1, assets=6)
+        assets = database._by_silo[("project0", "silo0")]
+
+        for asset, visible in zip(assets, [False, 0, None, "", True]):
+            asset["data"]["visible"] = visible
+
+        controller = headless.create("/projects", database=database)
+        headless.open(controller, ["project0", "silo0"])
+
+        names = [model.data(controller.model.index(row), "name")
+                 for row in range(controller.model.rowCount())]
+        assert names == ["asset00004", "asset00005"], names
+
+        controller.wait()
+
+    finally:
+        if snapshot is None:
+            os.environ.pop("AVALON_LAUNCHER_SNAPSHOT")
+        else:
+            os.environ["AVALON_LAUNCHER_SNAPSHOT"] = snapshot
+
+
+def test_prefetch_assets():
+    """Entering a silo prefetches a few assets, as entering them needs"""
+    import time
+    from PyQt5 import QtCore
+    from launcher import headless, fixtures, control
+
+    snapshot = os.environ.get("AVALON_LAUNCHER_SNAPSHOT")
+    os.environ["AVALON_LAUNCHER_SNAPSHOT"] = ""
+
+    try:
+        database = fixtures.Database(projects=1, silos=1, assets=50)
+        controller = headless.create("/projects", database=database)
+        headless.open(controller, ["project0", "silo0"])
+
+        app = QtCore.QCoreApplication.instance()
+        start = time.time()
+        while time.time() - start < 0.3:
+            app.processEvents()
+        controller.wait()
+
+        ids = [asset["_id"] for asset in database._by_silo[("project0",
+                                                            "silo0")]]
+        cached = [_id for _id in ids if ("asset", _id) in controller._cache]
+        assert cached == ids[:control.PREFETCH_ASSETS], cached
+
+        asset = controller._cache.get(("asset", ids[0]))
+        assert sorted(asset) == ["_id", "data", "name"], asset
+
+        # Entered with what was prefetched
+        queries = database.queries["find_one"]
+        controller.enter("asset00000", ids[0])
+        headless.wait(controller)
+
+        assert database.queries["find_one"] == queries
+        environment = controller._frames[-1]["environment"]
+        assert environment["asset_frameStart"] == 1001, environment
+
+        controller.wait()
+
+    finally:
+        if snapshot is None:
+            os.environ.pop("AVALON_LAUNCHER_SNAPSHOT")
+        else:
+            os.environ["AVALON_LAUNCHER_SNAPSHOT"] = snapshot
+
+
+def test_project_switch():
+    """Results of a project left whilst querying are never stored"""
+    import time
+    from launcher import headless, fixtures
+
+    class Slow(fixtures.Database):
+        def find_one(self, filter, *args, **kwargs):
+            if filter.get("type") == "project":
+                time.sleep(0.3)
+
+            return super(Slow, self).find_one(filter, *args, **kwargs)
+
+    snapshot = os.environ.get("AVALON_LAUNCHER_SNAPSHOT")
+    os.environ["AVALON_LAUNCHER_SNAPSHOT"] = ""
+
+    try:
+        controller = headless.create("/projects",
+                                     database=Slow(projects=2, assets=5))
+
+        controller.enter("project0")
+        controller.pop()
+        controller.enter("project1")
+        headless.wait(controller)
+        controller.wait()
+
+        assert controller.breadcrumbs == ["project1"]
+        assert ("project", "project0") not in controller._cache
+
+        project, silos = controller.query_project("project1")
+        assert project["name"] == "project1"
+
+    finally:
+        if snapshot is None:
+            os.environ.pop("AVALON_LAUNCHER_SNAPSHOT")
+        else:
+            os.environ["AVALON_LAUNCHER_SNAPSHOT"] = snapshot
+
+
+def test_batch_scheduler():
+    """Jobs run a few at a time, and report how each exited"""
+    import time
+    from PyQt5 import QtCore
+    from launcher import batch
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    class Popen(object):
+        def __init__(self, returncode):
+            self.returncode = returncode
+            self.started = time.time()
+
+        def poll(self):
+            if time.time() - self.started > 0.05:
+                return self.returncode
+
+    def fail():
+        raise OSError("No such executable")
+
+    running = list()
+    scheduler = batch.Scheduler(limit=2, interval=1)
+    scheduler.started.connect(
+        lambda job: running.append(scheduler.running()))
+
+    jobs = scheduler.submit("maya", [
+        ("sh010", lambda: Popen(0)),
+        ("sh020", lambda: Popen(1)),
+        ("sh030", fail),
+        ("sh040", lambda: None),
+        ("sh050", lambda: Popen(0)),
+    ])
+
+    start = time.time()
+    while not jobs.finished and time.time() - start < 5:
+        app.processEvents()
+
+    assert jobs.finished
+    assert max(running) <= 2, running
+    assert [job.status for job in jobs.jobs] == [
+        batch.DONE, batch.FAILED, batch.FAILED, batch.DONE, batch.DONE
+    ]
+    assert jobs.jobs[1].returncode == 1
+    assert "No such executable" in jobs.jobs[2].error
+
+
+def test_action_runner():
+    """Actions are processed in the background, once per click"""
+    import time
+    import threading
+    from PyQt5 import QtCore
+    from launcher import runner, batch
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    class Popen(object):
+        returncode = None
+
+        def poll(self):
+            return self.returncode
+
+        def terminate(self):
+            self.returncode = -15
+
+    release = threading.Event()
+
+    class Build(object):
+        threaded = True
+
+        def process(self, session):
+            run = runner.current()
+            run.progress(0.5, "Copying")
+            release.wait(5)
+
+            if run.cancelled:
+                return Popen()
+
+            return Popen() if session["AVALON_TASK"] != "fail" else 1 / 0
+
+    progressed = list()
+    finished = list()
+    pool = runner.Runner(threads=4)
+    pool.progressed.connect(lambda run: progressed.append(run.value))
+    pool.finished.connect(finished.append)
+
+    def process_events(count):
+        start = time.time()
+        while len(finished) < count and time.time() - start < 5:
+            app.processEvents()
+
+    # Clicked twice, processed once
+    first = pool.submit("build", Build, {"AVALON_TASK": "lighting"})
+    assert pool.submit("build", Build, {"AVALON_TASK": "lighting"}) is first
+
+    other = pool.submit("build", Build, {"AVALON_TASK": "animation"})
+    failing = pool.submit("build", Build, {"AVALON_TASK": "fail"})
+    assert other is not first
+
+    start = time.time()
+    while len(progressed) < 3 and time.time() - start < 5:
+        app.processEvents()
+
+    assert progressed == [0.5] * 3, progressed
+    assert not finished, "Finished before having been released"
+
+    other.cancel()
+    release.set()
+    process_events(3)
+    pool.wait()
+
+    assert first.status == runner.DONE
+    assert first.popen.poll() is None
+    assert other.status == runner.CANCELLED
+    assert other.popen.poll() == -15, "Process of cancelled run left running"
+    assert failing.status == runner.FAILED
+    assert "ZeroDivisionError" in failing.error
+
+    # Run across targets, followed until their process exits
+    threads = set()
+
+    class Launch(object):
+        def process(self, session):
+            threads.add(threading.current_thread())
+            popen = Popen()
+            popen.returncode = 0
+            return popen
+
+    scheduler = batch.Scheduler(limit=2, interval=1)
+    jobs = scheduler.submit("maya", [
+        (shot, lambda shot=shot: pool.submit(
+            "maya", Launch, {"AVALON_ASSET": shot}))
+        for shot in ("sh010", "sh020", "sh030")
+    ])
+
+    start = time.time()
+    while not jobs.finished and time.time() - start < 5:
+        app.processEvents()
+
+    pool.wait()
+    assert [job.status for job in jobs.jobs] == [batch.DONE] * 3
+
+    # Processed from the GUI thread, unless declared otherwise
+    assert threads == {threading.current_thread()}, threads
+
+
+def test_environment_cache():
+    """Applications are resolved again only once what they use changes"""
+    from launcher import environment
+
+    class Maya(environment.Application):
+        name = "maya2018"
+        fingerprint = ("maya2018.toml", (0, 0))
+        template = "{root}/{project}/{silo}/{asset}/work/{task}/{app}"
+        config = {
+            "application_dir": "maya",
+            "environment": {
+                "MAYA_PROJECT": "{AVALON_WORKDIR}",
+                "PYTHONPATH": ["{AVALON_CORE}/maya", "{AVALON_CORE}/lib"],
+            }
+        }
+
+    class Nuke(Maya):
+        name = "nuke11"
+        fingerprint = ("nuke11.toml", (0, 0))
+        config = {
+            "application_dir": "nuke",
+            "environment": {
+                "NUKE_PATH": "{AVALON_CORE}/nuke",
+            }
+        }
+
+    session = {
+        "AVALON_PROJECT": "hulk",
+        "AVALON_SILO": "assets",
+        "AVALON_ASSET": "bruce",
+        "AVALON_TASK": "modeling",
+        "AVALON_CORE": "/core",
+    }
+
+    resolver, environment._resolver = (environment._resolver,
+                                       environment.Resolver())
+
+    try:
+        maya = Maya().environ(session)
+        nuke = Nuke().environ(session)
+
+        assert maya["MAYA_PROJECT"] == maya["AVALON_WORKDIR"]
+        assert maya["AVALON_WORKDIR"].endswith("modeling%smaya" % os.sep)
+        assert maya["PYTHONPATH"] == os.pathsep.join(["/core/maya",
+                                                      "/core/lib"])
+        assert nuke["NUKE_PATH"] == "/core/nuke"
+
+        # Only Maya depends on the task, through its work directory
+        session["AVALON_TASK"] = "rigging"
+        maya = Maya().environ(session)
+        nuke = Nuke().environ(session)
+
+        assert maya["MAYA_PROJECT"].endswith("rigging%smaya" % os.sep)
+        assert maya["AVALON_TASK"] == nuke["AVALON_TASK"] == "rigging"
+
+        stats = environment._resolver.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 3), stats
+
+    finally:
+        environment._resolver = resolver
+
+
+def test_icon_codepoints():
+    """Icons are looked up by name once, from the glyphs of QML"""
+    from launcher import icons
+
+    table = icons.codepoints()
+
+    assert icons.codepoints() is table, "Glyphs parsed again"
+    assert len(table) > 700, len(table)
+    assert table["times"] == 0xf00d
+    assert all(0xe000 <= codepoint <= 0xf8ff for codepoint in table.values())
+    assert icons.glyph("spinner-rotate") == icons.glyph("spinner") != ""